@@ -25,6 +25,14 @@ def run_migrations_offline():
         context.run_migrations()
 
 def run_migrations_online():
+    # app.db.init_db (and the test suite) hand in an open connection
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         {"sqlalchemy.url": DATABASE_URL},
         prefix="sqlalchemy.",
@@ -0,0 +1,193 @@
+"""add organization stats
+
+Revision ID: bd301a64f3d3
+Revises: d9a52ff35d55
+Create Date: 2026-10-19 14:02:37.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bd301a64f3d3'
+down_revision: Union[str, None] = 'd9a52ff35d55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers see every row a statement changed through its
+# transition tables (new_rows / old_rows), so a bulk insert, update or delete
+# touches each organization's counters once, not once per row. UPDATE applies
+# new minus old and skips organizations whose counts did not change.
+TODOS_FUNCTION = """
+CREATE FUNCTION organization_stats_todos() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE organization_stats s
+        SET open_todos = s.open_todos + d.open_todos, done_todos = s.done_todos + d.done_todos, updated_at = now()
+        FROM (SELECT organization_id,
+                     count(*) FILTER (WHERE completed IS NOT TRUE) AS open_todos,
+                     count(*) FILTER (WHERE completed IS TRUE) AS done_todos
+              FROM new_rows GROUP BY organization_id) d
+        WHERE s.organization_id = d.organization_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE organization_stats s
+        SET open_todos = s.open_todos - d.open_todos, done_todos = s.done_todos - d.done_todos, updated_at = now()
+        FROM (SELECT organization_id,
+                     count(*) FILTER (WHERE completed IS NOT TRUE) AS open_todos,
+                     count(*) FILTER (WHERE completed IS TRUE) AS done_todos
+              FROM old_rows GROUP BY organization_id) d
+        WHERE s.organization_id = d.organization_id;
+    ELSE
+        UPDATE organization_stats s
+        SET open_todos = s.open_todos + d.open_todos, done_todos = s.done_todos + d.done_todos, updated_at = now()
+        FROM (SELECT organization_id, sum(open_todos) AS open_todos, sum(done_todos) AS done_todos
+              FROM (SELECT organization_id, (completed IS NOT TRUE)::int AS open_todos,
+                           (completed IS TRUE)::int AS done_todos
+                    FROM new_rows
+                    UNION ALL
+                    SELECT organization_id, -(completed IS NOT TRUE)::int, -(completed IS TRUE)::int
+                    FROM old_rows) c
+              GROUP BY organization_id) d
+        WHERE s.organization_id = d.organization_id AND (d.open_todos <> 0 OR d.done_todos <> 0);
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+NOTES_FUNCTION = """
+CREATE FUNCTION organization_stats_notes() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE organization_stats s SET notes = s.notes + d.notes, updated_at = now()
+        FROM (SELECT organization_id, count(*) AS notes FROM new_rows GROUP BY organization_id) d
+        WHERE s.organization_id = d.organization_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE organization_stats s SET notes = s.notes - d.notes, updated_at = now()
+        FROM (SELECT organization_id, count(*) AS notes FROM old_rows GROUP BY organization_id) d
+        WHERE s.organization_id = d.organization_id;
+    ELSE
+        UPDATE organization_stats s SET notes = s.notes + d.notes, updated_at = now()
+        FROM (SELECT organization_id, sum(notes) AS notes
+              FROM (SELECT organization_id, 1 AS notes FROM new_rows
+                    UNION ALL
+                    SELECT organization_id, -1 FROM old_rows) c
+              GROUP BY organization_id) d
+        WHERE s.organization_id = d.organization_id AND d.notes <> 0;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+MEMBERS_FUNCTION = """
+CREATE FUNCTION organization_stats_members() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE organization_stats s
+        SET members = s.members + d.members, admins = s.admins + d.admins, updated_at = now()
+        FROM (SELECT organization_id, count(*) AS members, count(*) FILTER (WHERE role = 'ADMIN') AS admins
+              FROM new_rows GROUP BY organization_id) d
+        WHERE s.organization_id = d.organization_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE organization_stats s
+        SET members = s.members - d.members, admins = s.admins - d.admins, updated_at = now()
+        FROM (SELECT organization_id, count(*) AS members, count(*) FILTER (WHERE role = 'ADMIN') AS admins
+              FROM old_rows GROUP BY organization_id) d
+        WHERE s.organization_id = d.organization_id;
+    ELSE
+        UPDATE organization_stats s
+        SET members = s.members + d.members, admins = s.admins + d.admins, updated_at = now()
+        FROM (SELECT organization_id, sum(members) AS members, sum(admins) AS admins
+              FROM (SELECT organization_id, 1 AS members, (role = 'ADMIN')::int AS admins FROM new_rows
+                    UNION ALL
+                    SELECT organization_id, -1, -(role = 'ADMIN')::int FROM old_rows) c
+              GROUP BY organization_id) d
+        WHERE s.organization_id = d.organization_id AND (d.members <> 0 OR d.admins <> 0);
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+ORGANIZATIONS_FUNCTION = """
+CREATE FUNCTION organization_stats_create() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO organization_stats (organization_id) SELECT id FROM new_rows ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END
+$$
+"""
+
+# (table, function); transition tables allow only one event per trigger
+COUNTED_TABLES = [
+    ('todos', 'organization_stats_todos'),
+    ('notes', 'organization_stats_notes'),
+    ('user_organizations', 'organization_stats_members'),
+]
+
+BACKFILL = """
+INSERT INTO organization_stats (organization_id, open_todos, done_todos, notes, members, admins)
+SELECT o.id,
+       (SELECT count(*) FROM todos t WHERE t.organization_id = o.id AND t.completed IS NOT TRUE),
+       (SELECT count(*) FROM todos t WHERE t.organization_id = o.id AND t.completed IS TRUE),
+       (SELECT count(*) FROM notes n WHERE n.organization_id = o.id),
+       (SELECT count(*) FROM user_organizations m WHERE m.organization_id = o.id),
+       (SELECT count(*) FROM user_organizations m WHERE m.organization_id = o.id AND m.role = 'ADMIN')
+FROM organizations o
+"""
+
+
+def upgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('organization_stats',
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('open_todos', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('done_todos', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('notes', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('members', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('admins', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id')
+    )
+    # ### end Alembic commands ###
+
+    for function in (TODOS_FUNCTION, NOTES_FUNCTION, MEMBERS_FUNCTION, ORGANIZATIONS_FUNCTION):
+        op.execute(function)
+    for table, function in COUNTED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {function}_insert AFTER INSERT ON {table} "
+            f"REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {function}_update AFTER UPDATE ON {table} "
+            f"REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {function}_delete AFTER DELETE ON {table} "
+            f"REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+    op.execute(
+        "CREATE TRIGGER organization_stats_create AFTER INSERT ON organizations "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION organization_stats_create()"
+    )
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER organization_stats_create ON organizations")
+    for table, function in COUNTED_TABLES:
+        for event in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER {function}_{event} ON {table}")
+    for function in ('organization_stats_create', 'organization_stats_members',
+                     'organization_stats_notes', 'organization_stats_todos'):
+        op.execute(f"DROP FUNCTION {function}()")
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_table('organization_stats')
+    # ### end Alembic commands ###
@@ -0,0 +1,57 @@
+"""add user typeahead indexes
+
+Revision ID: d9a52ff35d55
+Revises: c10760a72a6a
+Create Date: 2026-10-19 12:41:08.226917
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a52ff35d55'
+down_revision: Union[str, None] = 'c10760a72a6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # C collation lets the same index serve both LIKE 'abc%' and the ORDER BY,
+    # so a prefix search stops after reading one page of entries. Emails are
+    # only looked up whole, which the email index serves too
+    op.create_index(
+        'ix_users_username_lower_prefix', 'users', [sa.text('(lower(username) COLLATE "C")')], unique=False
+    )
+    op.create_index(
+        'ix_users_email_lower_prefix', 'users', [sa.text('(lower(email) COLLATE "C")')], unique=False
+    )
+
+    # Fuzzy matching needs pg_trgm, which ships with the postgres contrib
+    # package. Servers without it still get prefix search.
+    bind = op.get_bind()
+    available = bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar()
+    if not available:
+        logging.getLogger("alembic.runtime.migration").warning(
+            "pg_trgm is not available on this server; user search will match prefixes only"
+        )
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # GiST rather than GIN: it can return the nearest matches in distance
+    # order, so the top few are found without scoring every candidate
+    op.create_index(
+        'ix_users_username_lower_trgm', 'users', [sa.text('lower(username) gist_trgm_ops')],
+        unique=False, postgresql_using='gist'
+    )
+
+
+def downgrade() -> None:
+    # The extension itself is left installed; other objects may depend on it
+    op.execute('DROP INDEX IF EXISTS ix_users_username_lower_trgm')
+    op.drop_index('ix_users_email_lower_prefix', table_name='users')
+    op.drop_index('ix_users_username_lower_prefix', table_name='users')
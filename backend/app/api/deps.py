@@ -1,10 +1,14 @@
-from fastapi import Depends, HTTPException, status
+import orjson
+from fastapi import Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from jose import JWTError
 from uuid import UUID
 
 from app.db.session import SessionLocal
+from app.core.audit import set_actor
+from app.core.config import settings
 from app.core.security import decode_access_token
 from app.models.user import User
 from app.models.organization import Organization
@@ -30,6 +34,8 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    # Changes made through this session are audited as this user's
+    set_actor(db, user.id)
     return user
 
 
@@ -43,6 +49,56 @@ def require_active_user(current_user: User = Depends(get_current_user)) -> User:
 get_current_active_user = require_active_user
 
 
+class PageParams:
+    """Keyset pagination query parameters shared by the list endpoints"""
+    def __init__(
+        self,
+        limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE, description="Page size"),
+        cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def sparse_fields(schema: type[BaseModel]):
+    """Dependency factory parsing a ``fields=`` sparse fieldset against ``schema``
+
+    Returns the selected field names in schema order, always including ``id``;
+    all of the schema's fields when the parameter is absent. Unknown names are
+    rejected with 400.
+    """
+    allowed = list(schema.model_fields)
+
+    def _sparse_fields(
+        fields: str | None = Query(
+            None, description=f"Comma-separated fields to return ({', '.join(allowed)}); id is always included"
+        ),
+    ) -> list[str]:
+        if fields is None:
+            return allowed
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = sorted(requested - set(allowed))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        if not requested:
+            raise HTTPException(status_code=400, detail="fields must name at least one field")
+        return [name for name in allowed if name in requested or name == "id"]
+    return _sparse_fields
+
+
+def rows_response(rows: list, fields: list[str], response: Response) -> Response:
+    """Render row tuples as a JSON array of objects with orjson
+
+    Each row holds ``fields`` in order, as selected from typed columns, so the
+    rows skip per-row response model validation; the route keeps its
+    ``response_model`` for the OpenAPI schema. Headers already set on
+    ``response`` (e.g. X-Next-Cursor) are carried over.
+    """
+    # OPT_UTC_Z writes UTC datetimes with a "Z", as pydantic does
+    content = orjson.dumps([dict(zip(fields, row)) for row in rows], option=orjson.OPT_UTC_Z)
+    return Response(content, media_type="application/json", headers=dict(response.headers))
+
+
 def require_admin(current_user: User = Depends(require_active_user)) -> User:
     # This dependency is now deprecated for organization-specific operations
     # Use require_organization_admin instead for organization-specific admin checks
@@ -103,3 +159,32 @@ def require_organization_admin(org_id: UUID):
         
         return current_user
     return _require_organization_admin
+
+
+def list_etag(org: Organization) -> str | None:
+    """Weak ETag for an organization's todo and note lists, from its data version"""
+    if org.stats is None:
+        return None
+    return f'W/"{org.id}.{org.stats.data_version}"'
+
+
+def not_modified(request: Request, response: Response, etag: str | None) -> Response | None:
+    """Set ``etag`` on ``response``, or return a 304 if the client already holds it
+
+    The version is read before the list is, so a list built from newer rows
+    can carry an older tag (the client just refetches next time), never the
+    other way round.
+    """
+    if etag is None:
+        return None
+    response.headers["ETag"] = etag
+    # Revalidate on every use, so browsers send If-None-Match on their own
+    response.headers["Cache-Control"] = "private, no-cache"
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return None
+    # Weak comparison: W/ prefixes are ignored
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
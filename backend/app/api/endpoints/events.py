@@ -0,0 +1,70 @@
+import asyncio
+import time
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from uuid import UUID
+
+from app.api.deps import get_db, get_current_active_user
+from app.core.config import settings
+from app.core.events import EVICTED, EventBroker, get_event_broker
+from app.crud import crud_organization
+
+router = APIRouter()
+
+
+async def event_stream(broker: EventBroker, org_id: UUID):
+    """Server-sent events for one subscriber until it is evicted or the stream times out"""
+    subscription = broker.subscribe(org_id)
+    deadline = time.monotonic() + settings.EVENTS_MAX_STREAM_SECONDS
+    try:
+        # Ask EventSource clients to reconnect after 3s once the stream ends
+        yield "retry: 3000\n\n"
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                message = await subscription.get(min(remaining, settings.EVENTS_KEEPALIVE_SECONDS))
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+                continue
+            if message is EVICTED:
+                yield "event: evicted\ndata: {}\n\n"
+                return
+            yield f"event: change\ndata: {message}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("/org/{org_id}")
+async def stream_organization_events(
+    org_id: UUID,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_active_user),
+    broker: EventBroker = Depends(get_event_broker),
+):
+    """Server-sent events for changes to an organization's todos, notes and members
+
+    Each ``change`` event's data is ``{"org_id", "resource", "action", "ids"}``;
+    ``ids`` is null when a bulk change touched rows we did not list. An
+    ``evicted`` event means events were lost (the client fell behind or the
+    server's listener reconnected): refetch, or call /sync, and reconnect.
+    Streams end after EVENTS_MAX_STREAM_SECONDS so that clients re-authenticate.
+    """
+    def is_member() -> bool:
+        member = crud_organization.get_user_role_in_organization(db, current_user.id, org_id) is not None
+        # End the read transaction so the connection goes back to the pool;
+        # the stream itself never touches the database
+        db.rollback()
+        return member
+
+    # Check if user is a member of this organization
+    if not await run_in_threadpool(is_member):
+        raise HTTPException(status_code=403, detail="Not a member of this organization")
+
+    await run_in_threadpool(broker.start)
+    return StreamingResponse(
+        event_stream(broker, org_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
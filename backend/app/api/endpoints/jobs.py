@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from uuid import UUID
+
+from app.api.deps import get_db, get_current_active_user
+from app.crud import crud_job, crud_organization
+from app.models.user import User
+from app.schemas.job import JobOut
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Status of a background job (whoever queued it, or an admin of its organization)
+
+    QUEUED jobs wait for ``run_at``; after a failed attempt that is when the
+    retry is due and ``last_error`` says what went wrong. FAILED means the
+    attempts ran out.
+    """
+    job = crud_job.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.created_by != current_user.id and not (
+        job.organization_id and crud_organization.is_user_admin_in_organization(
+            db, current_user.id, job.organization_id
+        )
+    ):
+        raise HTTPException(status_code=403, detail="Not allowed to view this job")
+    return job
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
-from app.schemas.note import NoteOut, NoteCreate, NoteUpdate
+from app.schemas.note import NoteOut, NoteCreate, NoteUpdate, NoteSearchHit
 from app.crud.crud_note import crud_note
-from app.api.deps import get_db, get_current_active_user, require_admin
+from app.crud import crud_read
+from app.api.deps import (
+    get_db, get_current_active_user, require_admin, PageParams, sparse_fields, rows_response, list_etag, not_modified,
+)
+from app.core.config import settings
+from app.crud.pagination import InvalidCursor
 from app.models.note import Note
 from app.models.organization import Organization
 
@@ -13,6 +18,10 @@ router = APIRouter()
 @router.get("/org/{org_id}", response_model=List[NoteOut])
 def read_notes(
     org_id: UUID,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    fields: List[str] = Depends(sparse_fields(NoteOut)),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_active_user),
 ):
@@ -21,7 +30,40 @@ def read_notes(
     if not org or current_user not in org.users:
         raise HTTPException(status_code=403, detail="Not a member of this organization")
     
-    return crud_note.get_multi_by_org(db, org_id=org_id)
+    unchanged = not_modified(request, response, list_etag(org))
+    if unchanged:
+        return unchanged
+    try:
+        notes, next_cursor = crud_read.list_notes(
+            db, org_id=org_id, limit=page.limit, cursor=page.cursor, fields=fields
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows_response(notes, fields, response)
+
+
+@router.get("/org/{org_id}/search", response_model=List[NoteSearchHit])
+def search_notes(
+    org_id: UUID,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms (web search syntax)"),
+    limit: int = Query(20, ge=1, le=settings.MAX_PAGE_SIZE, description="Page size"),
+    offset: int = Query(0, ge=0, le=settings.SEARCH_RANK_WINDOW, description="Number of hits to skip"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_active_user),
+):
+    """Full-text search over note titles and content, best matches first"""
+    # Check if user is a member of this organization
+    org = db.query(Organization).filter(Organization.id == org_id).first()
+    if not org or current_user not in org.users:
+        raise HTTPException(status_code=403, detail="Not a member of this organization")
+    
+    hits, has_more = crud_note.search(db, org_id, q, limit=limit, offset=offset)
+    if has_more:
+        response.headers["X-Next-Offset"] = str(offset + limit)
+    return hits
 
 
 @router.get("/org/{org_id}/{note_id}", response_model=NoteOut)
@@ -108,6 +150,9 @@ def delete_note(
 # Backward compatibility endpoints - use user's first organization
 @router.get("/", response_model=List[NoteOut])
 def read_notes_legacy(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_active_user),
 ):
@@ -115,8 +160,19 @@ def read_notes_legacy(
     if not current_user.organizations:
         raise HTTPException(status_code=403, detail="User not in any organization")
     
-    org_id = current_user.organizations[0].id
-    return crud_note.get_multi_by_org(db, org_id=org_id)
+    org = current_user.organizations[0]
+    unchanged = not_modified(request, response, list_etag(org))
+    if unchanged:
+        return unchanged
+    try:
+        notes, next_cursor = crud_read.list_notes(
+            db, org_id=org.id, limit=page.limit, cursor=page.cursor
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows_response(notes, crud_read.NOTE_FIELDS, response)
 
 
 @router.post("/", response_model=NoteOut)
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
+import time
 
-from app.api.deps import get_db, get_current_active_user, require_admin
+from app.core.config import settings
+from app.api.deps import get_db, get_current_active_user, require_admin, PageParams, rows_response
 from app.models.user_organization import UserOrganization, UserOrganizationRole
 from app.schemas.organization import (
     OrganizationCreate, 
@@ -14,9 +18,21 @@ from app.schemas.organization import (
     UserInvite, 
     UserInviteResponse, 
     UserRoleUpdate,
-    OrganizationMemberOut
+    OrganizationMemberOut,
+    MemberBatch,
+    MemberBatchResult,
+    MemberFilter,
+    MemberSort,
+    OrganizationDeletionOut,
+    UserSearchHit
 )
-from app.crud import crud_organization
+from app.schemas.audit import AuditAction, AuditEventOut, AuditFilter, AuditResource
+from app.schemas.export import ExportFormat, ExportResource, ImportResult
+from app.crud import crud_deletion, crud_organization, crud_read
+from app.crud.pagination import InvalidCursor
+from app.crud.crud_export import MEDIA_TYPES, stream_export
+from app.crud.crud_import import ImportValidationError, import_rows
+from app.crud.crud_organization import LastAdminError
 from app.models.user import User
 from app.models.organization import Organization
 
@@ -48,41 +64,38 @@ def create_organization(
 
 @router.get("/my", response_model=List[OrganizationWithMembers])
 def get_my_organizations(
+    include_members: bool = Query(True, description="Include each organization's members"),
+    member_limit: int = Query(
+        settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE,
+        description="Most members listed per organization (stats.members has the total)",
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Get current user's organizations with members list"""
-    user_orgs = db.query(UserOrganization).filter(
-        UserOrganization.user_id == current_user.id
-    ).all()
-    
-    if not user_orgs:
-        return []
-    
-    organizations_with_members = []
-    for user_org in user_orgs:
-        org = user_org.organization
-        members = crud_organization.get_organization_members(db, org.id)
-        
-        org_dict = {
-            "id": org.id,
-            "name": org.name,
-            "created_at": org.created_at,
-            "user_role": user_org.role,  # Add user's role in this organization
-            "members": members
-        }
-        organizations_with_members.append(org_dict)
-    
-    return organizations_with_members
+    """Get current user's organizations with members list
+
+    Served from a per-user stale-while-revalidate cache; see
+    ``crud_organization.my_organizations_cache``.
+    """
+    user_id, bind = current_user.id, db.get_bind()
+    content = crud_organization.my_organizations_cache.get(
+        (user_id, include_members, member_limit),
+        lambda: crud_organization.render_my_organizations(bind, user_id, include_members, member_limit),
+    )
+    return Response(content, media_type="application/json")
 
 
 @router.get("/{org_id}", response_model=OrganizationWithMembers)
 def get_organization(
     org_id: UUID,
+    member_limit: int = Query(
+        settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE,
+        description="Most members listed (stats.members has the total; page through GET /{org_id}/members)",
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Get organization details and members (for organization members only)"""
+    """Get organization details and its first members (for organization members only)"""
     org = crud_organization.get_organization_by_id(db, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
@@ -96,13 +109,14 @@ def get_organization(
     if not user_org:
         raise HTTPException(status_code=403, detail="You are not a member of this organization")
     
-    members = crud_organization.get_organization_members(db, org.id)
+    members = crud_organization.get_organization_members(db, org.id, member_limit)
     return {
         "id": org.id,
         "name": org.name,
         "created_at": org.created_at,
         "user_role": user_org.role,  # Add user's role in this organization
-        "members": members
+        "members": members,
+        "stats": org.stats
     }
 
 
@@ -191,19 +205,7 @@ def update_member_role(
     if not current_user_org or current_user_org.role != UserOrganizationRole.ADMIN:
         raise HTTPException(status_code=403, detail="Admin privileges required for this organization")
     
-    # Prevent admin from changing their own role if they're the only admin
-    if user_id == current_user.id:
-        admin_count = len([
-            uo for uo in org.user_organizations 
-            if uo.role == UserOrganizationRole.ADMIN and uo.user.is_active
-        ])
-        
-        if admin_count <= 1 and role_update.role != UserOrganizationRole.ADMIN:
-            raise HTTPException(
-                status_code=400, 
-                detail="Cannot remove admin role from the last admin in organization"
-            )
-    
+    # The last admin cannot be demoted; crud_organization checks under a lock
     try:
         user = crud_organization.update_user_role(
             db, user_id, org_id, UserOrganizationRole(role_update.role)
@@ -223,6 +225,8 @@ def update_member_role(
             is_active=user.is_active,
             created_at=user.created_at
         )
+    except LastAdminError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -248,19 +252,7 @@ def remove_member(
     if not current_user_org or current_user_org.role != UserOrganizationRole.ADMIN:
         raise HTTPException(status_code=403, detail="Admin privileges required for this organization")
     
-    # Prevent admin from removing themselves if they're the only admin
-    if user_id == current_user.id:
-        admin_count = len([
-            uo for uo in org.user_organizations 
-            if uo.role == UserOrganizationRole.ADMIN and uo.user.is_active
-        ])
-        
-        if admin_count <= 1:
-            raise HTTPException(
-                status_code=400, 
-                detail="Cannot remove the last admin from organization"
-            )
-    
+    # The last admin cannot be removed; crud_organization checks under a lock
     try:
         user = crud_organization.remove_user_from_organization(
             db, user_id, org_id
@@ -276,17 +268,53 @@ def remove_member(
             is_active=user.is_active,
             created_at=user.created_at
         )
+    except LastAdminError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
-@router.get("/{org_id}/members", response_model=List[OrganizationMemberOut])
-def list_organization_members(
+@router.get("/{org_id}/user-search", response_model=List[UserSearchHit])
+def search_users(
+    org_id: UUID,
+    q: str = Query(..., min_length=2, max_length=100, description="The start of a username, or a full email address"),
+    limit: int = Query(10, ge=1, le=50),
+    exclude_members: bool = Query(True, description="Leave out users already in the organization"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Find users to add or invite by username, or by their exact email (admin only)"""
+    org = crud_organization.get_organization_by_id(db, org_id)
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    
+    # Check if current user is admin of this organization
+    user_org = db.query(UserOrganization).filter(
+        UserOrganization.user_id == current_user.id,
+        UserOrganization.organization_id == org_id
+    ).first()
+    
+    if not user_org or user_org.role != UserOrganizationRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin privileges required for this organization")
+    
+    return crud_organization.search_users(db, org_id, q, limit, exclude_members=exclude_members)
+
+
+@router.get("/{org_id}/export", response_class=StreamingResponse)
+def export_organization(
     org_id: UUID,
+    resource: ExportResource = Query(..., description="What to export"),
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson (one JSON object per line) or csv"),
+    after_created_at: Optional[datetime] = Query(None, description="Resume after the row with this created_at..."),
+    after_id: Optional[UUID] = Query(None, description="...and this id"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """List all members of the specified organization"""
+    """Stream every todo or note of the organization, oldest first (organization members only)
+
+    Rows are read from a server-side cursor and sent as they are fetched; the
+    next batch is only read once the client has taken the previous one.
+    """
     org = crud_organization.get_organization_by_id(db, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
@@ -300,27 +328,32 @@ def list_organization_members(
     if not user_org:
         raise HTTPException(status_code=403, detail="Not a member of this organization")
     
-    members = crud_organization.get_organization_members(db, org_id)
-    return [
-        OrganizationMemberOut(
-            id=member["id"],
-            username=member["username"],
-            email=member["email"],
-            role=member["role"],
-            is_active=member["is_active"],
-            created_at=member["created_at"]
-        )
-        for member in members
-    ]
+    if (after_created_at is None) != (after_id is None):
+        raise HTTPException(status_code=400, detail="after_created_at and after_id must be given together")
+    after = (after_created_at, after_id) if after_id else None
+    
+    filename = f"{resource.value}-{org_id}.{format.value}"
+    return StreamingResponse(
+        stream_export(db, org_id, resource, format, after),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
-@router.delete("/{org_id}", response_model=OrganizationOut)
-def delete_organization(
+@router.post("/{org_id}/import", response_model=ImportResult)
+def import_into_organization(
     org_id: UUID,
+    resource: ExportResource = Query(..., description="What the file contains"),
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson (one JSON object per line) or csv"),
+    file: UploadFile = File(..., description="Rows in the shape produced by the export endpoint"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Delete the organization and all associated data (admin only)"""
+    """Bulk import todos or notes in one transaction (admin only)
+
+    Imported rows are created by the current user. If any row is invalid,
+    nothing is imported and the response lists the offending lines.
+    """
     org = crud_organization.get_organization_by_id(db, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
@@ -334,13 +367,193 @@ def delete_organization(
     if not user_org or user_org.role != UserOrganizationRole.ADMIN:
         raise HTTPException(status_code=403, detail="Admin privileges required for this organization")
     
+    started = time.perf_counter()
     try:
-        deleted_org = crud_organization.delete_organization(db, org)
-        return deleted_org
-    except Exception as e:
+        rows = import_rows(db, org_id, current_user.id, resource, format, file.file)
+    except ImportValidationError as e:
+        raise HTTPException(status_code=422, detail={"message": str(e), "errors": e.errors})
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    seconds = time.perf_counter() - started
+    return ImportResult(
+        resource=resource,
+        rows=rows,
+        seconds=round(seconds, 3),
+        rows_per_second=round(rows / seconds, 1) if seconds else 0.0,
+    )
+
+
+def get_member_filter(
+    role: Optional[UserOrganizationRole] = Query(None, description="Only members with this role"),
+    is_active: Optional[bool] = Query(None, description="Only active (true) or deactivated (false) users"),
+    joined_after: Optional[datetime] = Query(None, description="Joined at or after"),
+    joined_before: Optional[datetime] = Query(None, description="Joined before"),
+) -> MemberFilter:
+    """Member filter query parameters"""
+    return MemberFilter(role=role, is_active=is_active, joined_after=joined_after, joined_before=joined_before)
+
+
+@router.get("/{org_id}/members", response_model=List[OrganizationMemberOut])
+def list_organization_members(
+    org_id: UUID,
+    response: Response,
+    page: PageParams = Depends(),
+    filters: MemberFilter = Depends(get_member_filter),
+    sort: MemberSort = Query(MemberSort.JOINED, description="Sort order"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """List the members of the specified organization, filtered and sorted, one page at a time
+
+    X-Total-Count comes from the organization's counters, so it is only sent
+    unfiltered or filtered by role alone.
+    """
+    org = crud_organization.get_organization_by_id(db, org_id)
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    
+    # Check if user is a member of this organization
+    user_org = db.query(UserOrganization).filter(
+        UserOrganization.user_id == current_user.id,
+        UserOrganization.organization_id == org_id
+    ).first()
+    
+    if not user_org:
+        raise HTTPException(status_code=403, detail="Not a member of this organization")
+    
+    try:
+        members, next_cursor = crud_read.list_member_page(db, org_id, page.limit, page.cursor, filters, sort)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    total = crud_read.count_members(db, org_id, filters)
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    return rows_response(members, crud_read.MEMBER_FIELDS, response)
+
+
+def get_audit_filter(
+    resource: Optional[AuditResource] = Query(None, description="Only changes to todos, notes, members or the organization"),
+    action: Optional[AuditAction] = Query(None, description="Only created, updated or deleted"),
+    actor_id: Optional[UUID] = Query(None, description="Only changes made by this user"),
+    resource_id: Optional[UUID] = Query(None, description="Only changes to this todo, note or member"),
+    occurred_after: Optional[datetime] = Query(None, description="Made at or after"),
+    occurred_before: Optional[datetime] = Query(None, description="Made before"),
+) -> AuditFilter:
+    """Audit log filter query parameters"""
+    return AuditFilter(
+        resource=resource, action=action, actor_id=actor_id, resource_id=resource_id,
+        occurred_after=occurred_after, occurred_before=occurred_before,
+    )
+
+
+@router.get("/{org_id}/audit", response_model=List[AuditEventOut])
+def list_audit_events(
+    org_id: UUID,
+    response: Response,
+    page: PageParams = Depends(),
+    filters: AuditFilter = Depends(get_audit_filter),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Who changed what in the organization, newest first, one page at a time (admin only)
+
+    Changes are written to the log in batches, so the latest second or so
+    may not be listed yet.
+    """
+    if not crud_organization.is_user_admin_in_organization(db, current_user.id, org_id):
+        raise HTTPException(status_code=403, detail="Admin privileges required for this organization")
+
+    try:
+        events, next_cursor = crud_read.list_audit_events(db, org_id, page.limit, page.cursor, filters)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows_response(events, crud_read.AUDIT_FIELDS, response)
+
+
+@router.post("/{org_id}/members/bulk", response_model=List[MemberBatchResult])
+def bulk_update_members(
+    org_id: UUID,
+    batch: MemberBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Add, remove and change the role of many members in one transaction (admin only)
+
+    Results come back in request order, each with its own status code; a
+    failed item does not undo the others. A batch that would leave the
+    organization without an admin is refused as a whole.
+    """
+    # One admin check for the whole batch
+    if not crud_organization.is_user_admin_in_organization(db, current_user.id, org_id):
+        raise HTTPException(status_code=403, detail="Admin privileges required for this organization")
+
+    try:
+        return crud_organization.apply_member_batch(db, org_id, batch.operations)
+    except LastAdminError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.delete("/{org_id}", response_model=OrganizationDeletionOut, status_code=status.HTTP_202_ACCEPTED)
+def delete_organization(
+    org_id: UUID,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Delete the organization and all associated data (admin only)
+
+    Answers 202 at once; a background worker removes the data in batches
+    (see ``crud_deletion``). Progress is at the Location given,
+    GET /organizations/{org_id}/deletion, and the job doing it at
+    GET /jobs/{X-Job-Id}. Asking again returns the job already on it, or
+    queues a new one to resume a failed or stalled deletion;
+    memberships are the first thing deleted, so its requester may do that
+    without being an admin any more.
+    """
+    org = crud_organization.get_organization_by_id(db, org_id)
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    
+    deletion = crud_deletion.get_organization_deletion(db, org_id)
+    if deletion is None or deletion.requested_by != current_user.id:
+        # Check if current user is admin of this organization
+        user_org = db.query(UserOrganization).filter(
+            UserOrganization.user_id == current_user.id,
+            UserOrganization.organization_id == org_id
+        ).first()
+        
+        if not user_org or user_org.role != UserOrganizationRole.ADMIN:
+            raise HTTPException(status_code=403, detail="Admin privileges required for this organization")
+    
+    deletion, job = crud_deletion.schedule_organization_deletion(db, org, current_user.id)
+    response.headers["Location"] = f"/organizations/{org_id}/deletion"
+    response.headers["X-Job-Id"] = str(job.id)
+    return deletion
+
+
+@router.get("/{org_id}/deletion", response_model=OrganizationDeletionOut)
+def get_organization_deletion(
+    org_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Status and progress of the organization's deletion (its requester or an admin)"""
+    deletion = crud_deletion.get_organization_deletion(db, org_id)
+    if not deletion:
+        raise HTTPException(status_code=404, detail="No deletion requested for this organization")
+    if deletion.requested_by != current_user.id and not crud_organization.is_user_admin_in_organization(
+        db, current_user.id, org_id
+    ):
+        raise HTTPException(status_code=403, detail="Admin privileges required for this organization")
+    return deletion
+
+
 @router.post("/{org_id}/members/{user_id}", response_model=OrganizationMemberOut)
 def add_user_to_organization(
     org_id: UUID,
@@ -0,0 +1,52 @@
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
+
+from app.api.deps import get_db, get_current_active_user
+from app.core.config import settings
+from app.crud import crud_sync
+from app.crud.crud_read import NOTE_FIELDS, TODO_FIELDS
+from app.crud.pagination import InvalidCursor
+from app.models.organization import Organization
+from app.schemas.sync import SyncChanges
+
+router = APIRouter()
+
+
+@router.get("/org/{org_id}", response_model=SyncChanges)
+def sync_organization(
+    org_id: UUID,
+    since: Optional[str] = Query(None, description="Cursor from the previous sync; omit to start from scratch"),
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_PAGE_SIZE, description="Most changes to return"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_active_user),
+):
+    """Todos and notes created, updated or deleted since the ``since`` cursor
+
+    Keep the returned cursor and send it next time. A 410 means the cursor is
+    older than the remembered deletions; drop local data and sync from scratch.
+    """
+    # Check if user is a member of this organization
+    org = db.query(Organization).filter(Organization.id == org_id).first()
+    if not org or current_user not in org.users:
+        raise HTTPException(status_code=403, detail="Not a member of this organization")
+
+    try:
+        changes, cursor, has_more = crud_sync.get_changes(db, org_id, limit, since)
+    except crud_sync.ExpiredCursor as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Rendered like the list endpoints, from row tuples
+    content = orjson.dumps({
+        "todos": [dict(zip(TODO_FIELDS, row)) for row in changes["todos"]],
+        "notes": [dict(zip(NOTE_FIELDS, row)) for row in changes["notes"]],
+        "deleted_todos": changes["deleted_todos"],
+        "deleted_notes": changes["deleted_notes"],
+        "cursor": cursor,
+        "has_more": has_more,
+    }, option=orjson.OPT_UTC_Z)
+    return Response(content, media_type="application/json")
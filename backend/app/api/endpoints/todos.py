@@ -1,29 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from app.api.deps import get_db, get_current_active_user, require_admin
-from app.schemas.todo import TodoCreate, TodoUpdate, TodoOut
-from app.crud import crud_todo
+from datetime import datetime
+from app.api.deps import (
+    get_db, get_current_active_user, require_admin, PageParams, sparse_fields, rows_response, list_etag, not_modified,
+)
+from app.schemas.todo import (
+    TodoCreate, TodoUpdate, TodoOut, TodoFilter, TodoSort, TodoBatch, TodoBatchResult,
+    TodoBulkUpdate, TodoBulkResult,
+)
+from app.crud import crud_read, crud_todo
+from app.crud.pagination import InvalidCursor
 from app.models.user import User
 from app.models.organization import Organization
+from app.models.user_organization import UserOrganization, UserOrganizationRole
 
 router = APIRouter()
 
 
+def get_todo_filter(
+    completed: Optional[bool] = Query(None, description="Only completed (true) or open (false) todos"),
+    created_by: Optional[UUID] = Query(None, description="Only todos created by this user"),
+    created_after: Optional[datetime] = Query(None, description="Created at or after"),
+    created_before: Optional[datetime] = Query(None, description="Created before"),
+    updated_after: Optional[datetime] = Query(None, description="Updated at or after"),
+    updated_before: Optional[datetime] = Query(None, description="Updated before"),
+    title_prefix: Optional[str] = Query(None, min_length=1, max_length=100, description="Title starts with"),
+) -> TodoFilter:
+    """Todo filter query parameters, shared by every endpoint that selects todos by predicate"""
+    return TodoFilter(
+        completed=completed,
+        created_by=created_by,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        title_prefix=title_prefix,
+    )
+
+
 @router.get("/org/{org_id}", response_model=List[TodoOut])
 def list_todos(
     org_id: UUID,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    filters: TodoFilter = Depends(get_todo_filter),
+    sort: TodoSort = Query(TodoSort.NEWEST, description="Sort order"),
+    fields: List[str] = Depends(sparse_fields(TodoOut)),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Get all todos for the specified organization"""
+    """Get todos for the specified organization, filtered and sorted, one page at a time
+
+    ``fields`` narrows both the columns loaded and the todos returned.
+    Answers 304 when If-None-Match holds the organization's current ETag.
+    """
     # Check if user is a member of this organization
     org = db.query(Organization).filter(Organization.id == org_id).first()
     if not org or current_user not in org.users:
         raise HTTPException(status_code=403, detail="Not a member of this organization")
     
-    return crud_todo.get_todos(db, org_id)
+    unchanged = not_modified(request, response, list_etag(org))
+    if unchanged:
+        return unchanged
+    try:
+        todos, next_cursor = crud_read.list_todos(
+            db, org_id, page.limit, page.cursor, filters=filters, sort=sort, fields=fields
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows_response(todos, fields, response)
 
 
 @router.get("/{todo_id}", response_model=TodoOut)
@@ -60,6 +110,76 @@ def create_todo(
     return crud_todo.create_todo(db, todo_in, current_user.id, org_id)
 
 
+@router.post("/org/{org_id}/batch", response_model=List[TodoBatchResult])
+def batch_todos(
+    org_id: UUID,
+    batch: TodoBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Create, update and delete many todos in one request and one transaction
+
+    Results come back in request order, each with its own status code; a
+    failed item does not undo the others.
+    """
+    # One membership check for the whole batch
+    user_org = db.query(UserOrganization).filter(
+        UserOrganization.user_id == current_user.id,
+        UserOrganization.organization_id == org_id
+    ).first()
+    if not user_org:
+        raise HTTPException(status_code=403, detail="Not a member of this organization")
+    
+    return crud_todo.apply_todo_batch(
+        db, org_id, current_user.id, user_org.role == UserOrganizationRole.ADMIN, batch.operations
+    )
+
+
+@router.patch("/org/{org_id}", response_model=TodoBulkResult)
+def bulk_update_todos(
+    org_id: UUID,
+    values: TodoBulkUpdate,
+    filters: TodoFilter = Depends(get_todo_filter),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Update every todo matching the filters at once, e.g. mark all open todos done"""
+    user_org = db.query(UserOrganization).filter(
+        UserOrganization.user_id == current_user.id,
+        UserOrganization.organization_id == org_id
+    ).first()
+    if not user_org:
+        raise HTTPException(status_code=403, detail="Not a member of this organization")
+    
+    return TodoBulkResult(affected=crud_todo.update_todos_where(db, org_id, filters, values))
+
+
+@router.delete("/org/{org_id}", response_model=TodoBulkResult)
+def bulk_delete_todos(
+    org_id: UUID,
+    filters: TodoFilter = Depends(get_todo_filter),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Delete every todo matching the filters at once, e.g. clear completed
+
+    Members only delete their own todos; admins delete any. At least one
+    filter is required so a bare DELETE cannot wipe the organization.
+    """
+    user_org = db.query(UserOrganization).filter(
+        UserOrganization.user_id == current_user.id,
+        UserOrganization.organization_id == org_id
+    ).first()
+    if not user_org:
+        raise HTTPException(status_code=403, detail="Not a member of this organization")
+    
+    if not filters.model_dump(exclude_none=True):
+        raise HTTPException(status_code=400, detail="At least one filter is required")
+    
+    created_by = None if user_org.role == UserOrganizationRole.ADMIN else current_user.id
+    return TodoBulkResult(affected=crud_todo.delete_todos_where(db, org_id, filters, created_by))
+
+
 @router.put("/org/{org_id}/{todo_id}", response_model=TodoOut)
 def update_todo(
     org_id: UUID,
@@ -105,15 +225,27 @@ def delete_todo(
 # Backward compatibility endpoints - use user's first organization
 @router.get("/", response_model=List[TodoOut])
 def list_todos_legacy(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Get all todos from user's first organization (for backward compatibility)"""
+    """Get todos from user's first organization (for backward compatibility)"""
     if not current_user.organizations:
         raise HTTPException(status_code=403, detail="User not in any organization")
     
-    user_org_id = current_user.organizations[0].id
-    return crud_todo.get_todos(db, user_org_id)
+    org = current_user.organizations[0]
+    unchanged = not_modified(request, response, list_etag(org))
+    if unchanged:
+        return unchanged
+    try:
+        todos, next_cursor = crud_read.list_todos(db, org.id, page.limit, page.cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows_response(todos, crud_read.TODO_FIELDS, response)
 
 
 @router.post("/", response_model=TodoOut)
@@ -0,0 +1,96 @@
+"""In-process stale-while-revalidate cache.
+
+A value younger than ``soft_ttl`` is served as is. An older one is still
+served immediately, and a background thread reloads it; only a value older
+than ``hard_ttl`` (or a miss) makes the caller wait for the load.
+
+Entries carry tags (e.g. the ids of the organizations a response covers) and
+``invalidate`` drops every entry sharing a tag with it. An invalidation also
+discards loads that were already running, so a reload that read the old data
+cannot put it back. The cache is per process; workers learn about each
+other's writes through the organization event feed (``app.core.events``).
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Iterable
+
+
+@dataclass
+class _Entry:
+    value: Any
+    tags: frozenset
+    loaded_at: float
+    refreshing: bool = field(default=False)
+
+
+class StaleWhileRevalidateCache:
+    def __init__(self, soft_ttl: float, hard_ttl: float, max_entries: int, max_workers: int = 2):
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; loads that started before it are not stored
+        self._generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="swr-cache")
+
+    def get(self, key: Hashable, load: Callable[[], tuple[Any, Iterable]]) -> Any:
+        """The cached value for ``key``; ``load`` returns ``(value, tags)``"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.loaded_at < self.hard_ttl:
+                self._entries.move_to_end(key)
+                if now - entry.loaded_at >= self.soft_ttl and not entry.refreshing:
+                    entry.refreshing = True
+                    self._executor.submit(self._refresh, key, load, self._generation)
+                return entry.value
+            generation = self._generation
+        value, tags = load()
+        self._store(key, value, tags, generation)
+        return value
+
+    def invalidate(self, tags: Iterable) -> None:
+        """Drop every entry tagged with any of ``tags``"""
+        tags = frozenset(tags)
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, entry in self._entries.items() if entry.tags & tags]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _refresh(self, key: Hashable, load: Callable, generation: int) -> None:
+        try:
+            value, tags = load()
+        except Exception:
+            # Keep serving the stale value; the next request tries again
+            self._refresh_failed(key)
+            return
+        self._store(key, value, tags, generation)
+
+    def _refresh_failed(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = False
+
+    def _store(self, key: Hashable, value: Any, tags: Iterable, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                # Invalidated while loading; the value may predate the change.
+                # A stale entry left behind gets refreshed again next time.
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+                return
+            self._entries[key] = _Entry(value, frozenset(tags), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -6,6 +6,53 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # List endpoints: page size when none is requested, and the hard cap
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 500
+    # Note search ranks at most this many of the newest matches
+    SEARCH_RANK_WINDOW: int = 2000
+    # Rows fetched per round trip (and written per chunk) by streaming exports
+    EXPORT_BATCH_SIZE: int = 1000
+    # Rows validated and COPY'd into the staging table at a time by bulk imports
+    IMPORT_CHUNK_SIZE: int = 5000
+    # Most operations accepted by one batch mutation request
+    MAX_BATCH_SIZE: int = 500
+    # Delta sync: most changes returned per call, and how long deletions are remembered
+    SYNC_PAGE_SIZE: int = 1000
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+    # Event streams: events buffered per client before it is evicted, seconds
+    # between keepalive comments, and how long a stream lasts before the client
+    # reconnects (and so re-authenticates)
+    EVENTS_BUFFER_SIZE: int = 100
+    EVENTS_KEEPALIVE_SECONDS: int = 15
+    EVENTS_MAX_STREAM_SECONDS: int = 300
+    # GET /organizations/my cache: served as is for the soft TTL, then served
+    # while refreshing in the background until the hard TTL; users kept per worker
+    MY_ORGANIZATIONS_CACHE_SOFT_TTL_SECONDS: float = 10
+    MY_ORGANIZATIONS_CACHE_HARD_TTL_SECONDS: float = 300
+    MY_ORGANIZATIONS_CACHE_MAX_USERS: int = 10000
+    # Build GET /organizations/my JSON in Postgres rather than through pydantic
+    MY_ORGANIZATIONS_RENDER_IN_DB: bool = True
+    # Organization deletion: rows removed per transaction, and how long a running
+    # deletion may go without progress before another request takes it over
+    ORG_DELETE_BATCH_SIZE: int = 1000
+    ORG_DELETE_STALE_SECONDS: int = 300
+    # Background jobs: attempts before a job fails for good, the retry delay
+    # (doubled on each failed attempt, up to the cap), how long a claimed job
+    # stays hidden from other workers without a heartbeat, and how often an
+    # idle worker looks for work
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 10
+    JOB_RETRY_MAX_SECONDS: float = 3600
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 300
+    JOB_POLL_SECONDS: float = 1
+    # Audit log: events written per INSERT, most seconds an event waits in the
+    # buffer, events buffered while the database cannot be written (the oldest
+    # are dropped beyond that), and how long shutdown waits for the last flush
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_SECONDS: float = 1
+    AUDIT_BUFFER_SIZE: int = 100000
+    AUDIT_SHUTDOWN_TIMEOUT_SECONDS: float = 10
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,219 @@
+"""Per-organization change events over Postgres LISTEN/NOTIFY.
+
+Writers call ``notify`` inside their transaction; Postgres delivers the
+notification to listeners only if and when that transaction commits, in
+commit order. Each worker process runs one ``EventBroker``: a single
+listening connection on a background thread that fans notifications out to
+the server-sent event streams subscribed to the organization.
+
+Every subscriber has a bounded buffer. One that falls behind is evicted
+rather than allowed to grow without limit or hold up the others: its buffer is
+dropped and its stream ends with an ``evicted`` event, after which the client
+refetches (or calls /sync) and reconnects. The same happens to every
+subscriber when the listening connection is lost, since notifications sent
+while it was down are gone.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+from typing import Callable
+from uuid import UUID
+
+import psycopg2
+from sqlalchemy import func, select as sql_select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "org_events"
+# Larger changes are announced without ids (``"ids": null``), which tells the
+# client to refetch; it also keeps payloads well under NOTIFY's 8000 byte limit
+MAX_NOTIFY_IDS = 100
+# Pushed to a subscriber's queue when it is evicted
+EVICTED = None
+# Passed to broker listeners when events may have been lost
+RESET_EVENT = {"action": "reset"}
+
+
+def notify(db: Session, org_id: UUID, resource: str, action: str, ids: list[UUID] | None = None) -> None:
+    """Announce a change to ``org_id`` once the current transaction commits
+
+    ``resource`` is ``todos``, ``notes``, ``members`` or ``organization`` and
+    ``action`` one of ``created``, ``updated`` or ``deleted``. ``ids`` are the
+    rows affected; leave it out when they are not known (bulk statements).
+    """
+    if ids is not None and len(ids) > MAX_NOTIFY_IDS:
+        ids = None
+    payload = json.dumps({
+        "org_id": str(org_id),
+        "resource": resource,
+        "action": action,
+        "ids": None if ids is None else [str(row_id) for row_id in ids],
+    })
+    db.execute(sql_select(func.pg_notify(CHANNEL, payload)))
+
+
+class Subscription:
+    """One stream's view of an organization's events, bounded to ``buffer_size``"""
+
+    def __init__(self, org_id: UUID, loop: asyncio.AbstractEventLoop, buffer_size: int):
+        self.org_id = org_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(buffer_size)
+        self.evicted = False
+
+    def offer(self, message: str | None) -> None:
+        """Queue a payload, or evict; runs on the subscriber's event loop"""
+        if self.evicted:
+            return
+        if message is not EVICTED and not self.queue.full():
+            self.queue.put_nowait(message)
+            return
+        self.evicted = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(EVICTED)
+
+    async def get(self, timeout: float) -> str | None:
+        """The next payload, ``EVICTED``, or raises ``asyncio.TimeoutError``"""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class EventBroker:
+    """One LISTEN connection per process, fanned out to many subscribers"""
+
+    def __init__(self, engine: Engine, buffer_size: int | None = None):
+        self.engine = engine
+        self.buffer_size = buffer_size or settings.EVENTS_BUFFER_SIZE
+        self._subscribers: dict[UUID, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._listening = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._listeners: list[Callable[[dict], None]] = []
+
+    def start(self, timeout: float | None = 5.0) -> None:
+        """Start the listener thread if needed and wait until it is listening
+
+        With ``timeout=None`` it returns at once and the thread keeps retrying
+        in the background until the database is reachable.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="event-broker", daemon=True)
+                self._thread.start()
+        if timeout is not None and not self._listening.wait(timeout):
+            raise RuntimeError("Event listener did not start")
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def add_listener(self, callback: Callable[[dict], None]) -> None:
+        """Call ``callback`` with every event, on the listener thread (keep it quick)
+
+        When the listening connection is lost the callback gets
+        ``RESET_EVENT`` instead, since events may have been missed.
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def subscribe(self, org_id: UUID) -> Subscription:
+        """Subscribe the running event loop to ``org_id``'s events"""
+        subscription = Subscription(org_id, asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            self._subscribers.setdefault(org_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.org_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.org_id, None)
+
+    def publish(self, payload: str) -> None:
+        """Hand a notification payload to the organization's subscribers"""
+        try:
+            event = json.loads(payload)
+            org_id = UUID(event["org_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed event payload: %r", payload)
+            return
+        self._call_listeners(event)
+        with self._lock:
+            subscribers = list(self._subscribers.get(org_id, ()))
+        for subscription in subscribers:
+            self._deliver(subscription, payload)
+
+    def _call_listeners(self, event: dict) -> None:
+        for callback in self._listeners:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Event listener %r failed", callback)
+
+    def _evict_all(self) -> None:
+        with self._lock:
+            subscribers = [s for group in self._subscribers.values() for s in group]
+        for subscription in subscribers:
+            self._deliver(subscription, EVICTED)
+
+    @staticmethod
+    def _deliver(subscription: Subscription, message: str | None) -> None:
+        try:
+            subscription.loop.call_soon_threadsafe(subscription.offer, message)
+        except RuntimeError:
+            # The subscriber's event loop has closed; it will not read again
+            pass
+
+    def _run(self) -> None:
+        backoff = 0.5
+        while not self._stopping.is_set():
+            connection = None
+            try:
+                # A dedicated connection, outside the pool, for as long as we listen
+                raw = self.engine.raw_connection()
+                connection = raw.driver_connection
+                raw.detach()
+                connection.autocommit = True
+                connection.cursor().execute(f"LISTEN {CHANNEL}")
+                self._listening.set()
+                backoff = 0.5
+                while not self._stopping.is_set():
+                    if select.select([connection], [], [], 1.0) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self.publish(connection.notifies.pop(0).payload)
+            except (psycopg2.Error, DBAPIError, OSError) as e:
+                logger.warning("Event listener connection lost: %s", e)
+                self._listening.clear()
+                self._evict_all()
+                self._call_listeners(RESET_EVENT)
+                self._stopping.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if connection is not None:
+                    connection.close()
+        self._listening.clear()
+
+
+_broker: EventBroker | None = None
+
+
+def get_event_broker() -> EventBroker:
+    """The process-wide broker (a dependency, so tests can swap it)"""
+    global _broker
+    if _broker is None:
+        _broker = EventBroker(default_engine)
+    return _broker
@@ -0,0 +1,226 @@
+"""Organization deletion in bounded batches, outside the request.
+
+DELETE /organizations/{org_id} only records an ``OrganizationDeletion`` and
+queues a ``JOB_KIND`` job, in one transaction
+(``schedule_organization_deletion``), then answers 202; a worker
+(``app.worker``) then runs ``run_organization_deletion``, which removes the
+organization's memberships, todos, notes and sync tombstones
+``ORG_DELETE_BATCH_SIZE`` rows at a time, each batch in its own short
+transaction that also advances the deletion's counters. Memberships go first, so members lose access right
+away, and the organization row (with its counters) goes last.
+
+A run that dies part way leaves the deletion RUNNING or FAILED; the job's
+next attempt, or requesting the deletion again, resumes it from whatever is
+left. Two runners never work on one deletion: a run first claims it, which
+only succeeds for a PENDING or FAILED deletion, or a RUNNING one that has not
+moved for ``ORG_DELETE_STALE_SECONDS``. A job that finds the deletion held by
+a live run is put off for that long, without using up its attempts.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import func, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from app.core.audit import audit, set_actor
+from app.core.config import settings
+from app.core.events import notify
+from app.crud import crud_job
+from app.crud.crud_organization import invalidate_cached_organizations
+from app.models.job import Job
+from app.models.organization import Organization
+from app.models.organization_deletion import DeletionStatus, OrganizationDeletion
+
+logger = logging.getLogger(__name__)
+
+deletions = OrganizationDeletion.__table__
+
+JOB_KIND = "delete_organization"
+
+
+def _batch_statement(table: str, returning: str = "1") -> TextClause:
+    # Rows are picked by ctid through the (organization_id, ...) indexes and
+    # deleted by TID scan, so a batch never visits the rest of the table
+    return text(f"""
+        DELETE FROM {table}
+        WHERE ctid = ANY(ARRAY(SELECT ctid FROM {table} WHERE organization_id = :org_id LIMIT :batch_size))
+        RETURNING {returning}
+    """)
+
+
+# (table, statement, counter column) in deletion order; memberships return
+# their users, so the users' cached organization lists can be dropped, and
+# their roles for the audit log
+STEPS = [
+    ("user_organizations", _batch_statement("user_organizations", "user_id, role"), deletions.c.members_deleted),
+    ("todos", _batch_statement("todos"), deletions.c.todos_deleted),
+    ("notes", _batch_statement("notes"), deletions.c.notes_deleted),
+    # Left behind by the todo and note batches; dropped in batches too rather
+    # than all at once by the organization's ON DELETE CASCADE
+    ("sync_tombstones", _batch_statement("sync_tombstones"), None),
+]
+
+
+def request_organization_deletion(
+    db: Session, org: Organization, requested_by: UUID, commit: bool = True
+) -> OrganizationDeletion:
+    """Record the deletion of ``org``, or return the one already recorded
+
+    Totals are taken from the organization's counters, so nothing is counted.
+    """
+    stats = org.stats
+    requested = db.execute(
+        insert(OrganizationDeletion)
+        .values(
+            organization_id=org.id,
+            organization_name=org.name,
+            requested_by=requested_by,
+            status=DeletionStatus.PENDING,
+            members_total=stats.members if stats else 0,
+            todos_total=stats.open_todos + stats.done_todos if stats else 0,
+            notes_total=stats.notes if stats else 0,
+        )
+        .on_conflict_do_nothing(index_elements=["organization_id"])
+    ).rowcount
+    if requested:
+        audit(db, org.id, "organization", "deleted", org.id, {"name": org.name, "status": DeletionStatus.PENDING.value})
+    if commit:
+        db.commit()
+    return get_organization_deletion(db, org.id)
+
+
+def _is_stale(deletion: OrganizationDeletion) -> bool:
+    stale = datetime.now(timezone.utc) - timedelta(seconds=settings.ORG_DELETE_STALE_SECONDS)
+    return deletion.status in (DeletionStatus.PENDING, DeletionStatus.RUNNING) and deletion.updated_at < stale
+
+
+def schedule_organization_deletion(
+    db: Session, org: Organization, requested_by: UUID
+) -> tuple[OrganizationDeletion, Job]:
+    """Record the deletion of ``org`` and queue the job carrying it out, in one transaction
+
+    A deletion under way keeps the job it has, which is returned. A new job is
+    queued for a new deletion, a FAILED one, or one whose run has stopped: no
+    live job, or no progress for ``ORG_DELETE_STALE_SECONDS``.
+    """
+    deletion = request_organization_deletion(db, org, requested_by, commit=False)
+    job = None
+    if deletion.status != DeletionStatus.FAILED and not _is_stale(deletion):
+        job = crud_job.get_live_job(db, JOB_KIND, org.id)
+    if job is None:
+        job = crud_job.enqueue_job(
+            db, JOB_KIND, {"deletion_id": str(deletion.id)},
+            organization_id=org.id, created_by=requested_by, commit=False,
+        )
+    db.commit()
+    return deletion, job
+
+
+def get_organization_deletion(db: Session, org_id: UUID) -> OrganizationDeletion | None:
+    return db.query(OrganizationDeletion).filter(OrganizationDeletion.organization_id == org_id).first()
+
+
+def _claim(db: Session, deletion_id: UUID):
+    """Mark the job RUNNING if no live run holds it; returns its organization and requester"""
+    stale = func.now() - timedelta(seconds=settings.ORG_DELETE_STALE_SECONDS)
+    claimed = db.execute(
+        update(deletions)
+        .where(
+            deletions.c.id == deletion_id,
+            (deletions.c.status.in_([DeletionStatus.PENDING, DeletionStatus.FAILED]))
+            | ((deletions.c.status == DeletionStatus.RUNNING) & (deletions.c.updated_at < stale)),
+        )
+        .values(status=DeletionStatus.RUNNING, error=None, updated_at=func.now())
+        .returning(deletions.c.organization_id, deletions.c.requested_by)
+    ).first()
+    db.commit()
+    return claimed
+
+
+def _delete_batches(db: Session, org_id: UUID, deletion_id: UUID, batch_size: int) -> None:
+    for table, statement, counter in STEPS:
+        while True:
+            rows = db.execute(statement, {"org_id": org_id, "batch_size": batch_size}).all()
+            progress = {"updated_at": func.now()}
+            if counter is not None:
+                progress[counter.key] = counter + len(rows)
+            db.execute(update(deletions).where(deletions.c.id == deletion_id).values(**progress))
+            user_ids = [row.user_id for row in rows] if table == "user_organizations" else []
+            if user_ids:
+                notify(db, org_id, "members", "deleted", user_ids)
+                for row in rows:
+                    audit(db, org_id, "members", "deleted", row.user_id, {"role": row.role})
+            db.commit()
+            if table == "user_organizations":
+                invalidate_cached_organizations([org_id, *user_ids])
+            if len(rows) < batch_size:
+                break
+
+
+def run_organization_deletion(bind, deletion_id: UUID, batch_size: int | None = None) -> None:
+    """Carry out a recorded deletion; a no-op if another run is already on it
+
+    Runs in its own session on ``bind``, after the request that scheduled it
+    has been answered, and is audited as the requester's doing. A failure is
+    recorded on the job, which can be resumed.
+    """
+    batch_size = batch_size or settings.ORG_DELETE_BATCH_SIZE
+    with Session(bind=bind) as db:
+        claimed = _claim(db, deletion_id)
+        if claimed is None:
+            return
+        org_id, requested_by = claimed
+        set_actor(db, requested_by)
+        try:
+            _delete_batches(db, org_id, deletion_id, batch_size)
+            db.execute(text("DELETE FROM organizations WHERE id = :org_id"), {"org_id": org_id})
+            counts = db.execute(
+                update(deletions)
+                .where(deletions.c.id == deletion_id)
+                .values(status=DeletionStatus.DONE, updated_at=func.now(), finished_at=func.now())
+                .returning(deletions.c.members_deleted, deletions.c.todos_deleted, deletions.c.notes_deleted)
+            ).one()
+            notify(db, org_id, "organization", "deleted", [org_id])
+            audit(db, org_id, "organization", "deleted", org_id, {"status": DeletionStatus.DONE.value, **counts._asdict()})
+            db.commit()
+            invalidate_cached_organizations([org_id])
+        except Exception as e:
+            logger.exception("Deleting organization %s failed", org_id)
+            db.rollback()
+            db.execute(
+                update(deletions)
+                .where(deletions.c.id == deletion_id)
+                .values(status=DeletionStatus.FAILED, error=str(e), updated_at=func.now())
+            )
+            db.commit()
+
+
+def run_deletion_job(bind, payload: dict) -> dict:
+    """Job handler for ``JOB_KIND``; raises unless the deletion is done, so the job is retried
+
+    A deletion this run could not claim is held by another run, which may
+    have died: the job is put off until the deletion could be taken over,
+    ``ORG_DELETE_STALE_SECONDS`` on, without using up an attempt.
+    """
+    deletion_id = UUID(payload["deletion_id"])
+    run_organization_deletion(bind, deletion_id)
+    with Session(bind=bind) as db:
+        deletion = db.get(OrganizationDeletion, deletion_id)
+        if deletion is None:
+            raise ValueError(f"Organization deletion {deletion_id} not found")
+        if deletion.status == DeletionStatus.FAILED:
+            raise RuntimeError(deletion.error)
+        if deletion.status != DeletionStatus.DONE:
+            raise crud_job.RetryLater(
+                f"Organization deletion {deletion_id} is {deletion.status.value} in another run",
+                settings.ORG_DELETE_STALE_SECONDS,
+            )
+        return {
+            "status": deletion.status.value,
+            "members_deleted": deletion.members_deleted,
+            "todos_deleted": deletion.todos_deleted,
+            "notes_deleted": deletion.notes_deleted,
+        }
@@ -0,0 +1,108 @@
+"""Streaming exports of an organization's todos and notes.
+
+Rows are read through a server-side cursor in ``EXPORT_BATCH_SIZE`` batches
+and each batch is serialized into one chunk, so memory stays flat however
+large the organization is. Rows come out in ``(created_at, id)`` order; a
+client that loses the connection resumes with the ``created_at`` and ``id``
+of the last row it received.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.note import Note
+from app.models.todo import Todo
+from app.schemas.export import ExportFormat, ExportResource
+
+EXPORT_COLUMNS = {
+    ExportResource.TODOS: (
+        Todo.id, Todo.title, Todo.description, Todo.completed,
+        Todo.created_by, Todo.created_at, Todo.updated_at,
+    ),
+    ExportResource.NOTES: (
+        Note.id, Note.title, Note.content,
+        Note.created_by, Note.created_at, Note.updated_at,
+    ),
+}
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def export_batches(
+    db: Session,
+    org_id: UUID,
+    resource: ExportResource,
+    after: tuple[datetime, UUID] | None = None,
+    batch_size: int | None = None,
+) -> Iterator[list]:
+    """Yield lists of rows, oldest first, starting after ``(created_at, id)``"""
+    columns = EXPORT_COLUMNS[resource]
+    model = columns[0].class_
+    stmt = select(*columns).where(model.organization_id == org_id)
+    if after:
+        stmt = stmt.where(tuple_(model.created_at, model.id) > after)
+    # yield_per implies stream_results: psycopg2 fetches through a named cursor
+    stmt = stmt.order_by(model.created_at, model.id).execution_options(
+        yield_per=batch_size or settings.EXPORT_BATCH_SIZE
+    )
+    yield from db.execute(stmt).partitions()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def stream_export(
+    db: Session,
+    org_id: UUID,
+    resource: ExportResource,
+    fmt: ExportFormat,
+    after: tuple[datetime, UUID] | None = None,
+    batch_size: int | None = None,
+) -> Iterator[str]:
+    """Serialize an export into chunks of text, one chunk per batch of rows"""
+    names = [column.key for column in EXPORT_COLUMNS[resource]]
+    batches = export_batches(db, org_id, resource, after, batch_size)
+
+    if fmt == ExportFormat.NDJSON:
+        for rows in batches:
+            yield "".join(
+                json.dumps(dict(zip(names, row)), default=_json_default) + "\n" for row in rows
+            )
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for rows in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # An empty export still gets its header row
+    if buffer.tell():
+        yield buffer.getvalue()
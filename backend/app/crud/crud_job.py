@@ -0,0 +1,186 @@
+"""A durable job queue in Postgres.
+
+``enqueue_job`` inserts a QUEUED row (inside the caller's transaction, so a
+job exists if and only if the work that asked for it committed) and wakes
+idle workers with a NOTIFY on ``CHANNEL``. Workers (``app.worker``) take the
+most urgent ready job with ``claim_job``: one UPDATE over a
+``SELECT ... FOR UPDATE SKIP LOCKED`` subquery, so concurrent workers each
+get a different job without waiting on one another.
+
+A claimed job is RUNNING with ``run_at`` pushed to the end of its visibility
+timeout; the worker's heartbeat keeps pushing it while the handler runs. If
+the worker dies the heartbeat stops, the job becomes ready again and another
+worker claims it. Every claim bumps ``attempts``, and the completion calls
+only apply to the attempt they were given, so a worker that lost its job
+cannot overwrite the outcome of the one that took it over.
+
+A failed attempt is retried after an exponential backoff until
+``max_attempts`` is reached, then the job is FAILED with its last error. A
+handler that cannot run yet raises ``RetryLater`` instead: the job is
+requeued after the delay it asks for, and the attempt is not counted.
+"""
+import random
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job import Job, JobStatus
+
+CHANNEL = "jobs"
+
+jobs = Job.__table__
+
+
+class RetryLater(Exception):
+    """Raised by a handler whose job cannot run yet; requeued after ``delay`` seconds, not counted as an attempt"""
+
+    def __init__(self, reason: str, delay: float):
+        super().__init__(reason)
+        self.delay = delay
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    priority: int = 0,
+    organization_id: UUID | None = None,
+    created_by: UUID | None = None,
+    max_attempts: int | None = None,
+    commit: bool = True,
+) -> Job:
+    """Queue ``kind`` to run with ``payload`` (JSON-serializable); higher ``priority`` runs first
+
+    With ``commit=False`` the job is only queued if the caller's transaction
+    commits, and workers are woken then.
+    """
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        priority=priority,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        organization_id=organization_id,
+        created_by=created_by,
+    )
+    db.add(job)
+    db.flush()
+    db.execute(select(func.pg_notify(CHANNEL, kind)))
+    if commit:
+        db.commit()
+        db.refresh(job)
+    return job
+
+
+def get_job(db: Session, job_id: UUID) -> Job | None:
+    return db.query(Job).filter(Job.id == job_id).first()
+
+
+def get_live_job(db: Session, kind: str, organization_id: UUID) -> Job | None:
+    """The newest QUEUED or RUNNING ``kind`` job of ``organization_id``; read off ``ix_jobs_ready``"""
+    return (
+        db.query(Job)
+        .filter(
+            Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+            Job.kind == kind,
+            Job.organization_id == organization_id,
+        )
+        .order_by(Job.created_at.desc())
+        .first()
+    )
+
+
+def claim_job(db: Session, worker_id: str, visibility_timeout: float | None = None) -> Row | None:
+    """Take the most urgent ready job for ``worker_id``, or None if there is none
+
+    Commits at once, so the claim is visible to other workers and no lock is
+    held while the job runs.
+    """
+    visibility_timeout = visibility_timeout or settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+    ready = (
+        select(jobs.c.id)
+        .where(jobs.c.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]), jobs.c.run_at <= func.now())
+        .order_by(jobs.c.priority.desc(), jobs.c.run_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    job = db.execute(
+        update(jobs)
+        .where(jobs.c.id == ready)
+        .values(
+            status=JobStatus.RUNNING,
+            attempts=jobs.c.attempts + 1,
+            run_at=func.now() + timedelta(seconds=visibility_timeout),
+            locked_by=worker_id,
+            updated_at=func.now(),
+        )
+        .returning(jobs)
+    ).first()
+    db.commit()
+    return job
+
+
+def _update_attempt(db: Session, job: Row, **values) -> bool:
+    """Apply ``values`` if ``job`` is still on the attempt we claimed; False if it was taken over"""
+    updated = db.execute(
+        update(jobs)
+        .where(jobs.c.id == job.id, jobs.c.status == JobStatus.RUNNING, jobs.c.attempts == job.attempts)
+        .values(updated_at=func.now(), **values)
+    ).rowcount
+    db.commit()
+    return bool(updated)
+
+
+def heartbeat(db: Session, job: Row, visibility_timeout: float | None = None) -> bool:
+    """Keep ``job`` hidden from other workers for another visibility timeout"""
+    visibility_timeout = visibility_timeout or settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+    return _update_attempt(db, job, run_at=func.now() + timedelta(seconds=visibility_timeout))
+
+
+def complete_job(db: Session, job: Row, result: dict[str, Any] | None = None) -> bool:
+    return _update_attempt(
+        db, job, status=JobStatus.DONE, result=result, last_error=None, locked_by=None, finished_at=func.now()
+    )
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before the next attempt after ``attempts`` failed ones
+
+    Doubles with each failure up to ``JOB_RETRY_MAX_SECONDS``, less up to half
+    at random so jobs that failed together do not all retry together.
+    """
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def fail_job(db: Session, job: Row, error: str, retry: bool = True) -> bool:
+    """Record a failed attempt: requeue with backoff, or fail for good once attempts run out"""
+    if retry and job.attempts < job.max_attempts:
+        return _update_attempt(
+            db, job,
+            status=JobStatus.QUEUED,
+            run_at=func.now() + timedelta(seconds=retry_delay(job.attempts)),
+            last_error=error,
+            locked_by=None,
+        )
+    return _update_attempt(
+        db, job, status=JobStatus.FAILED, last_error=error, locked_by=None, finished_at=func.now()
+    )
+
+
+def defer_job(db: Session, job: Row, reason: str, delay: float) -> bool:
+    """Requeue ``job`` to run after ``delay`` seconds, giving back the attempt its claim took"""
+    return _update_attempt(
+        db, job,
+        status=JobStatus.QUEUED,
+        attempts=jobs.c.attempts - 1,
+        run_at=func.now() + timedelta(seconds=delay),
+        last_error=reason,
+        locked_by=None,
+    )
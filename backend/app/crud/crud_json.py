@@ -0,0 +1,109 @@
+"""Responses rendered to JSON inside Postgres.
+
+For GET /organizations/my one statement reads the user's organizations and
+their members and returns the finished response body as text. Nothing is
+hydrated, validated or re-encoded in Python.
+
+The body must be byte for byte what the pydantic response model would
+produce, so clients and caches cannot tell the two paths apart. Postgres'
+``json_build_object`` and ``json_agg`` put spaces and newlines between
+elements, so objects are concatenated here from ``string_agg`` and
+per-field JSON text instead. Each field is rendered the way pydantic renders
+its type: strings escaped by ``to_json``, UUIDs and enums quoted, and
+datetimes in ISO 8601 with microseconds only when non-zero and ``Z`` for
+UTC. Keys come in schema order, taken from the models at import time, and
+``tests/test_my_organizations_json.py`` holds the two paths to the same
+bytes.
+"""
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.schemas.organization import OrganizationMemberOut, OrganizationStatsOut, OrganizationWithMembers
+
+
+def _or_null(expr: str) -> str:
+    return f"coalesce({expr}, 'null')"
+
+
+def _string(column: str) -> str:
+    return _or_null(f"to_json({column})::text")
+
+
+def _quoted(column: str) -> str:
+    """UUIDs and enums: their text form needs no escaping"""
+    return _or_null(f"'\"' || {column}::text || '\"'")
+
+
+def _scalar(column: str) -> str:
+    """Numbers and booleans print the same in SQL and JSON"""
+    return _or_null(f"{column}::text")
+
+
+def _datetime(column: str) -> str:
+    return _or_null(
+        f"'\"' || to_char({column}, 'YYYY-MM-DD\"T\"HH24:MI:SS')"
+        f" || CASE WHEN to_char({column}, 'US') = '000000' THEN '' ELSE to_char({column}, '.US') END"
+        f" || CASE WHEN to_char({column}, 'TZH:TZM') = '+00:00' THEN 'Z' ELSE to_char({column}, 'TZH:TZM') END"
+        f" || '\"'"
+    )
+
+
+def _object(schema, fields: dict[str, str]) -> str:
+    """A compact JSON object with ``fields`` (name -> JSON text SQL) in ``schema`` order"""
+    if set(fields) != set(schema.model_fields):
+        raise RuntimeError(f"JSON rendering of {schema.__name__} is out of date with its fields")
+    members = " || ',' || ".join(f"'\"{name}\":' || {fields[name]}" for name in schema.model_fields)
+    return f"'{{' || {members} || '}}'"
+
+
+MEMBER_JSON = _object(OrganizationMemberOut, {
+    "id": _quoted("u.id"),
+    "username": _string("u.username"),
+    "email": _string("u.email"),
+    "role": _quoted("m.role"),
+    "is_active": _scalar("u.is_active"),
+    "created_at": _datetime("u.created_at"),
+})
+
+STATS_JSON = _object(OrganizationStatsOut, {name: _scalar(f"s.{name}") for name in OrganizationStatsOut.model_fields})
+
+ORGANIZATION_JSON = _object(OrganizationWithMembers, {
+    "id": _quoted("o.id"),
+    "name": _string("o.name"),
+    "created_at": _datetime("o.created_at"),
+    "user_role": _quoted("uo.role"),
+    "stats": f"CASE WHEN s.organization_id IS NULL THEN 'null' ELSE {STATS_JSON} END",
+    # The first :member_limit members to join, oldest first
+    "members": f"""CASE WHEN :include_members THEN coalesce((
+        SELECT '[' || string_agg(page.member, ',' ORDER BY page.joined_at, page.id) || ']'
+        FROM (
+            SELECT {MEMBER_JSON} AS member, m.joined_at, u.id
+            FROM user_organizations m JOIN users u ON u.id = m.user_id
+            WHERE m.organization_id = o.id
+            ORDER BY m.joined_at, u.id
+            LIMIT :member_limit
+        ) page
+    ), '[]') ELSE '[]' END""",
+})
+
+MY_ORGANIZATIONS_SQL = text(f"""
+    SELECT '[' || coalesce(string_agg({ORGANIZATION_JSON}, ',' ORDER BY uo.joined_at, o.id), '') || ']' AS body,
+           coalesce(array_agg(o.id), '{{}}') AS org_ids
+    FROM user_organizations uo
+    JOIN organizations o ON o.id = uo.organization_id
+    LEFT JOIN organization_stats s ON s.organization_id = o.id
+    WHERE uo.user_id = :user_id
+""")
+
+
+def my_organizations_json(
+    db: Session, user_id: UUID, include_members: bool, member_limit: int
+) -> tuple[bytes, list[UUID]]:
+    """GET /organizations/my as JSON bytes, and the ids of the organizations in it"""
+    body, org_ids = db.execute(
+        MY_ORGANIZATIONS_SQL,
+        {"user_id": user_id, "include_members": include_members, "member_limit": member_limit},
+    ).one()
+    return body.encode(), list(org_ids)
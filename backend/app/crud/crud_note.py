@@ -1,8 +1,25 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from app.models.note import Note
+from app.core.config import settings
+from app.core.audit import audit
+from app.core.events import notify
 from app.schemas.note import NoteCreate, NoteUpdate
 from uuid import UUID
 
+# Text search configuration used for notes.search_vector; queries must match it
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10"
+
+
+def _html_escape(column):
+    # The parser reads &amp; &lt; &gt; as entities, not words, so escaping
+    # before ts_headline leaves matching alone and <mark> the only markup
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")):
+        column = func.replace(column, char, entity)
+    return column
+
+
 class CRUDNote:
     def create(self, db: Session, *, obj_in: NoteCreate, user_id: UUID, org_id: UUID):
         db_obj = Note(
@@ -12,22 +29,72 @@ class CRUDNote:
             organization_id=org_id,
         )
         db.add(db_obj)
+        db.flush()
+        notify(db, org_id, "notes", "created", [db_obj.id])
+        audit(db, org_id, "notes", "created", db_obj.id, {"title": db_obj.title})
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
-    def get_multi_by_org(self, db: Session, org_id: UUID):
-        return db.query(Note).filter(Note.organization_id == org_id).all()
+    def search(self, db: Session, org_id: UUID, query: str, limit: int, offset: int = 0):
+        """Ranked full-text search; returns (hits, has_more)
+
+        Only the newest ``SEARCH_RANK_WINDOW`` matches are ranked, so a term
+        that appears in most notes costs a bounded index walk instead of
+        ranking every match in the organization.
+        """
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        candidates = (
+            select(
+                Note.id, Note.title, Note.content, Note.created_by,
+                Note.created_at, Note.updated_at, Note.search_vector,
+            )
+            .where(Note.organization_id == org_id, Note.search_vector.bool_op("@@")(tsquery))
+            .order_by(Note.created_at.desc())
+            .limit(settings.SEARCH_RANK_WINDOW)
+            .subquery()
+        )
+        # Normalization 32 scales rank into [0, 1)
+        rank = func.ts_rank_cd(candidates.c.search_vector, tsquery, 32)
+        matches = (
+            select(
+                candidates.c.id, candidates.c.title, candidates.c.content, candidates.c.created_by,
+                candidates.c.created_at, candidates.c.updated_at, rank.label("rank"),
+            )
+            .order_by(rank.desc(), candidates.c.id)
+            .limit(limit + 1)
+            .offset(offset)
+            .subquery()
+        )
+        # ts_headline re-parses the text, so only run it for the page being returned
+        stmt = select(
+            matches.c.id, matches.c.title, matches.c.created_by,
+            matches.c.created_at, matches.c.updated_at, matches.c.rank,
+            func.ts_headline(
+                SEARCH_CONFIG, _html_escape(matches.c.title), tsquery, HEADLINE_OPTIONS
+            ).label("title_highlight"),
+            func.ts_headline(
+                SEARCH_CONFIG, _html_escape(func.coalesce(matches.c.content, "")), tsquery, HEADLINE_OPTIONS
+            ).label("content_highlight"),
+        ).order_by(matches.c.rank.desc(), matches.c.id)
+        rows = db.execute(stmt).all()
+        return rows[:limit], len(rows) > limit
 
     def update(self, db: Session, *, db_obj: Note, obj_in: NoteUpdate):
+        # Audited by title; note content is not copied into the audit log
+        changes = {"title": obj_in.title, "content_changed": obj_in.content != db_obj.content}
         db_obj.title = obj_in.title
         db_obj.content = obj_in.content
+        notify(db, db_obj.organization_id, "notes", "updated", [db_obj.id])
+        audit(db, db_obj.organization_id, "notes", "updated", db_obj.id, changes)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
     def delete(self, db: Session, *, db_obj: Note):
         db.delete(db_obj)
+        notify(db, db_obj.organization_id, "notes", "deleted", [db_obj.id])
+        audit(db, db_obj.organization_id, "notes", "deleted", db_obj.id, {"title": db_obj.title})
         db.commit()
         return db_obj
 
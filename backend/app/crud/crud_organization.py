@@ -1,15 +1,39 @@
+from collections import defaultdict
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import bindparam, delete, exists, func, insert, literal, select, text, union_all, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from typing import List
 from app.models.organization import Organization
+from app.models.organization_stats import OrganizationStats
 from app.models.user import User
 from app.models.user_organization import UserOrganization, UserOrganizationRole
-from app.schemas.organization import OrganizationCreate, OrganizationUpdate, UserInvite
+from app.schemas.organization import (
+    MemberBatchOperation, OrganizationCreate, OrganizationUpdate, OrganizationWithMembers, UserInvite,
+)
+from app.core.audit import audit
+from app.core.cache import StaleWhileRevalidateCache
+from app.core.config import settings
+from app.core.events import RESET_EVENT, notify
 from app.core.security import hash_password
+from app.crud import crud_json, crud_read
 from uuid import UUID
 import secrets
 import string
 
+# Fuzzy user search falls back to prefix-only when the server lacks pg_trgm
+_trigram_support: dict[str, bool] = {}
+
+# GET /organizations/my, rendered, per user id. Entries are tagged with the
+# user and their organizations and dropped on membership, role and name
+# changes; counters in the response may lag by up to the soft TTL.
+my_organizations_cache = StaleWhileRevalidateCache(
+    soft_ttl=settings.MY_ORGANIZATIONS_CACHE_SOFT_TTL_SECONDS,
+    hard_ttl=settings.MY_ORGANIZATIONS_CACHE_HARD_TTL_SECONDS,
+    max_entries=settings.MY_ORGANIZATIONS_CACHE_MAX_USERS,
+)
+_my_organizations_adapter = TypeAdapter(List[OrganizationWithMembers])
+
 
 def create_organization(db: Session, org_in: OrganizationCreate, creator_id: UUID) -> Organization:
     """Create a new organization and make the creator an admin"""
@@ -28,7 +52,11 @@ def create_organization(db: Session, org_in: OrganizationCreate, creator_id: UUI
         )
         db.add(user_org)
     
+    audit(db, org.id, "organization", "created", org.id, {"name": org.name})
+    if creator:
+        audit(db, org.id, "members", "created", creator_id, {"role": UserOrganizationRole.ADMIN.value})
     db.commit()
+    invalidate_cached_organizations([creator_id])
     db.refresh(org)
     return org
 
@@ -50,14 +78,10 @@ def update_organization(db: Session, org: Organization, org_in: OrganizationUpda
     """Update organization details"""
     for field, value in org_in.model_dump(exclude_unset=True).items():
         setattr(org, field, value)
+    notify(db, org.id, "organization", "updated", [org.id])
+    audit(db, org.id, "organization", "updated", org.id, org_in.model_dump(mode="json", exclude_unset=True))
     db.commit()
-    return org
-
-
-def delete_organization(db: Session, org: Organization) -> Organization:
-    """Delete organization and all associated data"""
-    db.delete(org)
-    db.commit()
+    invalidate_cached_organizations([org.id])
     return org
 
 
@@ -92,7 +116,10 @@ def invite_user_to_organization(
             role=UserOrganizationRole(user_invite.role)
         )
         db.add(user_org)
+        notify(db, org_id, "members", "created", [existing_user.id])
+        audit(db, org_id, "members", "created", existing_user.id, {"role": user_org.role.value})
         db.commit()
+        invalidate_cached_organizations([org_id, existing_user.id])
         db.refresh(existing_user)
         return existing_user, "User added to organization"
     
@@ -113,60 +140,165 @@ def invite_user_to_organization(
         role=UserOrganizationRole(user_invite.role)
     )
     db.add(user_org)
+    notify(db, org_id, "members", "created", [user.id])
+    audit(db, org_id, "members", "created", user.id, {"role": user_org.role.value, "invited": True})
     
     db.commit()
+    invalidate_cached_organizations([org_id, user.id])
     db.refresh(user)
     
     return user, temp_password
 
 
-def get_organization_members(db: Session, org_id: UUID) -> List[dict]:
-    """Get all members of an organization with their roles"""
-    user_orgs = db.query(UserOrganization).filter(
-        UserOrganization.organization_id == org_id
-    ).all()
-    
-    members = []
-    for user_org in user_orgs:
-        user = user_org.user
-        members.append({
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "role": user_org.role,
-            "is_active": user.is_active,
-            "created_at": user.created_at,
-            "joined_at": user_org.joined_at
-        })
-    
-    return members
+def get_organization_members(db: Session, org_id: UUID, limit: int | None = None) -> List[dict]:
+    """Get the members of an organization with their roles, the first ``limit`` to join"""
+    return [member._asdict() for member in crud_read.list_members(db, org_id, limit)]
 
 
-def update_user_role(db: Session, user_id: UUID, org_id: UUID, new_role: UserOrganizationRole) -> User:
-    """Update a user's role within an organization"""
+def get_user_organizations_with_members(
+    db: Session, user_id: UUID, include_members: bool = True, member_limit: int | None = None
+) -> List[dict]:
+    """The user's organizations, each with the user's role, its members and counters
+
+    Two queries however many organizations and members there are: one for the
+    organizations and one (skipped without ``include_members``) for the first
+    ``member_limit`` members to join each. ``stats.members`` has the full count.
+    """
+    orgs = crud_read.list_user_organizations(db, user_id)
+    members = defaultdict(list)
+    if include_members and orgs:
+        limit = member_limit or settings.DEFAULT_PAGE_SIZE
+        for row in crud_read.list_members_of(db, [org.id for org in orgs], limit):
+            member = row._asdict()
+            members[member.pop("organization_id")].append(member)
+
+    return [
+        {
+            "id": org.id,
+            "name": org.name,
+            "created_at": org.created_at,
+            "user_role": org.user_role,
+            "members": members[org.id],
+            "stats": None if org.open_todos is None else {
+                name: getattr(org, name) for name in crud_read.STATS_FIELDS
+            },
+        }
+        for org in orgs
+    ]
+
+
+def render_my_organizations(
+    bind, user_id: UUID, include_members: bool = True, member_limit: int | None = None
+) -> tuple[bytes, list[UUID]]:
+    """GET /organizations/my as JSON, and the cache tags for it
+
+    Runs in its own session on ``bind`` because the cache may call it from a
+    background thread after the request that triggered it has finished. With
+    ``MY_ORGANIZATIONS_RENDER_IN_DB`` Postgres writes the JSON itself
+    (``crud_json``); the bytes are the same either way.
+    """
+    with Session(bind=bind) as db:
+        if settings.MY_ORGANIZATIONS_RENDER_IN_DB:
+            content, org_ids = crud_json.my_organizations_json(
+                db, user_id, include_members, member_limit or settings.DEFAULT_PAGE_SIZE
+            )
+            return content, [user_id, *org_ids]
+        organizations = get_user_organizations_with_members(db, user_id, include_members, member_limit)
+        content = _my_organizations_adapter.dump_json(_my_organizations_adapter.validate_python(organizations))
+    return content, [user_id, *(org["id"] for org in organizations)]
+
+
+def invalidate_cached_organizations(ids: List[UUID]) -> None:
+    """Drop cached GET /organizations/my responses for these users or organizations"""
+    my_organizations_cache.invalidate(ids)
+
+
+def invalidate_on_event(event: dict) -> None:
+    """Event broker listener: apply other workers' organization changes to our cache"""
+    if event is RESET_EVENT:
+        # Changes may have gone unannounced while the listener reconnected
+        my_organizations_cache.clear()
+    elif event.get("resource") in ("members", "organization"):
+        invalidate_cached_organizations([UUID(event["org_id"]), *(UUID(i) for i in event.get("ids") or [])])
+
+
+class LastAdminError(ValueError):
+    """Raised when a change would leave an organization without an admin"""
+
+
+def lock_admin_count(db: Session, org_id: UUID) -> int:
+    """The organization's admin count, with admin changes locked out until commit
+
+    Reads the counter in ``organization_stats`` FOR UPDATE, so concurrent role
+    changes and removals in one organization take turns and each sees the
+    count the previous one left. Without a counter row the admin memberships
+    themselves are counted and locked.
+    """
+    admins = db.execute(
+        select(OrganizationStats.admins).where(OrganizationStats.organization_id == org_id).with_for_update()
+    ).scalar_one_or_none()
+    if admins is None:
+        admins = len(db.execute(
+            select(UserOrganization.id).where(
+                UserOrganization.organization_id == org_id,
+                UserOrganization.role == UserOrganizationRole.ADMIN,
+            ).with_for_update()
+        ).all())
+    return admins
+
+
+def _get_membership_guarded(db: Session, user_id: UUID, org_id: UUID, leaving_admin: str) -> UserOrganization:
+    """The user's membership, checked and locked for a change that may drop an admin
+
+    Raises LastAdminError with ``leaving_admin`` if the user is the
+    organization's only admin.
+    """
+    admins = lock_admin_count(db, org_id)
     user_org = db.query(UserOrganization).filter(
         UserOrganization.user_id == user_id,
         UserOrganization.organization_id == org_id
     ).first()
-    
+
     if not user_org:
         raise ValueError("User not found in organization")
-    
+    if user_org.role == UserOrganizationRole.ADMIN and admins <= 1:
+        raise LastAdminError(leaving_admin)
+    return user_org
+
+
+def update_user_role(db: Session, user_id: UUID, org_id: UUID, new_role: UserOrganizationRole) -> User:
+    """Update a user's role within an organization
+
+    Raises LastAdminError rather than demote the organization's only admin.
+    """
+    if new_role == UserOrganizationRole.ADMIN:
+        user_org = db.query(UserOrganization).filter(
+            UserOrganization.user_id == user_id,
+            UserOrganization.organization_id == org_id
+        ).first()
+        if not user_org:
+            raise ValueError("User not found in organization")
+    else:
+        user_org = _get_membership_guarded(
+            db, user_id, org_id, "Cannot remove admin role from the last admin in organization"
+        )
+
+    previous_role = user_org.role
     user_org.role = new_role
+    notify(db, org_id, "members", "updated", [user_id])
+    audit(db, org_id, "members", "updated", user_id, {"role": new_role.value, "previous_role": previous_role.value})
     db.commit()
+    invalidate_cached_organizations([org_id, user_id])
     db.refresh(user_org)
     return user_org.user
 
 
 def remove_user_from_organization(db: Session, user_id: UUID, org_id: UUID) -> User:
-    """Remove a user from an organization"""
-    user_org = db.query(UserOrganization).filter(
-        UserOrganization.user_id == user_id,
-        UserOrganization.organization_id == org_id
-    ).first()
-    
-    if not user_org:
-        raise ValueError("User not found in organization")
+    """Remove a user from an organization
+
+    Raises LastAdminError rather than remove the organization's only admin.
+    """
+    user_org = _get_membership_guarded(db, user_id, org_id, "Cannot remove the last admin from organization")
     
     user = user_org.user
     
@@ -181,7 +313,10 @@ def remove_user_from_organization(db: Session, user_id: UUID, org_id: UUID) -> U
     if remaining_orgs == 0:
         user.is_active = False
     
+    notify(db, org_id, "members", "deleted", [user_id])
+    audit(db, org_id, "members", "deleted", user_id, {"role": user_org.role.value})
     db.commit()
+    invalidate_cached_organizations([org_id, user_id])
     db.refresh(user)
     return user
 
@@ -211,11 +346,113 @@ def add_user_to_organization(db: Session, user_id: UUID, org_id: UUID, role: Use
     )
     db.add(user_org)
     user.is_active = True  # Activate user when added to org
+    notify(db, org_id, "members", "created", [user_id])
+    audit(db, org_id, "members", "created", user_id, {"role": role.value})
     db.commit()
+    invalidate_cached_organizations([org_id, user_id])
     db.refresh(user)
     return user
 
 
+MEMBER_BATCH_ACTIONS = {"add": "created", "remove": "deleted", "role": "updated"}
+
+
+def apply_member_batch(db: Session, org_id: UUID, operations: list[MemberBatchOperation]) -> list[dict]:
+    """Add, remove and change the role of many members with set-based statements and one commit
+
+    One read of the users and memberships involved, one statement per kind of
+    change (one per target role for role changes), and one to deactivate users
+    left without an organization. Adding an existing member or touching a
+    non-member fails on its own and the rest still applies, but a batch that
+    would leave the organization without an admin raises LastAdminError and
+    changes nothing. Returns one result dict per operation.
+    """
+    results: list[dict | None] = [None] * len(operations)
+    user_ids = [operation.user_id for operation in operations]
+
+    def fail(index, operation, status, error):
+        results[index] = {"index": index, "op": operation.op, "status": status, "error": error}
+
+    # Taken before the memberships are read so they cannot change underneath
+    admins = lock_admin_count(db, org_id) if any(operation.op != "add" for operation in operations) else None
+    roles = dict(db.execute(
+        select(UserOrganization.user_id, UserOrganization.role)
+        .where(UserOrganization.organization_id == org_id, UserOrganization.user_id.in_(user_ids))
+    ).all())
+    known_users = set(db.scalars(select(User.id).where(User.id.in_(user_ids))))
+
+    applied = {"add": [], "remove": [], "role": []}
+    admin_change = 0
+    for index, operation in enumerate(operations):
+        was_admin = roles.get(operation.user_id) == UserOrganizationRole.ADMIN
+        if operation.user_id not in known_users:
+            fail(index, operation, 404, "User not found")
+        elif operation.op == "add" and operation.user_id in roles:
+            fail(index, operation, 409, "User is already a member of this organization")
+        elif operation.op != "add" and operation.user_id not in roles:
+            fail(index, operation, 404, "User not found in organization")
+        else:
+            applied[operation.op].append((index, operation))
+            is_admin = operation.op != "remove" and operation.role == UserOrganizationRole.ADMIN
+            admin_change += is_admin - was_admin
+    if admins is not None and admin_change < 0 and admins + admin_change < 1:
+        raise LastAdminError("Cannot remove or demote the last admin of the organization")
+
+    if applied["add"]:
+        db.execute(insert(UserOrganization), [
+            {"user_id": operation.user_id, "organization_id": org_id, "role": operation.role}
+            for _, operation in applied["add"]
+        ])
+        db.execute(
+            update(User).where(User.id.in_([operation.user_id for _, operation in applied["add"]]))
+            .values(is_active=True).execution_options(synchronize_session=False)
+        )
+    for role in UserOrganizationRole:
+        changed = [operation.user_id for _, operation in applied["role"] if operation.role == role]
+        if changed:
+            db.execute(
+                update(UserOrganization)
+                .where(UserOrganization.organization_id == org_id, UserOrganization.user_id.in_(changed))
+                .values(role=role).execution_options(synchronize_session=False)
+            )
+    if applied["remove"]:
+        removed = [operation.user_id for _, operation in applied["remove"]]
+        db.execute(
+            delete(UserOrganization)
+            .where(UserOrganization.organization_id == org_id, UserOrganization.user_id.in_(removed))
+            .execution_options(synchronize_session=False)
+        )
+        # Users left without any organization are deactivated, all in one statement
+        db.execute(
+            update(User)
+            .where(User.id.in_(removed), ~exists().where(UserOrganization.user_id == User.id))
+            .values(is_active=False).execution_options(synchronize_session=False)
+        )
+
+    changed_ids = [operation.user_id for ops in applied.values() for _, operation in ops]
+    users = {
+        user.id: user for user in db.execute(
+            select(User.id, User.username, User.email, User.is_active, User.created_at)
+            .where(User.id.in_(changed_ids))
+        )
+    } if changed_ids else {}
+    for op, ops in applied.items():
+        for index, operation in ops:
+            role = roles[operation.user_id] if op == "remove" else operation.role
+            member = {**users[operation.user_id]._asdict(), "role": role}
+            results[index] = {"index": index, "op": op, "status": 201 if op == "add" else 200, "member": member}
+            changes = {"role": role.value}
+            if op == "role":
+                changes["previous_role"] = roles[operation.user_id].value
+            audit(db, org_id, "members", MEMBER_BATCH_ACTIONS[op], operation.user_id, changes)
+        if ops:
+            notify(db, org_id, "members", MEMBER_BATCH_ACTIONS[op], [operation.user_id for _, operation in ops])
+    db.commit()
+    if changed_ids:
+        invalidate_cached_organizations([org_id, *changed_ids])
+    return results
+
+
 def get_user_role_in_organization(db: Session, user_id: UUID, org_id: UUID) -> UserOrganizationRole | None:
     """Get a user's role in a specific organization"""
     user_org = db.query(UserOrganization).filter(
@@ -230,3 +467,141 @@ def is_user_admin_in_organization(db: Session, user_id: UUID, org_id: UUID) -> b
     """Check if a user is an admin in a specific organization"""
     role = get_user_role_in_organization(db, user_id, org_id)
     return role == UserOrganizationRole.ADMIN
+
+
+def has_trigram_support(db: Session) -> bool:
+    """Whether pg_trgm is installed in the connected database (checked once per database)"""
+    url = str(db.get_bind().engine.url)
+    if url not in _trigram_support:
+        _trigram_support[url] = bool(db.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).scalar())
+    return _trigram_support[url]
+
+
+def search_users(
+    db: Session, org_id: UUID, query: str, limit: int, exclude_members: bool = True
+) -> List[dict]:
+    """Typeahead over usernames for the add-member and invite flows
+
+    Username prefix matches come first, then fuzzy matches by trigram word
+    similarity. Emails are private: a user is found by email only when
+    ``query`` is their full address, and the email of a user outside the
+    organization is returned only to a search that already had it. Each
+    branch reads at most ``limit`` rows off its own index, so the cost does
+    not grow with the number of users.
+    """
+    term = query.strip().lower()
+    # Matches the collation of the prefix indexes, so they also provide the order
+    username = func.lower(User.username).collate("C")
+    email = func.lower(User.email).collate("C")
+    is_member = exists().where(
+        UserOrganization.user_id == User.id,
+        UserOrganization.organization_id == org_id
+    )
+
+    def branch(tier: int, criterion, order_by, score):
+        stmt = select(User.id, literal(tier).label("tier"), score.label("score")).where(criterion)
+        if exclude_members:
+            stmt = stmt.where(~is_member)
+        return stmt.order_by(order_by).limit(limit)
+
+    branches = [
+        branch(0, email == term, email, literal(1.0)),
+        branch(1, username.startswith(term, autoescape=True), username, literal(1.0)),
+    ]
+    if has_trigram_support(db):
+        branches.append(branch(
+            2,
+            literal(term).op("<%")(username),
+            literal(term).op("<<->")(username),
+            func.word_similarity(term, username),
+        ))
+
+    candidates = union_all(*[stmt.subquery().select() for stmt in branches]).subquery()
+    best = (
+        select(
+            candidates.c.id,
+            func.min(candidates.c.tier).label("tier"),
+            func.max(candidates.c.score).label("score"),
+        )
+        .group_by(candidates.c.id)
+        .subquery()
+    )
+    rows = (
+        db.query(User, is_member.label("is_member"))
+        .join(best, best.c.id == User.id)
+        .order_by(best.c.tier, best.c.score.desc(), User.username)
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email if member or user.email.lower() == term else None,
+            "is_active": user.is_active,
+            "is_member": member,
+        }
+        for user, member in rows
+    ]
+
+
+RECONCILE_STATS_SQL = text("""
+    WITH counts AS (
+        SELECT id,
+               (SELECT count(*) FROM todos t WHERE t.organization_id = ids.id AND t.completed IS NOT TRUE) AS open_todos,
+               (SELECT count(*) FROM todos t WHERE t.organization_id = ids.id AND t.completed IS TRUE) AS done_todos,
+               (SELECT count(*) FROM notes n WHERE n.organization_id = ids.id) AS notes,
+               (SELECT count(*) FROM user_organizations m WHERE m.organization_id = ids.id) AS members,
+               (SELECT count(*) FROM user_organizations m
+                WHERE m.organization_id = ids.id AND m.role = 'ADMIN') AS admins
+        FROM unnest(:ids) AS ids(id)
+    )
+    UPDATE organization_stats s
+    SET open_todos = c.open_todos, done_todos = c.done_todos, notes = c.notes,
+        members = c.members, admins = c.admins, updated_at = now()
+    FROM counts c
+    WHERE s.organization_id = c.id
+      AND (s.open_todos, s.done_todos, s.notes, s.members, s.admins)
+          IS DISTINCT FROM (c.open_todos, c.done_todos, c.notes, c.members, c.admins)
+    RETURNING s.organization_id
+""").bindparams(bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True))))
+
+
+def reconcile_organization_stats(db: Session, batch_size: int = 100) -> List[UUID]:
+    """Recount organization_stats from the source tables; returns the ids that had drifted
+
+    Works through organizations in batches, one short transaction each. The
+    batch's counter rows are locked before counting, so writes that commit
+    while it runs are either already counted or apply their change after.
+    """
+    corrected = []
+    after = None
+    while True:
+        query = db.query(Organization.id)
+        if after is not None:
+            query = query.filter(Organization.id > after)
+        ids = [row.id for row in query.order_by(Organization.id).limit(batch_size)]
+        if not ids:
+            return corrected
+        after = ids[-1]
+
+        # Organizations that predate their counter row get one first
+        db.execute(
+            text("""
+                INSERT INTO organization_stats (organization_id)
+                SELECT id FROM organizations WHERE id = ANY(:ids)
+                ON CONFLICT DO NOTHING
+            """).bindparams(bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True)))),
+            {"ids": ids},
+        )
+        db.execute(
+            text("""
+                SELECT organization_id FROM organization_stats
+                WHERE organization_id = ANY(:ids) ORDER BY organization_id FOR UPDATE
+            """).bindparams(bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True)))),
+            {"ids": ids},
+        )
+        corrected.extend(db.execute(RECONCILE_STATS_SQL, {"ids": ids}).scalars())
+        db.commit()
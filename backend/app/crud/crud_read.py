@@ -0,0 +1,297 @@
+"""Read-only list queries that bypass the ORM.
+
+The list endpoints only serialize what they read, so these functions build
+Core ``select()`` statements over the mapped tables and run them on the
+session's connection. Rows come back as plain named tuples (``Row``), with no
+identity map, attribute instrumentation or unit-of-work bookkeeping, and go
+straight to ``deps.rows_response``. Each row holds the requested fields in
+order; the endpoints pass the field names along with the rows.
+"""
+from uuid import UUID
+
+from sqlalchemy import select, true
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.crud.crud_todo import todo_filter_criteria
+from app.crud.pagination import page_query, split_page
+from app.models.audit_event import AuditEvent
+from app.models.note import Note
+from app.models.organization import Organization
+from app.models.organization_stats import OrganizationStats
+from app.models.todo import Todo
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.schemas.audit import AuditEventOut, AuditFilter
+from app.schemas.note import NoteOut
+from app.schemas.organization import MemberFilter, MemberSort, OrganizationMemberOut, OrganizationStatsOut
+from app.schemas.todo import TodoFilter, TodoOut, TodoSort
+
+todos = Todo.__table__
+notes = Note.__table__
+users = User.__table__
+user_organizations = UserOrganization.__table__
+organizations = Organization.__table__
+organization_stats = OrganizationStats.__table__
+audit_events = AuditEvent.__table__
+
+# Fields a list row carries by default, in response model order
+TODO_FIELDS = list(TodoOut.model_fields)
+NOTE_FIELDS = list(NoteOut.model_fields)
+MEMBER_FIELDS = list(OrganizationMemberOut.model_fields)
+STATS_FIELDS = list(OrganizationStatsOut.model_fields)
+AUDIT_FIELDS = list(AuditEventOut.model_fields)
+
+# Sort order -> (column, descending); every entry is backed by an index on todos
+TODO_SORTS = {
+    TodoSort.NEWEST: (todos.c.created_at, True),
+    TodoSort.OLDEST: (todos.c.created_at, False),
+    TodoSort.TITLE: (todos.c.title, False),
+    TodoSort.TITLE_DESC: (todos.c.title, True),
+}
+
+# Sort order -> (column, descending, tiebreaker); backed by ix_user_organizations_org_joined_at_user_id
+# and, for usernames, ix_users_username joined through ix_user_organizations_user_id_org
+MEMBER_SORTS = {
+    MemberSort.JOINED: (user_organizations.c.joined_at, False, user_organizations.c.user_id),
+    MemberSort.JOINED_DESC: (user_organizations.c.joined_at, True, user_organizations.c.user_id),
+    MemberSort.USERNAME: (users.c.username, False, users.c.id),
+    MemberSort.USERNAME_DESC: (users.c.username, True, users.c.id),
+}
+
+
+def _columns(table, fields: list[str], sort_column) -> list:
+    columns = [table.c[name] for name in fields]
+    if sort_column.key not in fields:
+        # The next cursor is built from the sort column, so it rides along last
+        columns.append(sort_column)
+    return columns
+
+
+def todo_page_statement(
+    org_id: UUID,
+    limit: int,
+    cursor: str | None = None,
+    filters: TodoFilter | None = None,
+    sort: TodoSort = TodoSort.NEWEST,
+    fields: list[str] | None = None,
+) -> Select:
+    """The statement ``list_todos`` runs, also used by the plan tests"""
+    sort_column, descending = TODO_SORTS[sort]
+    stmt = select(*_columns(todos, fields or TODO_FIELDS, sort_column)).where(todos.c.organization_id == org_id)
+    if filters is not None:
+        stmt = stmt.where(*todo_filter_criteria(filters, todos.c))
+    return page_query(stmt, todos.c, limit, cursor, sort_column, descending)
+
+
+def list_todos(
+    db: Session,
+    org_id: UUID,
+    limit: int,
+    cursor: str | None = None,
+    filters: TodoFilter | None = None,
+    sort: TodoSort = TodoSort.NEWEST,
+    fields: list[str] | None = None,
+) -> tuple[list[Row], str | None]:
+    """One page of an organization's todos, filtered and sorted, and the next cursor
+
+    Rows hold ``fields`` in order (all TodoOut fields by default).
+    """
+    stmt = todo_page_statement(org_id, limit, cursor, filters, sort, fields)
+    rows = db.connection().execute(stmt).all()
+    return split_page(rows, limit, TODO_SORTS[sort][0])
+
+
+def list_notes(
+    db: Session,
+    org_id: UUID,
+    limit: int,
+    cursor: str | None = None,
+    fields: list[str] | None = None,
+) -> tuple[list[Row], str | None]:
+    """One page of an organization's notes, newest first, and the next cursor
+
+    Rows hold ``fields`` in order (all NoteOut fields by default).
+    """
+    stmt = select(*_columns(notes, fields or NOTE_FIELDS, notes.c.created_at)).where(
+        notes.c.organization_id == org_id
+    )
+    rows = db.connection().execute(page_query(stmt, notes.c, limit, cursor)).all()
+    return split_page(rows, limit, notes.c.created_at)
+
+
+def _member_statement(org_id) -> Select:
+    return (
+        select(
+            users.c.id, users.c.username, users.c.email, user_organizations.c.role,
+            users.c.is_active, users.c.created_at, user_organizations.c.joined_at,
+        )
+        .join(user_organizations, user_organizations.c.user_id == users.c.id)
+        .where(user_organizations.c.organization_id == org_id)
+        .order_by(user_organizations.c.joined_at, users.c.id)
+    )
+
+
+def list_members(db: Session, org_id: UUID, limit: int | None = None) -> list[Row]:
+    """An organization's members in the order they joined (the first ``limit``), in one query
+
+    Rows hold MEMBER_FIELDS in order, followed by ``joined_at``.
+    """
+    return db.connection().execute(_member_statement(org_id).limit(limit)).all()
+
+
+def member_filter_criteria(filters: MemberFilter) -> list:
+    """Translate a MemberFilter into SQL criteria on user_organizations joined to users"""
+    criteria = []
+    if filters.role is not None:
+        criteria.append(user_organizations.c.role == filters.role)
+    if filters.is_active is not None:
+        criteria.append(users.c.is_active == filters.is_active)
+    if filters.joined_after is not None:
+        criteria.append(user_organizations.c.joined_at >= filters.joined_after)
+    if filters.joined_before is not None:
+        criteria.append(user_organizations.c.joined_at < filters.joined_before)
+    return criteria
+
+
+def member_page_statement(
+    org_id: UUID,
+    limit: int,
+    cursor: str | None = None,
+    filters: MemberFilter | None = None,
+    sort: MemberSort = MemberSort.JOINED,
+) -> Select:
+    """The statement ``list_member_page`` runs, also used by the plan tests"""
+    sort_column, descending, id_column = MEMBER_SORTS[sort]
+    columns = [
+        user_organizations.c.user_id.label("id"), users.c.username, users.c.email, user_organizations.c.role,
+        users.c.is_active, users.c.created_at,
+    ]
+    if sort_column.key == "joined_at":
+        columns.append(sort_column)
+    stmt = (
+        select(*columns)
+        .join(user_organizations, user_organizations.c.user_id == users.c.id)
+        .where(user_organizations.c.organization_id == org_id)
+    )
+    if filters is not None:
+        stmt = stmt.where(*member_filter_criteria(filters))
+    return page_query(stmt, users.c, limit, cursor, sort_column, descending, id_column)
+
+
+def list_member_page(
+    db: Session,
+    org_id: UUID,
+    limit: int,
+    cursor: str | None = None,
+    filters: MemberFilter | None = None,
+    sort: MemberSort = MemberSort.JOINED,
+) -> tuple[list[Row], str | None]:
+    """One page of an organization's members, filtered and sorted, and the next cursor
+
+    Rows hold MEMBER_FIELDS in order (plus ``joined_at`` when sorted on it).
+    """
+    rows = db.connection().execute(member_page_statement(org_id, limit, cursor, filters, sort)).all()
+    return split_page(rows, limit, MEMBER_SORTS[sort][0])
+
+
+def count_members(db: Session, org_id: UUID, filters: MemberFilter | None = None) -> int | None:
+    """How many members match ``filters``, from the organization's counters
+
+    Only answers for no filter or a role filter, the counts the counter row
+    keeps; None otherwise, and for an organization without one.
+    """
+    filters = filters or MemberFilter()
+    if filters.model_dump(exclude={"role"}, exclude_none=True):
+        return None
+    stats = db.connection().execute(
+        select(organization_stats.c.members, organization_stats.c.admins)
+        .where(organization_stats.c.organization_id == org_id)
+    ).first()
+    if stats is None:
+        return None
+    if filters.role is None:
+        return stats.members
+    return stats.admins if filters.role == UserOrganizationRole.ADMIN else stats.members - stats.admins
+
+
+def list_members_of(db: Session, org_ids: list[UUID], limit: int) -> list[Row]:
+    """The first ``limit`` members to join each of ``org_ids``, in one query
+
+    Rows hold ``organization_id``, then MEMBER_FIELDS in order and ``joined_at``.
+    """
+    orgs = select(organizations.c.id).where(organizations.c.id.in_(org_ids)).subquery("orgs")
+    members = _member_statement(orgs.c.id).limit(limit).lateral("members")
+    stmt = (
+        select(orgs.c.id.label("organization_id"), members)
+        .select_from(orgs)
+        .join(members, true())
+        .order_by(orgs.c.id, members.c.joined_at, members.c.id)
+    )
+    return db.connection().execute(stmt).all()
+
+
+def list_user_organizations(db: Session, user_id: UUID) -> list[Row]:
+    """The user's organizations in the order they joined them, in one query
+
+    Rows hold ``id``, ``name``, ``created_at``, the user's role as
+    ``user_role`` and STATS_FIELDS (NULL for an organization without a
+    counter row).
+    """
+    stmt = (
+        select(
+            organizations.c.id, organizations.c.name, organizations.c.created_at,
+            user_organizations.c.role.label("user_role"),
+            *[organization_stats.c[name] for name in STATS_FIELDS],
+        )
+        .join(user_organizations, user_organizations.c.organization_id == organizations.c.id)
+        .outerjoin(organization_stats, organization_stats.c.organization_id == organizations.c.id)
+        .where(user_organizations.c.user_id == user_id)
+        .order_by(user_organizations.c.joined_at, organizations.c.id)
+    )
+    return db.connection().execute(stmt).all()
+
+
+def audit_page_statement(
+    org_id: UUID,
+    limit: int,
+    cursor: str | None = None,
+    filters: AuditFilter | None = None,
+) -> Select:
+    """The statement ``list_audit_events`` runs, newest first
+
+    Backed by ix_audit_events_org_occurred_at_id, or the resource_id and
+    actor_id indexes when filtering on those.
+    """
+    stmt = select(*[audit_events.c[name] for name in AUDIT_FIELDS]).where(audit_events.c.organization_id == org_id)
+    filters = filters or AuditFilter()
+    if filters.resource is not None:
+        stmt = stmt.where(audit_events.c.resource == filters.resource.value)
+    if filters.action is not None:
+        stmt = stmt.where(audit_events.c.action == filters.action.value)
+    if filters.actor_id is not None:
+        stmt = stmt.where(audit_events.c.actor_id == filters.actor_id)
+    if filters.resource_id is not None:
+        stmt = stmt.where(audit_events.c.resource_id == filters.resource_id)
+    if filters.occurred_after is not None:
+        stmt = stmt.where(audit_events.c.occurred_at >= filters.occurred_after)
+    if filters.occurred_before is not None:
+        stmt = stmt.where(audit_events.c.occurred_at < filters.occurred_before)
+    return page_query(stmt, audit_events.c, limit, cursor, audit_events.c.occurred_at)
+
+
+def list_audit_events(
+    db: Session,
+    org_id: UUID,
+    limit: int,
+    cursor: str | None = None,
+    filters: AuditFilter | None = None,
+) -> tuple[list[Row], str | None]:
+    """One page of an organization's audit log, newest first, and the next cursor
+
+    Rows hold AUDIT_FIELDS in order. Events still in a process's buffer
+    (see ``app.core.audit``) are not in the log yet.
+    """
+    rows = db.connection().execute(audit_page_statement(org_id, limit, cursor, filters)).all()
+    return split_page(rows, limit, audit_events.c.occurred_at)
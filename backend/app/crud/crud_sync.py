@@ -0,0 +1,140 @@
+"""Delta sync: an organization's todo and note changes since a cursor.
+
+Postgres stamps every todo and note with the id of the transaction that last
+inserted or updated it (``sync_txid``), and deleting one leaves a row in
+``sync_tombstones`` stamped the same way. A client's cursor is a position
+``(sync_txid, id)`` in that order; a sync reads the changes after it through
+the ``(organization_id, sync_txid, id)`` indexes, so its cost follows the
+number of changes rather than the size of the organization.
+
+Transaction ids are assigned when a transaction starts writing, not when it
+commits, so a sync only returns changes from transactions older than the
+oldest one still running (the snapshot's ``xmin``); all of those have
+finished. A long transaction delays changes written after it started, but
+never hides them from a client that has already moved past.
+"""
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import literal, literal_column, select, text, tuple_, union_all
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.crud.crud_read import NOTE_FIELDS, TODO_FIELDS, notes, todos
+from app.crud.pagination import InvalidCursor, decode_cursor, encode_cursor, split_page
+from app.models.organization_stats import OrganizationStats
+from app.models.sync_tombstone import SyncTombstone
+
+tombstones = SyncTombstone.__table__
+organization_stats = OrganizationStats.__table__
+
+NIL_UUID = UUID(int=0)
+# Cursors hold a (sync_txid, id) position
+SYNC_POSITION = todos.c.sync_txid
+# Every transaction older than this one has committed or rolled back
+SNAPSHOT_XMIN = literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+# Tombstones are dropped in one statement per run, and every organization that
+# lost some moves its horizon up to the newest one removed
+COMPACT_TOMBSTONES_SQL = text("""
+    WITH removed AS (
+        DELETE FROM sync_tombstones WHERE deleted_at < :older_than
+        RETURNING organization_id, sync_txid
+    )
+    UPDATE organization_stats s SET sync_horizon = greatest(s.sync_horizon, r.horizon)
+    FROM (SELECT organization_id, max(sync_txid) AS horizon FROM removed GROUP BY organization_id) r
+    WHERE s.organization_id = r.organization_id
+    RETURNING s.organization_id
+""")
+
+
+class ExpiredCursor(ValueError):
+    """Raised when the tombstones a cursor still needs have been compacted away"""
+
+
+def _change_statement(org_id: UUID, after: tuple[int, UUID], until: int):
+    """Changed and deleted ids after position ``after``, up to transaction ``until``"""
+    def changes(table, id_column, resource, deleted):
+        position = tuple_(table.c.sync_txid, id_column)
+        return select(
+            table.c.sync_txid, id_column.label("id"), resource.label("resource"), literal(deleted).label("deleted")
+        ).where(table.c.organization_id == org_id, position > after, table.c.sync_txid < until)
+
+    return union_all(
+        changes(todos, todos.c.id, literal("todos"), False),
+        changes(notes, notes.c.id, literal("notes"), False),
+        changes(tombstones, tombstones.c.row_id, tombstones.c.resource, True),
+    ).subquery("changes")
+
+
+def _rows(db: Session, table, fields: list[str], ids: list[UUID]) -> list[Row]:
+    if not ids:
+        return []
+    stmt = select(*[table.c[name] for name in fields]).where(table.c.id.in_(ids))
+    return db.connection().execute(stmt).all()
+
+
+def get_changes(
+    db: Session,
+    org_id: UUID,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[dict[str, list], str, bool]:
+    """Changes to an organization's todos and notes after ``cursor``
+
+    Returns the changes, the cursor to pass next time and whether more changes
+    are already waiting. Changes are keyed ``todos`` and ``notes`` (rows
+    holding TODO_FIELDS / NOTE_FIELDS, as they are now) and ``deleted_todos``
+    and ``deleted_notes`` (ids). Without a cursor the sync starts from the
+    beginning, which returns every todo and note. Raises ``InvalidCursor`` for
+    a cursor we did not issue and ``ExpiredCursor`` for one older than the
+    organization's compacted tombstones.
+    """
+    after = (0, NIL_UUID)
+    if cursor:
+        after = decode_cursor(cursor, SYNC_POSITION)
+        if not isinstance(after[0], int):
+            raise InvalidCursor("Invalid cursor")
+
+    until, horizon = db.connection().execute(
+        select(
+            SNAPSHOT_XMIN,
+            select(organization_stats.c.sync_horizon)
+            .where(organization_stats.c.organization_id == org_id).scalar_subquery(),
+        )
+    ).one()
+    if cursor and after[0] <= (horizon or 0):
+        raise ExpiredCursor("Cursor has expired; sync again from the beginning")
+
+    changes = _change_statement(org_id, after, until)
+    rows = db.connection().execute(
+        select(changes).order_by(changes.c.sync_txid, changes.c.id).limit(limit + 1)
+    ).all()
+    rows, next_cursor = split_page(rows, limit, SYNC_POSITION)
+    has_more = next_cursor is not None
+    if not has_more:
+        # Caught up: everything before ``until`` has been seen
+        next_cursor = encode_cursor(SYNC_POSITION.key, until, NIL_UUID) if after[0] < until else cursor
+
+    changed = {"todos": [], "notes": []}
+    deleted = {"todos": [], "notes": []}
+    for row in rows:
+        (deleted if row.deleted else changed)[row.resource].append(row.id)
+    result = {
+        "todos": _rows(db, todos, TODO_FIELDS, changed["todos"]),
+        "notes": _rows(db, notes, NOTE_FIELDS, changed["notes"]),
+        "deleted_todos": deleted["todos"],
+        "deleted_notes": deleted["notes"],
+    }
+    return result, next_cursor, has_more
+
+
+def compact_tombstones(db: Session, older_than: datetime) -> list[UUID]:
+    """Drop tombstones deleted before ``older_than``; returns the organizations affected
+
+    Their ``sync_horizon`` moves up, so cursors that could have needed the
+    dropped tombstones get ``ExpiredCursor`` instead of missing deletions.
+    """
+    affected = list(db.execute(COMPACT_TOMBSTONES_SQL, {"older_than": older_than}).scalars())
+    db.commit()
+    return affected
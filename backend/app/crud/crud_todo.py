@@ -1,6 +1,10 @@
+from collections import defaultdict
+from sqlalchemy import bindparam, delete, insert, select, update
 from sqlalchemy.orm import Session
+from app.core.audit import audit
+from app.core.events import notify
 from app.models.todo import Todo
-from app.schemas.todo import TodoCreate, TodoUpdate
+from app.schemas.todo import TodoCreate, TodoUpdate, TodoFilter, TodoBatchOperation, TodoBulkUpdate
 from uuid import UUID
 
 
@@ -12,20 +16,43 @@ def create_todo(db: Session, todo_in: TodoCreate, user_id: UUID, org_id: UUID) -
         organization_id=org_id,
     )
     db.add(todo)
+    db.flush()
+    notify(db, org_id, "todos", "created", [todo.id])
+    audit(db, org_id, "todos", "created", todo.id, todo_in.model_dump(mode="json"))
     db.commit()
     db.refresh(todo)
     return todo
 
 
-def get_todos(db: Session, org_id: UUID) -> list[Todo]:
-    """Get all todos for an organization"""
-    return db.query(Todo).filter(Todo.organization_id == org_id).all()
+def todo_filter_criteria(filters: TodoFilter, columns=Todo) -> list:
+    """Translate a TodoFilter into SQL criteria on the todos table
+
+    ``columns`` is the Todo entity, or ``todos.c`` for Core statements.
+    """
+    criteria = []
+    if filters.completed is not None:
+        criteria.append(columns.completed == filters.completed)
+    if filters.created_by is not None:
+        criteria.append(columns.created_by == filters.created_by)
+    if filters.created_after is not None:
+        criteria.append(columns.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        criteria.append(columns.created_at < filters.created_before)
+    if filters.updated_after is not None:
+        criteria.append(columns.updated_at >= filters.updated_after)
+    if filters.updated_before is not None:
+        criteria.append(columns.updated_at < filters.updated_before)
+    if filters.title_prefix:
+        criteria.append(columns.title.startswith(filters.title_prefix, autoescape=True))
+    return criteria
 
 
 def update_todo(db: Session, todo: Todo, todo_in: TodoUpdate) -> Todo:
     """Update a todo"""
     for field, value in todo_in.model_dump(exclude_unset=True).items():
         setattr(todo, field, value)
+    notify(db, todo.organization_id, "todos", "updated", [todo.id])
+    audit(db, todo.organization_id, "todos", "updated", todo.id, todo_in.model_dump(mode="json", exclude_unset=True))
     db.commit()
     db.refresh(todo)
     return todo
@@ -34,13 +61,177 @@ def update_todo(db: Session, todo: Todo, todo_in: TodoUpdate) -> Todo:
 def delete_todo(db: Session, todo: Todo) -> Todo:
     """Delete a todo"""
     db.delete(todo)
+    notify(db, todo.organization_id, "todos", "deleted", [todo.id])
+    audit(db, todo.organization_id, "todos", "deleted", todo.id, {"title": todo.title})
     db.commit()
     return todo
 
 
+def update_todos_where(db: Session, org_id: UUID, filters: TodoFilter, values: TodoBulkUpdate) -> int:
+    """Set values on every matching todo in one UPDATE; returns how many changed"""
+    changes = values.model_dump()
+    affected = db.query(Todo).filter(
+        Todo.organization_id == org_id,
+        *todo_filter_criteria(filters),
+        # Rows that already hold the values are left alone (and keep updated_at)
+        *[getattr(Todo, field).is_distinct_from(value) for field, value in changes.items()],
+    ).update(changes, synchronize_session=False)
+    if affected:
+        notify(db, org_id, "todos", "updated")
+        audit(db, org_id, "todos", "updated", changes={
+            "filter": filters.model_dump(mode="json", exclude_none=True),
+            "values": values.model_dump(mode="json"),
+            "count": affected,
+        })
+    db.commit()
+    return affected
+
+
+def delete_todos_where(
+    db: Session, org_id: UUID, filters: TodoFilter, created_by: UUID | None = None
+) -> int:
+    """Delete every matching todo in one DELETE; returns how many were removed"""
+    criteria = [Todo.organization_id == org_id, *todo_filter_criteria(filters)]
+    if created_by is not None:
+        criteria.append(Todo.created_by == created_by)
+    affected = db.query(Todo).filter(*criteria).delete(synchronize_session=False)
+    if affected:
+        notify(db, org_id, "todos", "deleted")
+        audit(db, org_id, "todos", "deleted", changes={
+            "filter": filters.model_dump(mode="json", exclude_none=True),
+            "count": affected,
+        })
+    db.commit()
+    return affected
+
+
 def get_todo_by_id(db: Session, todo_id: UUID, org_id: UUID) -> Todo | None:
     """Get a todo by ID within an organization"""
     return db.query(Todo).filter(
         Todo.id == todo_id, 
         Todo.organization_id == org_id
     ).first()
+
+
+def apply_todo_batch(
+    db: Session,
+    org_id: UUID,
+    user_id: UUID,
+    is_admin: bool,
+    operations: list[TodoBatchOperation],
+) -> list[dict]:
+    """Apply many create/update/delete operations with one statement per kind and one commit
+
+    Members may update any todo in the organization; they may delete their own,
+    admins any. An operation on a missing or forbidden todo, or one that would
+    clear a todo's title, fails on its own and the rest of the batch still
+    applies. Returns one result dict per operation.
+    """
+    results: list[dict | None] = [None] * len(operations)
+    creates, updates, deletes = [], [], []
+    for index, operation in enumerate(operations):
+        {"create": creates, "update": updates, "delete": deletes}[operation.op].append((index, operation))
+
+    # One lookup for every todo the batch touches
+    referenced = [operation.id for _, operation in updates + deletes]
+    owners = dict(db.execute(
+        select(Todo.id, Todo.created_by).where(Todo.organization_id == org_id, Todo.id.in_(referenced))
+    ).all()) if referenced else {}
+
+    def fail(index, operation, status, error):
+        results[index] = {"index": index, "op": operation.op, "status": status, "error": error}
+
+    if creates:
+        # A single multi-row INSERT ... RETURNING, rows in parameter order
+        created = db.scalars(
+            insert(Todo).returning(Todo, sort_by_parameter_order=True),
+            [
+                {**operation.todo.model_dump(), "created_by": user_id, "organization_id": org_id}
+                for _, operation in creates
+            ],
+        ).all()
+        for (index, operation), todo in zip(creates, created):
+            results[index] = {"index": index, "op": operation.op, "status": 201, "todo": todo}
+
+    applied_updates = []
+    for index, operation in updates:
+        if operation.id not in owners:
+            fail(index, operation, 404, "Todo not found")
+        elif "title" in operation.changes.model_fields_set and operation.changes.title is None:
+            fail(index, operation, 422, "Title cannot be null")
+        else:
+            applied_updates.append((index, operation))
+    # Rows setting the same columns share one executemany. Core rather than the
+    # ORM's bulk UPDATE by primary key, which raises for a todo deleted since
+    # the lookup; such todos are left out of the re-read below instead
+    by_columns = defaultdict(list)
+    for _, operation in applied_updates:
+        values = operation.changes.model_dump(exclude_unset=True)
+        if values:
+            by_columns[tuple(sorted(values))].append({"todo_id": operation.id, **values})
+    for columns, rows in by_columns.items():
+        db.execute(
+            update(Todo.__table__)
+            .where(Todo.__table__.c.id == bindparam("todo_id"))
+            .values({column: bindparam(column) for column in columns}),
+            rows,
+        )
+
+    applied_deletes = []
+    for index, operation in deletes:
+        if operation.id not in owners:
+            fail(index, operation, 404, "Todo not found")
+        elif not is_admin and owners[operation.id] != user_id:
+            fail(index, operation, 403, "You can only delete your own todos")
+        else:
+            applied_deletes.append((index, operation))
+    deleted = {}
+    if applied_deletes:
+        deleted = {
+            todo.id: todo for todo in db.scalars(
+                delete(Todo)
+                .where(Todo.id.in_([operation.id for _, operation in applied_deletes]))
+                .returning(Todo),
+                execution_options={"synchronize_session": False},
+            )
+        }
+    # A todo deleted by another request since the lookup is simply not found
+    for index, operation in applied_deletes:
+        if operation.id in deleted:
+            results[index] = {"index": index, "op": operation.op, "status": 200, "todo": deleted[operation.id]}
+        else:
+            fail(index, operation, 404, "Todo not found")
+    applied_deletes = [(index, operation) for index, operation in applied_deletes if operation.id in deleted]
+
+    if applied_updates:
+        updated = {
+            todo.id: todo for todo in db.scalars(
+                select(Todo)
+                .where(Todo.id.in_([operation.id for _, operation in applied_updates]))
+                .execution_options(populate_existing=True)
+            )
+        }
+        for index, operation in applied_updates:
+            if operation.id in updated:
+                results[index] = {"index": index, "op": operation.op, "status": 200, "todo": updated[operation.id]}
+            else:
+                fail(index, operation, 404, "Todo not found")
+        applied_updates = [(index, operation) for index, operation in applied_updates if operation.id in updated]
+
+    # Detach the returned todos so the commit neither expires them (one reload
+    # each) nor leaves deleted rows behind in the session
+    for result in results:
+        if result.get("todo") is not None:
+            db.expunge(result["todo"])
+    for action, applied in [("created", creates), ("updated", applied_updates), ("deleted", applied_deletes)]:
+        if applied:
+            ids = [results[index]["todo"].id for index, _ in applied]
+            notify(db, org_id, "todos", action, ids)
+    for index, operation in creates:
+        audit(db, org_id, "todos", "created", results[index]["todo"].id, operation.todo.model_dump(mode="json"))
+    for index, operation in applied_updates:
+        audit(db, org_id, "todos", "updated", operation.id, operation.changes.model_dump(mode="json", exclude_unset=True))
+    for index, operation in applied_deletes:
+        audit(db, org_id, "todos", "deleted", operation.id, {"title": results[index]["todo"].title})
+    db.commit()
+    return results
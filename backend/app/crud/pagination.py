@@ -0,0 +1,82 @@
+"""Keyset (cursor) pagination shared by the list endpoints.
+
+Pages are ordered on ``(sort column, id)`` (newest ``created_at`` first unless
+the caller picks another sort) and the cursor is an opaque, URL-safe token
+holding the sort key and the position of the last row returned. The next page
+is an index range scan instead of an OFFSET.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import DateTime, tuple_
+from sqlalchemy.orm import Query
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue for this sort"""
+
+
+def encode_cursor(key: str, value: Any, row_id: UUID) -> str:
+    """Encode a row position under sort ``key`` as an opaque cursor"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([key, value, str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column: Any) -> tuple[Any, UUID]:
+    """Decode a cursor produced by ``encode_cursor`` for ``sort_column``"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if key != sort_column.key:
+            raise ValueError("cursor was issued for a different sort")
+        if isinstance(sort_column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        return value, UUID(row_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def page_query(
+    query: Query,
+    model: Any,
+    limit: int,
+    cursor: str | None = None,
+    sort_column: Any = None,
+    descending: bool = True,
+    id_column: Any = None,
+) -> Query:
+    """Restrict ``query`` to the page after ``cursor``; fetches one extra row
+
+    ``query`` may be an ORM Query or a Core select; ``model`` is then the
+    table's column collection (``table.c``). Ties on the sort column are
+    broken on ``id_column``, ``model.id`` by default; the rows' ``id`` must
+    hold its value.
+    """
+    sort_column = sort_column if sort_column is not None else model.created_at
+    id_column = id_column if id_column is not None else model.id
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort_column)
+        position = tuple_(sort_column, id_column)
+        query = query.filter(position < (value, row_id) if descending else position > (value, row_id))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    return query.limit(limit + 1)
+
+
+def split_page(rows: list, limit: int, sort_column: Any) -> tuple[list, str | None]:
+    """Drop the extra row ``page_query`` fetched and build the next cursor from the last row kept"""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort_column.key, getattr(last, sort_column.key), last.id)
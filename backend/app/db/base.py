@@ -2,5 +2,10 @@ from app.db.session import Base
 from app.models.user import User
 from app.models.user_organization import UserOrganization, UserOrganizationRole
 from app.models.organization import Organization
+from app.models.organization_stats import OrganizationStats
 from app.models.note import Note
 from app.models.todo import Todo
+from app.models.sync_tombstone import SyncTombstone
+from app.models.organization_deletion import OrganizationDeletion
+from app.models.job import Job
+from app.models.audit_event import AuditEvent
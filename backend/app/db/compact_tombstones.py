@@ -0,0 +1,28 @@
+"""Forget deletions older than SYNC_TOMBSTONE_RETENTION_DAYS.
+
+Delta sync reports deletions from the tombstones todos and notes leave behind;
+this drops the old ones so they do not pile up. Clients whose cursor is older
+than a dropped tombstone get 410 from the sync endpoint and start over. Run it
+periodically (cron):
+
+    python -m app.db.compact_tombstones
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.crud.crud_sync import compact_tombstones
+from app.db.session import SessionLocal
+
+
+def main() -> None:
+    older_than = datetime.now(timezone.utc) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    db = SessionLocal()
+    try:
+        affected = compact_tombstones(db, older_than)
+    finally:
+        db.close()
+    print(f"Compacted tombstones older than {older_than:%Y-%m-%d %H:%M} for {len(affected)} organization(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Create or upgrade the database schema.
+
+An empty database is built in one step from the squashed baseline in
+``alembic/baseline`` and stamped at the revision it stands in for, instead of
+replaying every file in ``alembic/versions``. Databases that already carry an
+``alembic_version`` table are upgraded as usual.
+
+    python -m app.db.init_db
+"""
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+
+from alembic import command
+from alembic.config import Config
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+ALEMBIC_INI = BACKEND_DIR / "alembic.ini"
+BASELINE_PATH = BACKEND_DIR / "alembic" / "baseline" / "baseline.py"
+
+
+def get_alembic_config(connection: Connection | None = None) -> Config:
+    """Alembic config that works from any cwd, optionally bound to a connection"""
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def load_baseline() -> ModuleType:
+    """Import the baseline revision file the same way Alembic loads versions"""
+    spec = importlib.util.spec_from_file_location("alembic_baseline", BASELINE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def is_fresh_database(connection: Connection) -> bool:
+    """True if the database has no tables at all (not even alembic_version)"""
+    return not inspect(connection).get_table_names()
+
+
+def apply_baseline(connection: Connection) -> str:
+    """Create the baseline schema and stamp it; returns the stamped revision"""
+    baseline = load_baseline()
+    context = MigrationContext.configure(connection)
+    with Operations.context(context):
+        baseline.upgrade()
+    script = ScriptDirectory.from_config(get_alembic_config())
+    context.stamp(script, baseline.revision)
+    return baseline.revision
+
+
+def init_db(connection: Connection) -> None:
+    """Bring the database behind ``connection`` to the latest revision"""
+    if is_fresh_database(connection):
+        apply_baseline(connection)
+    command.upgrade(get_alembic_config(connection), "head")
+
+
+if __name__ == "__main__":
+    from app.db.session import engine
+
+    with engine.begin() as connection:
+        init_db(connection)
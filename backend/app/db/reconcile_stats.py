@@ -0,0 +1,25 @@
+"""Repair drift in organization_stats by recounting from the source tables.
+
+The triggers keep the counters exact for every write that goes through
+Postgres, so this should normally find nothing; run it periodically (cron,
+or after restoring data with triggers disabled):
+
+    python -m app.db.reconcile_stats
+"""
+from app.crud.crud_organization import reconcile_organization_stats
+from app.db.session import SessionLocal
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        corrected = reconcile_organization_stats(db)
+    finally:
+        db.close()
+    print(f"Corrected counters for {len(corrected)} organization(s)")
+    for org_id in corrected:
+        print(f"  {org_id}")
+
+
+if __name__ == "__main__":
+    main()
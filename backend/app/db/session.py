@@ -4,7 +4,9 @@ from app.core.config import settings
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(DATABASE_URL, future=True)
+# values_plus_batch: executemany UPDATEs and DELETEs (e.g. batch todo updates)
+# go out as psycopg2 execute_batch pages instead of one round trip per row
+engine = create_engine(DATABASE_URL, future=True, executemany_mode="values_plus_batch")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
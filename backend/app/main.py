@@ -1,11 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.endpoints import auth
 from app.api.endpoints import notes
 from app.api.endpoints import todos
 from app.api.endpoints import organizations
+from app.api.endpoints import sync
+from app.api.endpoints import events
+from app.api.endpoints import jobs
+from app.core.audit import stop_audit_logs
+from app.core.events import get_event_broker
+from app.crud.crud_organization import invalidate_on_event
 
-app = FastAPI(title="Full Stack App API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Other workers' membership and name changes invalidate our cached responses
+    broker = get_event_broker()
+    broker.add_listener(invalidate_on_event)
+    broker.start(timeout=None)
+    yield
+    broker.stop()
+    # Write out the audit events still buffered
+    stop_audit_logs()
+
+app = FastAPI(title="Full Stack App API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,12 +31,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Next-Offset", "X-Total-Count", "Content-Disposition", "ETag", "X-Job-Id"],
 )
 
 app.include_router(auth.router)
 app.include_router(notes.router, prefix="/notes", tags=["notes"])
 app.include_router(todos.router, prefix="/todos", tags=["todos"])
 app.include_router(organizations.router, prefix="/organizations", tags=["organizations"])
+app.include_router(sync.router, prefix="/sync", tags=["sync"])
+app.include_router(events.router, prefix="/events", tags=["events"])
+app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 
 @app.get("/")
 def read_root():
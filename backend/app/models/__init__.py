@@ -1,5 +1,10 @@
 from .user_organization import user_organization_association
 from .user import User
 from .organization import Organization
+from .organization_stats import OrganizationStats
 from .note import Note
 from .todo import Todo
+from .sync_tombstone import SyncTombstone
+from .organization_deletion import OrganizationDeletion
+from .job import Job
+from .audit_event import AuditEvent
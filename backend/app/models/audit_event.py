@@ -0,0 +1,33 @@
+import uuid
+from sqlalchemy import Column, DateTime, Index, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.db.session import Base
+
+
+class AuditEvent(Base):
+    """One committed change: who did what to which row of an organization
+
+    Written in batches by ``app.core.audit``. ``occurred_at`` is when the
+    change was made, not when the row was written. Neither the organization
+    nor the actor is a foreign key, so the log outlives both.
+    """
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        # An organization's log, newest first
+        Index("ix_audit_events_org_occurred_at_id", "organization_id", "occurred_at", "id"),
+        # One row's history, and one user's changes
+        Index("ix_audit_events_org_resource_id_occurred_at_id", "organization_id", "resource_id", "occurred_at", "id"),
+        Index("ix_audit_events_org_actor_id_occurred_at_id", "organization_id", "actor_id", "occurred_at", "id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(UUID(as_uuid=True), nullable=False)
+    actor_id = Column(UUID(as_uuid=True))
+    # As for change events: todos, notes, members or organization
+    resource = Column(String, nullable=False)
+    # created, updated or deleted
+    action = Column(String, nullable=False)
+    resource_id = Column(UUID(as_uuid=True))
+    changes = Column(JSONB(none_as_null=True))
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,52 @@
+import enum
+import uuid
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, SmallInteger, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.db.session import Base
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class Job(Base):
+    """A unit of background work, run by ``python -m app.worker``
+
+    ``kind`` names the handler in ``app.worker.HANDLERS`` and ``payload`` is
+    its argument. A job is ready once ``run_at`` has passed: for a QUEUED job
+    that is when it was enqueued or when its next retry is due; for a RUNNING
+    one it is the end of the claiming worker's visibility timeout, after which
+    another worker may take it over. See ``crud_job``.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claiming: the most urgent ready job; finished jobs are not indexed
+        Index(
+            "ix_jobs_ready", text("priority DESC"), "run_at",
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    # Higher runs first
+    priority = Column(SmallInteger, nullable=False, server_default=text("0"))
+    attempts = Column(Integer, nullable=False, server_default=text("0"))
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_by = Column(String)
+    last_error = Column(Text)
+    result = Column(JSONB)
+    # Who may read the job's status: its creator and the organization's admins.
+    # Not a foreign key: a job may outlive (or delete) its organization
+    organization_id = Column(UUID(as_uuid=True))
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
@@ -1,12 +1,20 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, Computed, FetchedValue, Index, String, ForeignKey, DateTime, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 import uuid
 from app.db.session import Base
 
 
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (
+        # Keyset pagination of an organization's notes, newest first
+        Index("ix_notes_org_created_at_id", "organization_id", "created_at", "id"),
+        # Full-text search over title and content
+        Index("ix_notes_search_vector", "search_vector", postgresql_using="gin"),
+        # Delta sync: an organization's changes in write order
+        Index("ix_notes_org_sync_txid_id", "organization_id", "sync_txid", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
@@ -18,5 +26,23 @@ class Note(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Maintained by Postgres; title matches weigh more than content matches.
+    # Deferred so plain note loads don't drag the vector along.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(content, '')), 'B')",
+            persisted=True,
+        ),
+    ))
+
+    # Id of the transaction that last wrote the row, set by Postgres (column
+    # default and the sync_touch trigger); see crud_sync
+    sync_txid = deferred(Column(
+        BigInteger, nullable=False,
+        server_default=text("pg_current_xact_id()::text::bigint"), server_onupdate=FetchedValue(),
+    ))
+
     org = relationship("Organization", back_populates="notes")
     user = relationship("User", back_populates="notes")
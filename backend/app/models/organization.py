@@ -33,6 +33,14 @@ class Organization(Base):
     
     notes = relationship("Note", back_populates="org")
     todos = relationship("Todo", back_populates="organization")
+
+    # Counters maintained by triggers; loaded with the organization itself
+    stats = relationship(
+        "OrganizationStats",
+        uselist=False,
+        lazy="joined",
+        viewonly=True,
+    )
     
     def get_user_role(self, user_id):
         """Get a user's role in this organization"""
@@ -0,0 +1,43 @@
+import enum
+import uuid
+from sqlalchemy import Column, BigInteger, DateTime, Enum, ForeignKey, String, Text, func, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.session import Base
+
+
+class DeletionStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class OrganizationDeletion(Base):
+    """A requested organization deletion and how far it has got
+
+    ``crud_deletion.run_organization_deletion`` removes the organization's
+    memberships, todos and notes in batches, one short transaction each,
+    counting them here as it goes, and deletes the organization last. The row
+    outlives the organization so its requester can still read the outcome;
+    ``organization_id`` is therefore not a foreign key.
+    """
+    __tablename__ = "organization_deletions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(UUID(as_uuid=True), nullable=False, unique=True)
+    organization_name = Column(String, nullable=False)
+    requested_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    status = Column(Enum(DeletionStatus), nullable=False, default=DeletionStatus.PENDING)
+    # Totals from the organization's counters when the deletion was requested
+    members_total = Column(BigInteger, nullable=False, server_default=text("0"))
+    todos_total = Column(BigInteger, nullable=False, server_default=text("0"))
+    notes_total = Column(BigInteger, nullable=False, server_default=text("0"))
+    members_deleted = Column(BigInteger, nullable=False, server_default=text("0"))
+    todos_deleted = Column(BigInteger, nullable=False, server_default=text("0"))
+    notes_deleted = Column(BigInteger, nullable=False, server_default=text("0"))
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Bumped by every batch; a RUNNING deletion that stops moving is picked up again
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, BigInteger, DateTime, ForeignKey, func, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.session import Base
+
+
+class OrganizationStats(Base):
+    """Per-organization counters, kept current by database triggers
+
+    Statement-level triggers on todos, notes and user_organizations apply
+    each write's net change in the same transaction, and a row is created
+    with every organization. ``reconcile_organization_stats`` in
+    ``crud_organization`` recounts from the source tables to repair drift.
+    ``data_version`` goes up with every statement that writes the
+    organization's todos or notes; list ETags are derived from it.
+    ``sync_horizon`` is the newest transaction whose tombstones have been
+    compacted away; older sync cursors can no longer be served.
+    """
+    __tablename__ = "organization_stats"
+
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True
+    )
+    open_todos = Column(BigInteger, nullable=False, server_default=text("0"))
+    done_todos = Column(BigInteger, nullable=False, server_default=text("0"))
+    notes = Column(BigInteger, nullable=False, server_default=text("0"))
+    members = Column(BigInteger, nullable=False, server_default=text("0"))
+    admins = Column(BigInteger, nullable=False, server_default=text("0"))
+    data_version = Column(BigInteger, nullable=False, server_default=text("0"))
+    sync_horizon = Column(BigInteger, nullable=False, server_default=text("0"))
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
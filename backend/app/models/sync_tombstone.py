@@ -0,0 +1,29 @@
+from sqlalchemy import Column, BigInteger, DateTime, ForeignKey, Index, String, func, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.session import Base
+
+
+class SyncTombstone(Base):
+    """A deleted todo or note, kept so delta sync can report the deletion
+
+    Written by the ``sync_tombstone`` trigger on todos and notes, which covers
+    ORM deletes and bulk statements alike. ``resource`` is the table the row
+    was deleted from. Tombstones older than the retention period are removed
+    by ``crud_sync.compact_tombstones``.
+    """
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        # Delta sync: an organization's deletions in write order
+        Index("ix_sync_tombstones_org_sync_txid_row_id", "organization_id", "sync_txid", "row_id"),
+        # Compaction
+        Index("ix_sync_tombstones_deleted_at", "deleted_at"),
+    )
+
+    resource = Column(String, primary_key=True)
+    row_id = Column(UUID(as_uuid=True), primary_key=True)
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+    )
+    sync_txid = Column(BigInteger, nullable=False, server_default=text("pg_current_xact_id()::text::bigint"))
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
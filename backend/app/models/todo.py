@@ -1,7 +1,7 @@
 import uuid
-from sqlalchemy import Column, String, Boolean, ForeignKey, Text, DateTime, func
+from sqlalchemy import BigInteger, Column, FetchedValue, Index, String, Boolean, ForeignKey, Text, DateTime, func, text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.db.session import Base
 
@@ -14,6 +14,21 @@ if TYPE_CHECKING:
 
 class Todo(Base):
     __tablename__ = "todos"
+    __table_args__ = (
+        # Keyset pagination of an organization's todos, newest first
+        Index("ix_todos_org_created_at_id", "organization_id", "created_at", "id"),
+        # Server-side filters and sorts on GET /todos/org/{org_id}
+        Index("ix_todos_org_completed_created_at_id", "organization_id", "completed", "created_at", "id"),
+        Index("ix_todos_org_created_by_created_at_id", "organization_id", "created_by", "created_at", "id"),
+        Index("ix_todos_org_updated_at", "organization_id", "updated_at"),
+        Index("ix_todos_org_title_id", "organization_id", "title", "id"),
+        Index(
+            "ix_todos_org_title_prefix", "organization_id", "title",
+            postgresql_ops={"title": "varchar_pattern_ops"},
+        ),
+        # Delta sync: an organization's changes in write order
+        Index("ix_todos_org_sync_txid_id", "organization_id", "sync_txid", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String, nullable=False)
@@ -26,5 +41,12 @@ class Todo(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Id of the transaction that last wrote the row, set by Postgres (column
+    # default and the sync_touch trigger); see crud_sync
+    sync_txid = deferred(Column(
+        BigInteger, nullable=False,
+        server_default=text("pg_current_xact_id()::text::bigint"), server_onupdate=FetchedValue(),
+    ))
+
     organization = relationship("Organization", back_populates="todos")
     creator = relationship("User", back_populates="todos")
@@ -22,6 +22,8 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # User search also relies on expression indexes over lower(username) and
+    # lower(email); they are defined in the add_user_typeahead_indexes migration
 
     # Relationship to user-organization associations (with per-org roles)
     user_organizations = relationship("UserOrganization", back_populates="user", cascade="all, delete-orphan")
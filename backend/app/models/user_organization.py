@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, ForeignKey, Table, DateTime, func, Enum
+from sqlalchemy import Column, ForeignKey, Index, Table, DateTime, func, Enum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -15,12 +15,19 @@ class UserOrganizationRole(str, enum.Enum):
 class UserOrganization(Base):
     """Model for user-organization relationships with per-organization roles"""
     __tablename__ = 'user_organizations'
+    __table_args__ = (
+        # Membership checks, and members by username (joined from ix_users_username)
+        Index("ix_user_organizations_user_id_org", "user_id", "organization_id"),
+        # Keyset pagination of an organization's members, in join order, and by role
+        Index("ix_user_organizations_org_joined_at_user_id", "organization_id", "joined_at", "user_id"),
+        Index("ix_user_organizations_org_role_joined_at_user_id", "organization_id", "role", "joined_at", "user_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     organization_id = Column(UUID(as_uuid=True), ForeignKey('organizations.id'), nullable=False)
     role = Column(Enum(UserOrganizationRole), default=UserOrganizationRole.MEMBER, nullable=False)
-    joined_at = Column(DateTime(timezone=True), server_default=func.now())
+    joined_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="user_organizations")
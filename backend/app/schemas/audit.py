@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import Any, Optional
+import enum
+
+
+class AuditResource(str, enum.Enum):
+    TODOS = "todos"
+    NOTES = "notes"
+    MEMBERS = "members"
+    ORGANIZATION = "organization"
+
+
+class AuditAction(str, enum.Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+class AuditEventOut(BaseModel):
+    id: UUID
+    actor_id: Optional[UUID] = None
+    resource: AuditResource
+    action: AuditAction
+    # None for a change to many rows at once (bulk update or delete)
+    resource_id: Optional[UUID] = None
+    changes: Optional[dict[str, Any]] = None
+    occurred_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class AuditFilter(BaseModel):
+    """Server-side filters for the audit log (all optional, combined with AND)"""
+    resource: Optional[AuditResource] = None
+    action: Optional[AuditAction] = None
+    actor_id: Optional[UUID] = None
+    resource_id: Optional[UUID] = None
+    occurred_after: Optional[datetime] = None
+    occurred_before: Optional[datetime] = None
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+import enum
+
+
+class ExportResource(str, enum.Enum):
+    """What an organization export (or import) contains"""
+    TODOS = "todos"
+    NOTES = "notes"
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ImportResult(BaseModel):
+    resource: ExportResource
+    rows: int
+    seconds: float
+    rows_per_second: float
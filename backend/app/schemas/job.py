@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+from uuid import UUID
+from datetime import datetime
+
+from app.models.job import JobStatus
+
+
+class JobOut(BaseModel):
+    id: UUID
+    kind: str
+    status: JobStatus
+    priority: int
+    attempts: int
+    max_attempts: int
+    # When a queued job will next run, or when a running one's worker must check in by
+    run_at: datetime
+    last_error: Optional[str] = None
+    result: Optional[dict[str, Any]] = None
+    organization_id: Optional[UUID] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -12,6 +12,10 @@ class NoteCreate(NoteBase):
 class NoteUpdate(NoteBase):
     pass
 
+class NoteImportRow(NoteBase):
+    """One row of a bulk import; unknown columns (e.g. an export's id) are ignored"""
+    created_at: datetime | None = None
+
 class NoteOut(NoteBase):
     id: UUID
     created_by: UUID
@@ -19,4 +23,19 @@ class NoteOut(NoteBase):
     updated_at: datetime | None
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+
+class NoteSearchHit(BaseModel):
+    id: UUID
+    title: str
+    created_by: UUID
+    created_at: datetime
+    updated_at: datetime | None
+    rank: float
+    # HTML: the note text with & < > escaped and matched terms wrapped in <mark>...</mark>
+    title_highlight: str
+    content_highlight: str
+
+    class Config:
+        from_attributes = True
@@ -1,7 +1,10 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from uuid import UUID
 from datetime import datetime
-from typing import Optional, List
+from typing import Annotated, List, Literal, Optional, Union
+import enum
+from app.core.config import settings
+from app.models.organization_deletion import DeletionStatus
 from app.models.user_organization import UserOrganizationRole
 
 
@@ -17,9 +20,21 @@ class OrganizationUpdate(OrganizationBase):
     pass
 
 
+class OrganizationStatsOut(BaseModel):
+    open_todos: int
+    done_todos: int
+    notes: int
+    members: int
+    admins: int
+
+    class Config:
+        from_attributes = True
+
+
 class OrganizationOut(OrganizationBase):
     id: UUID
     created_at: datetime
+    stats: Optional[OrganizationStatsOut] = None
 
     class Config:
         from_attributes = True
@@ -54,6 +69,93 @@ class OrganizationMemberOut(BaseModel):
         from_attributes = True
 
 
+class MemberSort(str, enum.Enum):
+    """Whitelisted sort orders for member lists; a leading '-' means descending"""
+    JOINED = "joined_at"
+    JOINED_DESC = "-joined_at"
+    USERNAME = "username"
+    USERNAME_DESC = "-username"
+
+
+class MemberFilter(BaseModel):
+    """Server-side filters for member lists (all optional, combined with AND)"""
+    role: Optional[UserOrganizationRole] = None
+    is_active: Optional[bool] = None
+    joined_after: Optional[datetime] = None
+    joined_before: Optional[datetime] = None
+
+
+class MemberBatchAdd(BaseModel):
+    op: Literal["add"]
+    user_id: UUID
+    role: UserOrganizationRole = UserOrganizationRole.MEMBER
+
+
+class MemberBatchRemove(BaseModel):
+    op: Literal["remove"]
+    user_id: UUID
+
+
+class MemberBatchRole(BaseModel):
+    op: Literal["role"]
+    user_id: UUID
+    role: UserOrganizationRole
+
+
+MemberBatchOperation = Annotated[
+    Union[MemberBatchAdd, MemberBatchRemove, MemberBatchRole], Field(discriminator="op")
+]
+
+
+class MemberBatch(BaseModel):
+    operations: List[MemberBatchOperation] = Field(..., min_length=1, max_length=settings.MAX_BATCH_SIZE)
+
+    @model_validator(mode="after")
+    def one_operation_per_user(self):
+        ids = [op.user_id for op in self.operations]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Each user may appear in only one operation per batch")
+        return self
+
+
+class MemberBatchResult(BaseModel):
+    """Outcome of one operation, in request order; status is an HTTP status code"""
+    index: int
+    op: str
+    status: int
+    member: Optional[OrganizationMemberOut] = None
+    error: Optional[str] = None
+
+
+class UserSearchHit(BaseModel):
+    id: UUID
+    username: str
+    # Only for members, or when the search was for this exact address
+    email: Optional[str] = None
+    is_active: bool
+    is_member: bool
+
+
 class OrganizationWithMembers(OrganizationOut):
     members: List[OrganizationMemberOut] = []
     user_role: Optional[UserOrganizationRole] = None  # User's role in this organization
+
+
+class OrganizationDeletionOut(BaseModel):
+    id: UUID
+    organization_id: UUID
+    organization_name: str
+    status: DeletionStatus
+    members_total: int
+    members_deleted: int
+    todos_total: int
+    todos_deleted: int
+    notes_total: int
+    notes_deleted: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
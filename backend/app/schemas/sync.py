@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import List
+from uuid import UUID
+
+from app.schemas.note import NoteOut
+from app.schemas.todo import TodoOut
+
+
+class SyncChanges(BaseModel):
+    """What changed in an organization since the cursor the client sent"""
+    # Created or updated since the cursor, as they are now
+    todos: List[TodoOut]
+    notes: List[NoteOut]
+    # Deleted since the cursor
+    deleted_todos: List[UUID]
+    deleted_notes: List[UUID]
+    # Pass back as ``since`` on the next call
+    cursor: str
+    # More changes are waiting; call again right away
+    has_more: bool
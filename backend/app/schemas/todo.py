@@ -1,7 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, List, Literal, Optional, Union
+import enum
+
+from app.core.config import settings
 
 
 class TodoBase(BaseModel):
@@ -20,6 +23,11 @@ class TodoUpdate(BaseModel):
     completed: Optional[bool] = None
 
 
+class TodoImportRow(TodoBase):
+    """One row of a bulk import; unknown columns (e.g. an export's id) are ignored"""
+    created_at: Optional[datetime] = None
+
+
 class TodoOut(TodoBase):
     id: UUID
     organization_id: UUID
@@ -29,3 +37,72 @@ class TodoOut(TodoBase):
 
     class Config:
         from_attributes = True
+
+
+class TodoSort(str, enum.Enum):
+    """Whitelisted sort orders for todo lists; a leading '-' means descending"""
+    NEWEST = "-created_at"
+    OLDEST = "created_at"
+    TITLE = "title"
+    TITLE_DESC = "-title"
+
+
+class TodoFilter(BaseModel):
+    """Server-side filters for todo lists (all optional, combined with AND)"""
+    completed: Optional[bool] = None
+    created_by: Optional[UUID] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    title_prefix: Optional[str] = None
+
+
+class TodoBulkUpdate(BaseModel):
+    """Values set on every todo matching a bulk update's filters"""
+    completed: bool
+
+
+class TodoBulkResult(BaseModel):
+    affected: int
+
+
+class TodoBatchCreate(BaseModel):
+    op: Literal["create"]
+    todo: TodoCreate
+
+
+class TodoBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: UUID
+    changes: TodoUpdate
+
+
+class TodoBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: UUID
+
+
+TodoBatchOperation = Annotated[
+    Union[TodoBatchCreate, TodoBatchUpdate, TodoBatchDelete], Field(discriminator="op")
+]
+
+
+class TodoBatch(BaseModel):
+    operations: List[TodoBatchOperation] = Field(..., min_length=1, max_length=settings.MAX_BATCH_SIZE)
+
+    @model_validator(mode="after")
+    def one_operation_per_todo(self):
+        ids = [op.id for op in self.operations if op.op != "create"]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Each todo may appear in only one update or delete operation per batch")
+        return self
+
+
+class TodoBatchResult(BaseModel):
+    """Outcome of one operation, in request order; status is an HTTP status code"""
+    index: int
+    op: str
+    status: int
+    todo: Optional[TodoOut] = None
+    error: Optional[str] = None
@@ -0,0 +1,151 @@
+"""Background job worker.
+
+Runs the jobs queued in the ``jobs`` table (see ``crud_job``), one at a time,
+next to the API processes rather than inside them:
+
+    python -m app.worker
+
+Start as many as the work needs; each claims a different job. An idle worker
+sleeps until a job is enqueued (LISTEN on ``crud_job.CHANNEL``) or
+``JOB_POLL_SECONDS`` pass, which also picks up retries as they fall due and
+jobs whose worker died. SIGTERM or SIGINT lets the current job finish first.
+"""
+import logging
+import os
+import select
+import signal
+import socket
+import threading
+from typing import Any, Callable
+
+import psycopg2
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crud_deletion, crud_job
+from app.db.session import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+# Job kind -> handler(bind, payload), returning the job's (JSON) result. A
+# handler that raises is retried, so it must be safe to run again; one that
+# raises crud_job.RetryLater is put off without using up an attempt.
+HANDLERS: dict[str, Callable[[Engine, dict], dict[str, Any] | None]] = {
+    crud_deletion.JOB_KIND: crud_deletion.run_deletion_job,
+}
+
+
+class Worker:
+    def __init__(self, engine: Engine, worker_id: str | None = None):
+        self.engine = engine
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = threading.Event()
+        self._listener = None
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def run_once(self) -> bool:
+        """Claim and run one ready job; False if there was none"""
+        with Session(bind=self.engine) as db:
+            job = crud_job.claim_job(db, self.worker_id)
+        if job is None:
+            return False
+        self._run(job)
+        return True
+
+    def run_pending(self) -> int:
+        """Run jobs until none is ready (or we are stopped); returns how many ran"""
+        ran = 0
+        while not self._stopping.is_set() and self.run_once():
+            ran += 1
+        return ran
+
+    def run(self) -> None:
+        logger.info("Worker %s started", self.worker_id)
+        try:
+            while not self._stopping.is_set():
+                if not self.run_once():
+                    self._wait(settings.JOB_POLL_SECONDS)
+        finally:
+            self._close_listener()
+        logger.info("Worker %s stopped", self.worker_id)
+
+    def _run(self, job: Row) -> None:
+        with Session(bind=self.engine) as db:
+            if job.attempts > job.max_attempts:
+                # Its earlier workers all died with it
+                crud_job.fail_job(db, job, job.last_error or "Visibility timeout expired", retry=False)
+                return
+            handler = HANDLERS.get(job.kind)
+            if handler is None:
+                crud_job.fail_job(db, job, f"No handler for job kind {job.kind!r}", retry=False)
+                return
+
+            done = threading.Event()
+            beat = threading.Thread(target=self._heartbeat, args=(job, done), name="job-heartbeat", daemon=True)
+            beat.start()
+            try:
+                result = handler(self.engine, job.payload)
+            except crud_job.RetryLater as e:
+                logger.info("Job %s (%s) deferred for %ss: %s", job.id, job.kind, e.delay, e)
+                recorded = crud_job.defer_job(db, job, str(e), e.delay)
+            except Exception as e:
+                logger.exception("Job %s (%s) failed on attempt %d", job.id, job.kind, job.attempts)
+                recorded = crud_job.fail_job(db, job, f"{type(e).__name__}: {e}")
+            else:
+                recorded = crud_job.complete_job(db, job, result)
+            finally:
+                done.set()
+                beat.join()
+            if not recorded:
+                logger.warning("Job %s was taken over by another worker; outcome dropped", job.id)
+
+    def _heartbeat(self, job: Row, done: threading.Event) -> None:
+        """Push the job's visibility timeout back while it runs"""
+        interval = settings.JOB_VISIBILITY_TIMEOUT_SECONDS / 3
+        while not done.wait(interval):
+            try:
+                with Session(bind=self.engine) as db:
+                    if not crud_job.heartbeat(db, job):
+                        logger.warning("Lost job %s to another worker", job.id)
+                        return
+            except DBAPIError as e:
+                logger.warning("Heartbeat for job %s failed: %s", job.id, e)
+
+    def _wait(self, timeout: float) -> None:
+        """Sleep up to ``timeout`` seconds, waking early when a job is enqueued"""
+        try:
+            if self._listener is None:
+                # A dedicated connection, outside the pool, for as long as we run
+                raw = self.engine.raw_connection()
+                self._listener = raw.driver_connection
+                raw.detach()
+                self._listener.autocommit = True
+                self._listener.cursor().execute(f"LISTEN {crud_job.CHANNEL}")
+            if select.select([self._listener], [], [], timeout) != ([], [], []):
+                self._listener.poll()
+                self._listener.notifies.clear()
+        except (psycopg2.Error, DBAPIError, OSError) as e:
+            logger.warning("Job listener connection lost: %s", e)
+            self._close_listener()
+            self._stopping.wait(timeout)
+
+    def _close_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = Worker(default_engine)
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: worker.stop())
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 import sys
 import os
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
 from pathlib import Path
 
 # Add the backend directory to Python path
@@ -8,13 +11,15 @@ sys.path.insert(0, str(backend_dir))
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.db.base import Base
+from app.db.init_db import init_db
 from app.api.deps import get_db
 from app.models.user import User
 from app.models.organization import Organization
+from app.models.user_organization import UserOrganization, UserOrganizationRole
 from app.core.security import hash_password
 
 # Use a separate test database (PostgreSQL)
@@ -25,11 +30,14 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_db():
-    # Create tables
-    Base.metadata.create_all(bind=engine)
+    # Build the schema the same way a fresh deployment does (baseline + upgrade)
+    with engine.begin() as connection:
+        init_db(connection)
     yield
-    # Drop tables after test session
-    Base.metadata.drop_all(bind=engine)
+    # Drop everything, including alembic_version, after test session
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
 
 
 @pytest.fixture(scope="function")
@@ -66,3 +74,59 @@ def get_auth_headers(client, username, password):
         raise Exception(f"Login failed: {response.json()}")
     token = response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+
+# Every user made by make_user logs in with this; hashed once, as bcrypt is slow
+TEST_PASSWORD = "test_password"
+_TEST_PASSWORD_HASH = hash_password(TEST_PASSWORD)
+
+
+def make_user(db_session, prefix="user", is_active=True):
+    """A new user with a unique username and email, flushed but not committed"""
+    tag = uuid.uuid4().hex[:8]
+    user = User(
+        username=f"{prefix}_{tag}",
+        email=f"{prefix}_{tag}@example.com",
+        hashed_password=_TEST_PASSWORD_HASH,
+        is_active=is_active
+    )
+    db_session.add(user)
+    db_session.flush()
+    return user
+
+
+def make_org(db_session, admins=1, members=0, prefix="org", joined_at=None):
+    """An organization with its admins and members, flushed but not committed
+
+    ``admins`` and ``members`` are each a number of new users to make or a
+    list of existing ones. With ``joined_at`` the memberships join a minute
+    apart from then on, admins first. Returns the organization and its users,
+    admins first.
+    """
+    org = Organization(name=f"{prefix}_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+    users = []
+    for role, spec in ((UserOrganizationRole.ADMIN, admins), (UserOrganizationRole.MEMBER, members)):
+        if isinstance(spec, int):
+            spec = [make_user(db_session, f"{prefix}_{role.value.lower()}") for _ in range(spec)]
+        for user in spec:
+            membership = UserOrganization(user_id=user.id, organization_id=org.id, role=role)
+            if joined_at is not None:
+                membership.joined_at = joined_at + timedelta(minutes=len(users))
+            db_session.add(membership)
+            users.append(user)
+    db_session.flush()
+    return org, users
+
+
+@contextmanager
+def count_statements(bind):
+    """Collect the SQL statements run on ``bind`` (e.g. ``db_session.get_bind()``) inside the block"""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(bind, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", listener)
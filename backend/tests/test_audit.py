@@ -0,0 +1,185 @@
+import uuid
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import create_engine, text
+from app.core.audit import AuditLog, audit, get_audit_log
+from app.worker import Worker
+from app.models.user import User
+from tests.conftest import TEST_PASSWORD, count_statements, engine, get_auth_headers, make_user
+
+
+@pytest.fixture
+def audited_org(client, db_session):
+    """An organization created through the API by an admin, with a second user to manage"""
+    users = [make_user(db_session, f"audit_{name}") for name in ("admin", "member")]
+    db_session.commit()
+    admin_headers = get_auth_headers(client, users[0].username, TEST_PASSWORD)
+    response = client.post("/organizations/", json={"name": f"AuditOrg_{uuid.uuid4().hex[:8]}"}, headers=admin_headers)
+    assert response.status_code == 200
+    return response.json()["id"], [user.id for user in users], admin_headers
+
+
+def _log(client, db_session, org_id, headers, **params):
+    get_audit_log(db_session.get_bind()).flush()
+    response = client.get(f"/organizations/{org_id}/audit", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_mutations_are_audited_with_their_actor(client, db_session, audited_org):
+    org_id, (admin, member), headers = audited_org
+    todo = client.post(f"/todos/org/{org_id}", json={"title": "Audit me"}, headers=headers).json()
+    client.put(f"/todos/org/{org_id}/{todo['id']}", json={"completed": True}, headers=headers)
+    note = client.post(f"/notes/org/{org_id}", json={"title": "Minutes", "content": "secret"}, headers=headers).json()
+    client.post(f"/organizations/{org_id}/members/{member}", headers=headers)
+    client.put(f"/organizations/{org_id}/members/{member}/role", json={"role": "ADMIN"}, headers=headers)
+    client.delete(f"/organizations/{org_id}/members/{member}", headers=headers)
+    client.delete(f"/todos/org/{org_id}", params={"title_prefix": "Audit"}, headers=headers)
+
+    events = _log(client, db_session, org_id, headers)
+    assert [(e["resource"], e["action"]) for e in reversed(events)] == [
+        ("organization", "created"),
+        ("members", "created"),
+        ("todos", "created"),
+        ("todos", "updated"),
+        ("notes", "created"),
+        ("members", "created"),
+        ("members", "updated"),
+        ("members", "deleted"),
+        ("todos", "deleted"),
+    ]
+    assert {e["actor_id"] for e in events} == {str(admin)}
+    by_kind = {(e["resource"], e["action"]): e for e in events}
+    assert by_kind[("todos", "updated")]["resource_id"] == todo["id"]
+    assert by_kind[("todos", "updated")]["changes"] == {"completed": True}
+    assert by_kind[("members", "updated")]["changes"] == {"role": "ADMIN", "previous_role": "MEMBER"}
+    assert by_kind[("members", "deleted")]["changes"] == {"role": "ADMIN"}
+    # Bulk statements are one event for all the rows they changed
+    assert by_kind[("todos", "deleted")]["resource_id"] is None
+    assert by_kind[("todos", "deleted")]["changes"] == {"filter": {"title_prefix": "Audit"}, "count": 1}
+    # Note content stays out of the log
+    assert by_kind[("notes", "created")]["resource_id"] == note["id"]
+    assert "secret" not in str(by_kind[("notes", "created")]["changes"])
+
+
+def test_audit_adds_no_statement_to_the_mutation(client, db_session, audited_org):
+    org_id, _, headers = audited_org
+    bind = db_session.get_bind()
+    with count_statements(bind) as statements:
+        assert client.post(f"/todos/org/{org_id}", json={"title": "Quiet"}, headers=headers).status_code == 200
+    assert not [s for s in statements if "audit_events" in s]
+    assert get_audit_log(bind).pending() >= 1
+
+
+def test_rolled_back_changes_are_not_audited(db_session, audited_org):
+    org_id, _, _ = audited_org
+    log = get_audit_log(db_session.get_bind())
+    log.flush()
+    audit(db_session, uuid.UUID(org_id), "todos", "created", uuid.uuid4())
+    db_session.rollback()
+    db_session.commit()
+    assert log.pending() == 0
+
+
+def test_audit_filters_and_pages(client, db_session, audited_org):
+    org_id, (admin, member), headers = audited_org
+    client.post(f"/organizations/{org_id}/members/{member}", headers=headers)
+    for i in range(5):
+        client.post(f"/todos/org/{org_id}", json={"title": f"Paged {i}"}, headers=headers)
+
+    todos = _log(client, db_session, org_id, headers, resource="todos", action="created")
+    assert [e["changes"]["title"] for e in todos] == [f"Paged {i}" for i in reversed(range(5))]
+    assert [e["resource_id"] for e in _log(client, db_session, org_id, headers, resource_id=str(member))] == [str(member)]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"/organizations/{org_id}/audit", params=params, headers=headers)
+        seen += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == 8 and len({e["id"] for e in seen}) == 8
+
+    member_headers = get_auth_headers(
+        client, db_session.get(User, member).username, TEST_PASSWORD
+    )
+    assert client.get(f"/organizations/{org_id}/audit", headers=member_headers).status_code == 403
+    assert client.get(f"/organizations/{org_id}/audit", params={"cursor": "nope"}, headers=headers).status_code == 400
+
+
+def test_imports_and_deletions_are_audited(client, db_session, audited_org):
+    org_id, (admin, member), headers = audited_org
+    client.post(f"/organizations/{org_id}/members/{member}", headers=headers)
+    body = "".join(f'{{"title": "Imported {i}"}}\n' for i in range(3))
+    response = client.post(
+        f"/organizations/{org_id}/import", params={"resource": "todos", "format": "ndjson"},
+        headers=headers, files={"file": ("upload.ndjson", body.encode())},
+    )
+    assert response.status_code == 200
+    imported = _log(client, db_session, org_id, headers, resource="todos")[0]
+    assert (imported["actor_id"], imported["changes"]) == (str(admin), {"imported": 3, "format": "ndjson"})
+
+    assert client.delete(f"/organizations/{org_id}", headers=headers).status_code == 202
+    Worker(db_session.get_bind()).run_pending()
+    get_audit_log(db_session.get_bind()).flush()
+    # Nobody is left to read the log through the API
+    events = db_session.execute(text("""
+        SELECT resource, actor_id, resource_id, changes FROM audit_events
+        WHERE organization_id = :id AND action = 'deleted'
+        ORDER BY occurred_at, id
+    """), {"id": org_id}).all()
+    assert [e.resource for e in events] == ["organization", "members", "members", "organization"]
+    assert {e.actor_id for e in events} == {admin}
+    assert events[0].changes["status"] == "PENDING"
+    assert {(e.resource_id, e.changes["role"]) for e in events[1:3]} == {(admin, "ADMIN"), (member, "MEMBER")}
+    assert events[3].changes == {"status": "DONE", "members_deleted": 2, "todos_deleted": 3, "notes_deleted": 0}
+
+
+def _event(org_id):
+    return {
+        "id": uuid.uuid4(), "organization_id": org_id, "actor_id": None, "resource": "todos",
+        "action": "created", "resource_id": uuid.uuid4(), "changes": None,
+        "occurred_at": datetime.now(timezone.utc),
+    }
+
+
+def _stored(org_id):
+    with engine.connect() as connection:
+        return connection.execute(
+            text("SELECT count(*) FROM audit_events WHERE organization_id = :id"), {"id": org_id}
+        ).scalar()
+
+
+def test_flushes_are_multi_row_inserts():
+    org_id = uuid.uuid4()
+    log = AuditLog(engine, batch_size=3, flush_seconds=60)
+    with count_statements(engine) as inserts:
+        # A full batch wakes the flusher; stopping writes the remainder
+        log.add([_event(org_id) for _ in range(7)])
+        log.stop()
+    assert len([s for s in inserts if s.startswith("INSERT INTO audit_events")]) == 3
+    assert _stored(org_id) == 7
+
+
+def test_loss_is_bounded_and_shutdown_flushes():
+    org_id = uuid.uuid4()
+    log = AuditLog(engine, batch_size=100, flush_seconds=60, buffer_size=5)
+    log.add([_event(org_id) for _ in range(8)])
+    # The oldest go once the buffer is full
+    assert (log.pending(), log.dropped) == (5, 3)
+    log.stop()
+    assert log.pending() == 0
+    assert _stored(org_id) == 5
+
+
+def test_unwritable_events_are_kept_for_the_next_flush():
+    org_id = uuid.uuid4()
+    down = AuditLog(create_engine(engine.url.set(host="127.0.0.1", port=1)), flush_seconds=60)
+    down.add([_event(org_id) for _ in range(2)])
+    assert down.flush() == 0
+    assert down.pending() == 2
+    down.engine = engine
+    assert down.flush() == 2
+    down.stop()
+    assert _stored(org_id) == 2
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import threading
+import uuid
+import pytest
+from app.main import app
+from app.core.config import settings
+from app.core.events import EVICTED, EventBroker, get_event_broker, notify
+from app.crud import crud_todo
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.core.security import hash_password
+from app.schemas.todo import TodoCreate
+from tests.conftest import engine, TestingSessionLocal, get_auth_headers
+
+
+@pytest.fixture
+def broker():
+    """A broker listening on the test database, used by the events endpoint"""
+    broker = EventBroker(engine, buffer_size=3)
+    broker.start()
+    app.dependency_overrides[get_event_broker] = lambda: broker
+    yield broker
+    app.dependency_overrides.pop(get_event_broker, None)
+    broker.stop()
+
+
+@pytest.fixture
+def events_org(client, db_session):
+    """Two organizations and an admin of the first"""
+    org = Organization(name=f"EventsOrg_{uuid.uuid4().hex[:8]}")
+    other = Organization(name=f"EventsOther_{uuid.uuid4().hex[:8]}")
+    db_session.add_all([org, other])
+    db_session.flush()
+    user = User(
+        username=f"events_admin_{uuid.uuid4().hex[:8]}",
+        email=f"events_admin_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("events_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserOrganization(user_id=user.id, organization_id=org.id, role=UserOrganizationRole.ADMIN))
+    db_session.commit()
+    return org.id, other.id, user.id, get_auth_headers(client, user.username, "events_password")
+
+
+@pytest.mark.asyncio
+async def test_committed_changes_reach_the_organizations_subscribers(broker, db_session, events_org):
+    org_id, other_id, user_id, _ = events_org
+    subscription = broker.subscribe(org_id)
+    elsewhere = broker.subscribe(other_id)
+    try:
+        notify(db_session, org_id, "todos", "deleted", [user_id])
+        db_session.rollback()
+        todo = crud_todo.create_todo(db_session, TodoCreate(title="Evented"), user_id, org_id)
+
+        event = json.loads(await subscription.get(5))
+        assert event == {"org_id": str(org_id), "resource": "todos", "action": "created", "ids": [str(todo.id)]}
+        # The rolled back notification was never sent, and other organizations hear nothing
+        with pytest.raises(asyncio.TimeoutError):
+            await subscription.get(0.3)
+        with pytest.raises(asyncio.TimeoutError):
+            await elsewhere.get(0.1)
+    finally:
+        broker.unsubscribe(subscription)
+        broker.unsubscribe(elsewhere)
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_evicted(broker, events_org):
+    org_id, *_ = events_org
+    slow = broker.subscribe(org_id)
+    fast = broker.subscribe(org_id)
+    try:
+        payload = json.dumps({"org_id": str(org_id), "resource": "notes", "action": "updated", "ids": None})
+        received = []
+        for _ in range(5):
+            broker.publish(payload)
+            await asyncio.sleep(0)
+            received.append(await fast.get(1))
+        assert received == [payload] * 5
+
+        # The slow subscriber's buffer holds 3; the 4th event evicts it
+        assert slow.evicted
+        assert await slow.get(1) is EVICTED
+        assert slow.queue.empty()
+    finally:
+        broker.unsubscribe(slow)
+        broker.unsubscribe(fast)
+
+
+def test_event_stream_endpoint(client, broker, events_org, monkeypatch):
+    org_id, _, user_id, headers = events_org
+    monkeypatch.setattr(settings, "EVENTS_MAX_STREAM_SECONDS", 2)
+    created = []
+
+    def create_todo():
+        session = TestingSessionLocal()
+        try:
+            created.append(crud_todo.create_todo(session, TodoCreate(title="Streamed"), user_id, org_id).id)
+        finally:
+            session.close()
+
+    writer = threading.Timer(0.5, create_todo)
+    writer.start()
+    response = client.get(f"/events/org/{org_id}", headers=headers)
+    writer.join()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block for block in response.text.split("\n\n") if block.startswith("event: change")]
+    assert len(events) == 1
+    data = json.loads(events[0].split("data: ", 1)[1])
+    assert data["resource"] == "todos" and data["ids"] == [str(created[0])]
+
+
+def test_event_stream_requires_membership(client, broker, db_session, events_org):
+    _, other_id, _, headers = events_org
+    assert client.get(f"/events/org/{other_id}", headers=headers).status_code == 403
+    assert client.get(f"/events/org/{other_id}").status_code == 401
@@ -0,0 +1,143 @@
+import json
+import pytest
+import uuid
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.models.todo import Todo
+from app.models.note import Note
+from app.core.security import hash_password
+from tests.conftest import get_auth_headers
+
+
+def _user(db_session, org, role):
+    user = User(
+        username=f"import_{role.value}_{uuid.uuid4().hex[:8]}",
+        email=f"import_{role.value}_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("import_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserOrganization(user_id=user.id, organization_id=org.id, role=role))
+    return user
+
+
+@pytest.fixture
+def import_org(db_session):
+    org = Organization(name=f"ImportOrg_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+    admin = _user(db_session, org, UserOrganizationRole.ADMIN)
+    db_session.commit()
+    return org, admin
+
+
+def _import(client, org, user, body, **params):
+    headers = get_auth_headers(client, user.username, "import_password")
+    filename = "upload." + params.get("format", "ndjson")
+    return client.post(
+        f"/organizations/{org.id}/import", params=params, headers=headers,
+        files={"file": (filename, body.encode() if isinstance(body, str) else body)},
+    )
+
+
+def _todos(db_session, org):
+    return db_session.query(Todo).filter(Todo.organization_id == org.id).order_by(Todo.title).all()
+
+
+def test_ndjson_import(client, db_session, import_org):
+    org, admin = import_org
+    lines = [
+        {"title": f"Imported {i}", "completed": i % 2 == 0, "created_at": f"2024-01-0{i + 1}T00:00:00+00:00"}
+        for i in range(3)
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n\n"
+    response = _import(client, org, admin, body, resource="todos")
+    assert response.status_code == 200, response.json()
+    result = response.json()
+    assert result["rows"] == 3 and result["resource"] == "todos"
+    assert result["rows_per_second"] > 0
+
+    todos = _todos(db_session, org)
+    assert [todo.title for todo in todos] == ["Imported 0", "Imported 1", "Imported 2"]
+    assert [todo.completed for todo in todos] == [True, False, True]
+    assert all(todo.created_by == admin.id for todo in todos)
+    assert todos[0].created_at.year == 2024
+
+
+def test_csv_import_handles_quoting_and_missing_values(client, db_session, import_org):
+    org, admin = import_org
+    body = (
+        "title,description,completed\r\n"
+        '"Say ""hi""","multi\nline, with comma",true\r\n'
+        "No description,,\r\n"
+    )
+    response = _import(client, org, admin, body, resource="todos", format="csv")
+    assert response.status_code == 200, response.json()
+    todos = _todos(db_session, org)
+    assert [(t.title, t.description, t.completed) for t in todos] == [
+        ("No description", None, False),
+        ('Say "hi"', "multi\nline, with comma", True),
+    ]
+
+
+def test_export_can_be_imported_into_another_organization(client, db_session, import_org):
+    org, admin = import_org
+    for i in range(3):
+        db_session.add(Note(title=f"Note {i}", content="Body", organization_id=org.id, created_by=admin.id))
+    target = Organization(name=f"ImportTarget_{uuid.uuid4().hex[:8]}")
+    db_session.add(target)
+    db_session.flush()
+    db_session.add(UserOrganization(user_id=admin.id, organization_id=target.id, role=UserOrganizationRole.ADMIN))
+    db_session.commit()
+
+    headers = get_auth_headers(client, admin.username, "import_password")
+    for fmt in ("ndjson", "csv"):
+        exported = client.get(
+            f"/organizations/{org.id}/export", params={"resource": "notes", "format": fmt}, headers=headers
+        )
+        response = _import(client, target, admin, exported.content, resource="notes", format=fmt)
+        assert response.status_code == 200, response.json()
+        assert response.json()["rows"] == 3
+    assert db_session.query(Note).filter(Note.organization_id == target.id).count() == 6
+
+
+def test_invalid_rows_reject_the_whole_file(client, db_session, import_org):
+    org, admin = import_org
+    body = "\n".join([
+        json.dumps({"title": "Fine"}),
+        json.dumps({"title": ""}),
+        "{not json",
+        json.dumps({"title": "Also fine", "completed": "maybe"}),
+    ])
+    response = _import(client, org, admin, body, resource="todos")
+    assert response.status_code == 422
+    errors = response.json()["detail"]["errors"]
+    assert [error["line"] for error in errors] == [2, 3, 4]
+    assert "completed" in errors[2]["error"]
+    assert _todos(db_session, org) == []
+
+
+def test_rows_postgres_rejects_are_reported(client, db_session, import_org):
+    org, admin = import_org
+    response = _import(client, org, admin, json.dumps({"title": "nul \u0000 byte"}), resource="notes")
+    assert response.status_code == 400
+    assert db_session.query(Note).filter(Note.organization_id == org.id).count() == 0
+
+
+def test_chunks_are_loaded_together(client, db_session, import_org, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 2)
+    org, admin = import_org
+    body = "\n".join(json.dumps({"title": f"Chunked {i}"}) for i in range(5))
+    assert _import(client, org, admin, body, resource="todos").json()["rows"] == 5
+    assert len(_todos(db_session, org)) == 5
+
+
+def test_import_requires_admin(client, db_session, import_org):
+    org, _ = import_org
+    member = _user(db_session, org, UserOrganizationRole.MEMBER)
+    db_session.commit()
+    response = _import(client, org, member, json.dumps({"title": "Nope"}), resource="todos")
+    assert response.status_code == 403
@@ -0,0 +1,157 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import text
+from app import worker
+from app.core.config import settings
+from app.crud import crud_job
+from app.models.job import Job, JobStatus
+from app.models.user import User
+from app.models.organization import Organization
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.core.security import hash_password
+from tests.conftest import TestingSessionLocal, get_auth_headers
+
+
+@pytest.fixture
+def ran(db_session, monkeypatch):
+    """Test job kinds: ``record`` notes its payload, ``explode`` raises; other jobs are run first"""
+    worker.Worker(db_session.get_bind()).run_pending()
+    ran = []
+
+    def record(bind, payload):
+        ran.append(payload["n"])
+        return {"n": payload["n"]}
+
+    def explode(bind, payload):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(worker.HANDLERS, "record", record)
+    monkeypatch.setitem(worker.HANDLERS, "explode", explode)
+    return ran
+
+
+def _job(db_session, job_id):
+    db_session.expire_all()
+    return db_session.get(Job, job_id)
+
+
+def _make_ready(db_session, job_id):
+    db_session.execute(text("UPDATE jobs SET run_at = now() WHERE id = :id"), {"id": job_id})
+    db_session.commit()
+
+
+def test_jobs_run_by_priority(db_session, ran):
+    low = crud_job.enqueue_job(db_session, "record", {"n": 1}).id
+    high = crud_job.enqueue_job(db_session, "record", {"n": 2}, priority=10).id
+    last = crud_job.enqueue_job(db_session, "record", {"n": 3}, priority=-10).id
+    assert worker.Worker(db_session.get_bind()).run_pending() == 3
+    assert ran == [2, 1, 3]
+    job = _job(db_session, high)
+    assert job.status == JobStatus.DONE and job.result == {"n": 2} and job.attempts == 1 and job.finished_at
+    assert {_job(db_session, job_id).status for job_id in (low, last)} == {JobStatus.DONE}
+
+
+def test_claims_skip_locked_jobs(db_session, ran):
+    first = crud_job.enqueue_job(db_session, "record", {"n": 1}, priority=10).id
+    second = crud_job.enqueue_job(db_session, "record", {"n": 2}).id
+    holder = TestingSessionLocal()
+    claimer = TestingSessionLocal()
+    try:
+        # Another worker is in the middle of claiming the first job
+        holder.execute(text("SELECT 1 FROM jobs WHERE id = :id FOR UPDATE"), {"id": first})
+        claimed = crud_job.claim_job(claimer, "other-worker")
+        assert claimed.id == second and claimed.status == JobStatus.RUNNING and claimed.attempts == 1
+        holder.rollback()
+        assert crud_job.claim_job(claimer, "other-worker").id == first
+        assert crud_job.claim_job(claimer, "other-worker") is None
+    finally:
+        holder.close()
+        claimer.close()
+
+
+def test_failed_jobs_are_retried_with_backoff_then_fail(db_session, ran):
+    job_id = crud_job.enqueue_job(db_session, "explode", max_attempts=2).id
+    before = datetime.now(timezone.utc)
+    assert worker.Worker(db_session.get_bind()).run_once()
+    job = _job(db_session, job_id)
+    assert job.status == JobStatus.QUEUED and job.attempts == 1
+    assert job.last_error == "RuntimeError: boom" and job.locked_by is None
+    assert job.run_at >= before + timedelta(seconds=settings.JOB_RETRY_BASE_SECONDS / 2)
+    # Not ready until the backoff has passed
+    assert not worker.Worker(db_session.get_bind()).run_once()
+
+    _make_ready(db_session, job_id)
+    assert worker.Worker(db_session.get_bind()).run_once()
+    job = _job(db_session, job_id)
+    assert job.status == JobStatus.FAILED and job.attempts == 2 and job.finished_at
+
+
+def test_retry_delay_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 10)
+    monkeypatch.setattr(settings, "JOB_RETRY_MAX_SECONDS", 60)
+    monkeypatch.setattr(crud_job.random, "uniform", lambda low, high: high)
+    assert [crud_job.retry_delay(attempts) for attempts in range(1, 6)] == [10, 20, 40, 60, 60]
+
+
+def test_jobs_of_dead_workers_are_taken_over(db_session, ran):
+    job_id = crud_job.enqueue_job(db_session, "record", {"n": 7}, priority=10).id
+    lost = crud_job.claim_job(db_session, "dead-worker")
+    assert lost.id == job_id
+    # Hidden from other workers until its visibility timeout runs out
+    assert not worker.Worker(db_session.get_bind()).run_once()
+
+    _make_ready(db_session, job_id)
+    assert worker.Worker(db_session.get_bind()).run_once()
+    assert ran == [7]
+    job = _job(db_session, job_id)
+    assert job.status == JobStatus.DONE and job.attempts == 2
+    # The first worker coming back cannot overwrite the outcome
+    assert not crud_job.fail_job(db_session, lost, "late")
+    assert not crud_job.heartbeat(db_session, lost)
+    assert _job(db_session, job_id).status == JobStatus.DONE
+
+
+def test_unknown_and_exhausted_jobs_fail_without_running(db_session, ran):
+    unknown = crud_job.enqueue_job(db_session, "no_such_kind").id
+    exhausted = crud_job.enqueue_job(db_session, "record", {"n": 1}, max_attempts=1).id
+    crud_job.claim_job(db_session, "dead-worker")
+    crud_job.claim_job(db_session, "dead-worker")
+    _make_ready(db_session, exhausted)
+    _make_ready(db_session, unknown)
+    worker.Worker(db_session.get_bind()).run_pending()
+    assert ran == []
+    assert "no_such_kind" in _job(db_session, unknown).last_error
+    assert {_job(db_session, job_id).status for job_id in (unknown, exhausted)} == {JobStatus.FAILED}
+
+
+def test_job_status_api(client, db_session, ran):
+    users = []
+    for name in ("owner", "admin", "outsider"):
+        user = User(
+            username=f"job_{name}_{uuid.uuid4().hex[:8]}",
+            email=f"job_{name}_{uuid.uuid4().hex[:8]}@example.com",
+            hashed_password=hash_password("job_password"),
+            is_active=True
+        )
+        db_session.add(user)
+        users.append(user)
+    org = Organization(name=f"JobOrg_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+    db_session.add(UserOrganization(user_id=users[1].id, organization_id=org.id, role=UserOrganizationRole.ADMIN))
+    db_session.add(UserOrganization(user_id=users[2].id, organization_id=org.id, role=UserOrganizationRole.MEMBER))
+    db_session.commit()
+    owner, admin, outsider = [get_auth_headers(client, user.username, "job_password") for user in users]
+
+    job_id = crud_job.enqueue_job(
+        db_session, "record", {"n": 1}, organization_id=org.id, created_by=users[0].id
+    ).id
+    response = client.get(f"/jobs/{job_id}", headers=owner)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["kind"], body["status"], body["attempts"]) == ("record", "QUEUED", 0)
+    assert "payload" not in body
+    assert client.get(f"/jobs/{job_id}", headers=admin).status_code == 200
+    assert client.get(f"/jobs/{job_id}", headers=outsider).status_code == 403
+    assert client.get(f"/jobs/{uuid.uuid4()}", headers=owner).status_code == 404
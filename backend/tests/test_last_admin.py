@@ -0,0 +1,79 @@
+import threading
+import time
+import uuid
+import pytest
+from app.crud import crud_organization
+from app.crud.crud_organization import LastAdminError
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from tests.conftest import TEST_PASSWORD, TestingSessionLocal, count_statements, get_auth_headers, make_org
+
+
+def _org_with(client, db_session, admins, members):
+    """An organization with ``admins`` admins and ``members`` members; returns ids and admin headers"""
+    org, users = make_org(db_session, admins, members, prefix="last_admin")
+    db_session.commit()
+    headers = [get_auth_headers(client, user.username, TEST_PASSWORD) for user in users[:admins]]
+    return org.id, [user.id for user in users], headers
+
+
+def test_guard_does_not_load_the_membership(client, db_session):
+    counts = []
+    for members in (1, 30):
+        org_id, users, headers = _org_with(client, db_session, admins=1, members=members)
+        with count_statements(db_session.get_bind()) as statements:
+            response = client.put(
+                f"/organizations/{org_id}/members/{users[0]}/role", json={"role": "MEMBER"}, headers=headers[0]
+            )
+        assert response.status_code == 400
+        assert "last admin" in response.json()["detail"]
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+
+def test_admins_can_step_down_while_another_remains(client, db_session):
+    org_id, (first, second, member), headers = _org_with(client, db_session, admins=2, members=1)
+    response = client.put(f"/organizations/{org_id}/members/{second}/role", json={"role": "MEMBER"}, headers=headers[0])
+    assert response.status_code == 200
+    # The one admin left can neither be demoted nor removed, by themselves or anyone
+    assert client.delete(f"/organizations/{org_id}/members/{first}", headers=headers[0]).status_code == 400
+    with pytest.raises(LastAdminError):
+        crud_organization.update_user_role(db_session, first, org_id, UserOrganizationRole.MEMBER)
+    db_session.rollback()
+
+    response = client.put(f"/organizations/{org_id}/members/{member}/role", json={"role": "ADMIN"}, headers=headers[0])
+    assert response.status_code == 200
+    assert client.delete(f"/organizations/{org_id}/members/{first}", headers=headers[0]).status_code == 200
+    # Having left, they no longer administer the organization
+    assert client.delete(f"/organizations/{org_id}/members/{uuid.uuid4()}", headers=headers[0]).status_code == 403
+
+
+def test_concurrent_demotions_keep_an_admin(client, db_session):
+    """Two admins demoting each other at once: the second to commit is refused"""
+    org_id, (first, second), _ = _org_with(client, db_session, admins=2, members=0)
+    session = TestingSessionLocal()
+    other = TestingSessionLocal()
+    outcome = []
+
+    def demote_first():
+        try:
+            crud_organization.update_user_role(other, first, org_id, UserOrganizationRole.MEMBER)
+            outcome.append("demoted")
+        except LastAdminError:
+            other.rollback()
+            outcome.append("refused")
+
+    try:
+        # Both admins are still there when each request starts
+        assert crud_organization.lock_admin_count(session, org_id) == 2
+        racer = threading.Thread(target=demote_first)
+        racer.start()
+        time.sleep(0.3)
+        assert racer.is_alive(), "the second demotion should wait for the first"
+        crud_organization.update_user_role(session, second, org_id, UserOrganizationRole.MEMBER)
+        racer.join(5)
+        assert outcome == ["refused"]
+    finally:
+        session.close()
+        other.close()
+    roles = db_session.query(UserOrganization.role).filter(UserOrganization.organization_id == org_id).all()
+    assert sorted(role for role, in roles) == [UserOrganizationRole.ADMIN, UserOrganizationRole.MEMBER]
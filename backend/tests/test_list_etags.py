@@ -0,0 +1,93 @@
+import pytest
+import re
+import uuid
+from sqlalchemy import text
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.models.todo import Todo
+from app.core.security import hash_password
+from tests.conftest import count_statements, get_auth_headers
+
+
+@pytest.fixture
+def etag_org(client, db_session):
+    """An organization with one admin and a todo, plus a second organization"""
+    org = Organization(name=f"EtagOrg_{uuid.uuid4().hex[:8]}")
+    other = Organization(name=f"EtagOther_{uuid.uuid4().hex[:8]}")
+    db_session.add_all([org, other])
+    db_session.flush()
+    user = User(
+        username=f"etag_admin_{uuid.uuid4().hex[:8]}",
+        email=f"etag_admin_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("etag_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserOrganization(user_id=user.id, organization_id=org.id, role=UserOrganizationRole.ADMIN))
+    db_session.add(Todo(title="First", organization_id=org.id, created_by=user.id))
+    db_session.commit()
+    return org, other, user, get_auth_headers(client, user.username, "etag_password")
+
+
+def _etag(client, path, headers):
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    return response.headers["ETag"]
+
+
+def test_unchanged_list_answers_304_without_reading_todos(client, db_session, etag_org):
+    org, _, _, headers = etag_org
+    first = client.get(f"/todos/org/{org.id}", headers=headers)
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    with count_statements(db_session.get_bind()) as statements:
+        response = client.get(f"/todos/org/{org.id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert not [s for s in statements if re.search(r"\bFROM (todos|notes)\b", s)], statements
+
+    # Strong or listed forms of the same tag match too
+    strong = etag.removeprefix("W/")
+    assert client.get(
+        f"/todos/org/{org.id}", headers={**headers, "If-None-Match": f'"other", {strong}'}
+    ).status_code == 304
+
+
+def test_writes_change_the_etag(client, db_session, etag_org):
+    org, _, user, headers = etag_org
+    path = f"/todos/org/{org.id}"
+    seen = {_etag(client, path, headers)}
+
+    created = client.post(path, json={"title": "Second"}, headers=headers).json()
+    seen.add(_etag(client, path, headers))
+    client.put(f"/todos/org/{org.id}/{created['id']}", json={"completed": True}, headers=headers)
+    seen.add(_etag(client, path, headers))
+    client.patch(path, json={"completed": True}, headers=headers)
+    seen.add(_etag(client, path, headers))
+    client.post(f"/notes/org/{org.id}", json={"title": "A note"}, headers=headers)
+    seen.add(_etag(client, f"/notes/org/{org.id}", headers))
+    assert len(seen) == 5
+
+    stale = sorted(seen)[0]
+    assert client.get(path, headers={**headers, "If-None-Match": stale}).status_code == 200
+
+
+def test_other_organizations_do_not_change_the_etag(client, db_session, etag_org):
+    org, other, user, headers = etag_org
+    etag = _etag(client, f"/notes/org/{org.id}", headers)
+    db_session.add(Todo(title="Elsewhere", organization_id=other.id, created_by=user.id))
+    db_session.execute(text("UPDATE notes SET title = title WHERE organization_id = :id"), {"id": other.id})
+    db_session.commit()
+    assert _etag(client, f"/notes/org/{org.id}", headers) == etag
+
+
+def test_legacy_lists_have_etags(client, etag_org):
+    org, _, _, headers = etag_org
+    for path in ("/todos/", "/notes/"):
+        etag = _etag(client, path, headers)
+        assert client.get(path, headers={**headers, "If-None-Match": etag}).status_code == 304
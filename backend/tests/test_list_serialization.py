@@ -0,0 +1,77 @@
+import pytest
+import uuid
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.models.todo import Todo
+from app.models.note import Note
+from app.schemas.todo import TodoOut
+from app.schemas.note import NoteOut
+from app.core.security import hash_password
+from app.main import app
+from tests.conftest import get_auth_headers
+
+
+@pytest.fixture
+def listed_org(client, db_session):
+    """An organization with a few todos (some updated) and notes"""
+    org = Organization(name=f"ListOrg_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+    user = User(
+        username=f"list_member_{uuid.uuid4().hex[:8]}",
+        email=f"list_member_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("list_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserOrganization(user_id=user.id, organization_id=org.id, role=UserOrganizationRole.MEMBER))
+    todos = [
+        Todo(title=f"Todo {i}", description=None if i % 2 else "Tab\t \"quoted\" back\\slash\n",
+             completed=i == 0, organization_id=org.id, created_by=user.id)
+        for i in range(4)
+    ]
+    notes = [Note(title=f"Note {i}", content="Body", organization_id=org.id, created_by=user.id) for i in range(3)]
+    db_session.add_all(todos + notes)
+    db_session.commit()
+    todos[1].title = "Todo 1 renamed"
+    db_session.commit()
+    return org, get_auth_headers(client, user.username, "list_password")
+
+
+def _expected(db_session, model, schema, org):
+    """What the response model would have produced for the same rows"""
+    db_session.expire_all()
+    rows = (
+        db_session.query(model).filter(model.organization_id == org.id)
+        .order_by(model.created_at.desc(), model.id.desc())
+    )
+    return [schema.model_validate(row).model_dump(mode="json") for row in rows]
+
+
+def test_todo_list_matches_the_response_model(client, db_session, listed_org):
+    org, headers = listed_org
+    response = client.get(f"/todos/org/{org.id}", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == _expected(db_session, Todo, TodoOut, org)
+    # Timestamps are rendered exactly as pydantic renders them
+    assert all(todo["created_at"].endswith("Z") for todo in response.json())
+
+
+def test_note_list_matches_the_response_model(client, db_session, listed_org):
+    org, headers = listed_org
+    response = client.get(f"/notes/org/{org.id}", headers=headers)
+    assert response.json() == _expected(db_session, Note, NoteOut, org)
+
+
+def test_list_routes_keep_their_openapi_schema():
+    paths = app.openapi()["paths"]
+    for path, schema in [
+        ("/todos/org/{org_id}", "TodoOut"), ("/todos/", "TodoOut"),
+        ("/notes/org/{org_id}", "NoteOut"), ("/notes/", "NoteOut"),
+    ]:
+        content = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert content["type"] == "array"
+        assert content["items"] == {"$ref": f"#/components/schemas/{schema}"}
@@ -0,0 +1,126 @@
+import uuid
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization_stats import OrganizationStats
+from tests.conftest import TEST_PASSWORD, count_statements, get_auth_headers, make_org, make_user
+
+
+def _users(db_session, prefix, count):
+    return [make_user(db_session, prefix) for _ in range(count)]
+
+
+def _post(client, db_session, org_id, headers, operations):
+    with count_statements(db_session.get_bind()) as statements:
+        response = client.post(
+            f"/organizations/{org_id}/members/bulk", json={"operations": operations}, headers=headers
+        )
+    return response, len(statements)
+
+
+def _roles(db_session, org_id):
+    db_session.expire_all()
+    return {
+        uo.user_id: uo.role
+        for uo in db_session.query(UserOrganization).filter(UserOrganization.organization_id == org_id)
+    }
+
+
+def test_mixed_batch(client, db_session):
+    admin, leaver, stayer, promoted = _users(db_session, "batch_member", 4)
+    newcomer, new_admin, outsider = _users(db_session, "batch_new", 3)
+    org, _ = make_org(db_session, [admin], [leaver, stayer, promoted], prefix="batch")
+    make_org(db_session, [stayer], prefix="batch")
+    newcomer.is_active = False
+    db_session.commit()
+    org_id = org.id
+    headers = get_auth_headers(client, admin.username, TEST_PASSWORD)
+
+    response, _ = _post(client, db_session, org_id, headers, [
+        {"op": "add", "user_id": str(newcomer.id)},
+        {"op": "add", "user_id": str(new_admin.id), "role": "ADMIN"},
+        {"op": "remove", "user_id": str(leaver.id)},
+        {"op": "remove", "user_id": str(stayer.id)},
+        {"op": "role", "user_id": str(promoted.id), "role": "ADMIN"},
+        {"op": "add", "user_id": str(admin.id)},
+        {"op": "remove", "user_id": str(outsider.id)},
+        {"op": "role", "user_id": str(uuid.uuid4()), "role": "MEMBER"},
+    ])
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == [201, 201, 200, 200, 200, 409, 404, 404]
+    assert [r["index"] for r in results] == list(range(8))
+    assert results[1]["member"]["role"] == "ADMIN" and results[4]["member"]["role"] == "ADMIN"
+    # Removed members come back with the role they had
+    assert results[2]["member"]["role"] == "MEMBER"
+
+    assert _roles(db_session, org_id) == {
+        admin.id: UserOrganizationRole.ADMIN,
+        newcomer.id: UserOrganizationRole.MEMBER,
+        new_admin.id: UserOrganizationRole.ADMIN,
+        promoted.id: UserOrganizationRole.ADMIN,
+    }
+    # Added users are activated; removed ones only lose their account if it was their last organization
+    assert [user.is_active for user in (newcomer, leaver, stayer)] == [True, False, True]
+    stats = db_session.get(OrganizationStats, org_id)
+    assert (stats.members, stats.admins) == (4, 3)
+
+
+def test_statement_count_does_not_grow_with_the_batch(client, db_session):
+    admin, = _users(db_session, "batch_admin", 1)
+    counts = []
+    for size in (1, 12):
+        org, _ = make_org(db_session, [admin], prefix="batch")
+        members = _users(db_session, "batch_sized", size * 3)
+        for member in members[size:]:
+            db_session.add(UserOrganization(user_id=member.id, organization_id=org.id))
+        db_session.commit()
+        headers = get_auth_headers(client, admin.username, TEST_PASSWORD)
+        operations = (
+            [{"op": "add", "user_id": str(m.id)} for m in members[:size]]
+            + [{"op": "remove", "user_id": str(m.id)} for m in members[size:2 * size]]
+            + [{"op": "role", "user_id": str(m.id), "role": "ADMIN"} for m in members[2 * size:]]
+        )
+        response, count = _post(client, db_session, org.id, headers, operations)
+        assert response.status_code == 200
+        assert {r["status"] for r in response.json()} == {200, 201}
+        counts.append(count)
+    assert counts[0] == counts[1]
+
+
+def test_batch_cannot_leave_the_organization_without_an_admin(client, db_session):
+    admin, member, newcomer = _users(db_session, "batch_last", 3)
+    org, _ = make_org(db_session, [admin], [member], prefix="batch")
+    db_session.commit()
+    org_id = org.id
+    headers = get_auth_headers(client, admin.username, TEST_PASSWORD)
+
+    response, _ = _post(client, db_session, org_id, headers, [
+        {"op": "add", "user_id": str(newcomer.id)},
+        {"op": "role", "user_id": str(admin.id), "role": "MEMBER"},
+    ])
+    assert response.status_code == 400
+    assert "last admin" in response.json()["detail"]
+    # Refused as a whole
+    assert _roles(db_session, org_id) == {admin.id: UserOrganizationRole.ADMIN, member.id: UserOrganizationRole.MEMBER}
+
+    # Handing over in the same batch is fine
+    response, _ = _post(client, db_session, org_id, headers, [
+        {"op": "role", "user_id": str(member.id), "role": "ADMIN"},
+        {"op": "remove", "user_id": str(admin.id)},
+    ])
+    assert response.status_code == 200
+    assert _roles(db_session, org_id) == {member.id: UserOrganizationRole.ADMIN}
+
+
+def test_batch_validation_and_permissions(client, db_session):
+    admin, member = _users(db_session, "batch_perm", 2)
+    org, _ = make_org(db_session, [admin], [member], prefix="batch")
+    db_session.commit()
+    org_id = org.id
+    operations = [{"op": "remove", "user_id": str(member.id)}]
+    member_headers = get_auth_headers(client, member.username, TEST_PASSWORD)
+    assert _post(client, db_session, org_id, member_headers, operations)[0].status_code == 403
+
+    headers = get_auth_headers(client, admin.username, TEST_PASSWORD)
+    assert _post(client, db_session, org_id, headers, operations * 2)[0].status_code == 422
+    assert _post(client, db_session, org_id, headers, [])[0].status_code == 422
+    assert _post(client, db_session, org_id, headers, [{"op": "promote", "user_id": str(member.id)}])[0].status_code == 422
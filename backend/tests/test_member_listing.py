@@ -0,0 +1,178 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.core.security import hash_password
+from app.crud import crud_read
+from app.schemas.organization import MemberFilter, MemberSort
+from tests.conftest import get_auth_headers
+
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def member_org(client, db_session):
+    """An organization of six members with varied roles, statuses and join times"""
+    org = Organization(name=f"MemberOrg_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+    tag = uuid.uuid4().hex[:8]
+    members = [
+        # (username, role, is_active, minutes after BASE_TIME)
+        ("dave", UserOrganizationRole.ADMIN, True, 0),
+        ("alice", UserOrganizationRole.MEMBER, True, 1),
+        ("frank", UserOrganizationRole.MEMBER, False, 2),
+        ("carol", UserOrganizationRole.ADMIN, True, 3),
+        ("erin", UserOrganizationRole.MEMBER, True, 3),
+        ("bob", UserOrganizationRole.MEMBER, False, 5),
+    ]
+    users = {}
+    for name, role, is_active, minute in members:
+        user = User(
+            username=f"{name}_{tag}",
+            email=f"{name}_{tag}@example.com",
+            hashed_password=hash_password("member_password"),
+            is_active=is_active
+        )
+        db_session.add(user)
+        db_session.flush()
+        db_session.add(UserOrganization(
+            user_id=user.id, organization_id=org.id, role=role, joined_at=BASE_TIME + timedelta(minutes=minute)
+        ))
+        users[name] = user
+    db_session.commit()
+    headers = get_auth_headers(client, users["dave"].username, "member_password")
+    return org.id, {name: user.username for name, user in users.items()}, headers
+
+
+def _pages(client, org_id, headers, **params):
+    """Every member, following X-Next-Cursor; returns the names and the last response"""
+    names, cursor = [], None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"/organizations/{org_id}/members", params=query, headers=headers)
+        assert response.status_code == 200
+        names += [member["username"].split("_")[0] for member in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return names, response
+
+
+def test_members_page_in_join_order_and_by_username(client, member_org):
+    org_id, _, headers = member_org
+    names, response = _pages(client, org_id, headers, limit=2)
+    # carol and erin joined at the same time; ties go by user id
+    assert names[:3] == ["dave", "alice", "frank"] and set(names[3:5]) == {"carol", "erin"}
+    assert names[5] == "bob"
+    assert response.headers["X-Total-Count"] == "6"
+
+    assert _pages(client, org_id, headers, limit=4, sort="-joined_at")[0] == names[::-1]
+    assert _pages(client, org_id, headers, limit=2, sort="username")[0] == sorted(names)
+    assert _pages(client, org_id, headers, limit=5, sort="-username")[0] == sorted(names, reverse=True)
+
+
+def test_member_filters_and_counts(client, member_org):
+    org_id, _, headers = member_org
+    names, response = _pages(client, org_id, headers, limit=1, role="ADMIN")
+    assert names == ["dave", "carol"] and response.headers["X-Total-Count"] == "2"
+    names, response = _pages(client, org_id, headers, role="MEMBER", sort="username")
+    assert names == ["alice", "bob", "erin", "frank"] and response.headers["X-Total-Count"] == "4"
+
+    # Counters only cover roles; other filters come without a total
+    names, response = _pages(client, org_id, headers, is_active="false")
+    assert names == ["frank", "bob"] and "X-Total-Count" not in response.headers
+    names, _ = _pages(client, org_id, headers, limit=1, is_active="true", role="MEMBER", sort="-username")
+    assert names == ["erin", "alice"]
+    names, _ = _pages(client, org_id, headers, joined_after=(BASE_TIME + timedelta(minutes=1)).isoformat(),
+                      joined_before=(BASE_TIME + timedelta(minutes=5)).isoformat(), sort="username")
+    assert names == ["alice", "carol", "erin", "frank"]
+
+
+def test_member_listing_rejects_bad_requests(client, db_session, member_org):
+    org_id, _, headers = member_org
+    first = client.get(f"/organizations/{org_id}/members", params={"limit": 1}, headers=headers)
+    cursor = first.headers["X-Next-Cursor"]
+    # A cursor is tied to the sort it was issued for
+    response = client.get(f"/organizations/{org_id}/members", params={"cursor": cursor, "sort": "username"}, headers=headers)
+    assert response.status_code == 400
+    assert client.get(f"/organizations/{org_id}/members", params={"sort": "email"}, headers=headers).status_code == 422
+
+    other = Organization(name=f"MemberOther_{uuid.uuid4().hex[:8]}")
+    db_session.add(other)
+    db_session.commit()
+    assert client.get(f"/organizations/{other.id}/members", headers=headers).status_code == 403
+
+
+def test_organization_details_list_the_first_members(client, member_org):
+    org_id, _, headers = member_org
+    org = client.get(f"/organizations/{org_id}", params={"member_limit": 2}, headers=headers).json()
+    assert [member["username"].split("_")[0] for member in org["members"]] == ["dave", "alice"]
+    assert org["stats"]["members"] == 6
+
+
+@pytest.fixture
+def large_org(db_session):
+    """An organization of 5k members, a tenth of them admins, analyzed, inside the test transaction"""
+    org = Organization(name=f"PlanMembers_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+    prefix = f"plan_member_{uuid.uuid4().hex[:8]}_"
+    db_session.execute(text("""
+        INSERT INTO users (id, username, email, hashed_password, is_active)
+        SELECT gen_random_uuid(), :prefix || g, :prefix || g || '@example.com', 'x', g % 20 <> 0
+        FROM generate_series(1, 5000) g
+    """), {"prefix": prefix})
+    db_session.execute(text("""
+        INSERT INTO user_organizations (id, user_id, organization_id, role, joined_at)
+        SELECT gen_random_uuid(), u.id, :org_id,
+               CASE WHEN g % 10 = 0 THEN 'ADMIN' ELSE 'MEMBER' END::userorganizationrole,
+               now() - g * interval '1 minute'
+        FROM users u, CAST(substr(u.username, length(:prefix) + 1) AS int) AS g
+        WHERE u.username LIKE :prefix || '%'
+    """), {"org_id": org.id, "prefix": prefix})
+    db_session.execute(text("ANALYZE users"))
+    db_session.execute(text("ANALYZE user_organizations"))
+    return org
+
+
+def _plan(db_session, query):
+    compiled = query.compile(dialect=postgresql.dialect())
+    params = {
+        key: str(value) if isinstance(value, uuid.UUID) else value
+        for key, value in compiled.params.items()
+    }
+    rows = db_session.connection().exec_driver_sql("EXPLAIN " + str(compiled), params)
+    return "\n".join(row[0] for row in rows)
+
+
+PLAN_CASES = [
+    ("joined", MemberFilter(), MemberSort.JOINED, "ix_user_organizations_org_joined_at_user_id"),
+    ("joined desc", MemberFilter(), MemberSort.JOINED_DESC, "ix_user_organizations_org_joined_at_user_id"),
+    ("admins", MemberFilter(role=UserOrganizationRole.ADMIN), MemberSort.JOINED,
+     "ix_user_organizations_org_role_joined_at_user_id"),
+    ("joined range", MemberFilter(joined_after=datetime.now(timezone.utc) - timedelta(hours=2)), MemberSort.JOINED,
+     "ix_user_organizations_org_joined_at_user_id"),
+]
+
+
+@pytest.mark.parametrize("name,filters,sort,index", PLAN_CASES, ids=[case[0] for case in PLAN_CASES])
+def test_member_pages_use_their_index(db_session, large_org, name, filters, sort, index):
+    first, cursor = crud_read.list_member_page(db_session, large_org.id, 100, filters=filters, sort=sort)
+    assert len(first) == 100 and cursor
+    # The next page starts where the index left off instead of skipping rows
+    plan = _plan(db_session, crud_read.member_page_statement(large_org.id, 100, cursor, filters, sort))
+    assert index in plan, plan
+    assert "Seq Scan on user_organizations" not in plan, plan
+    assert "Sort" not in plan, plan
+
+
+def test_member_counts_come_from_the_counters(db_session, large_org):
+    assert crud_read.count_members(db_session, large_org.id) == 5000
+    assert crud_read.count_members(db_session, large_org.id, MemberFilter(role=UserOrganizationRole.ADMIN)) == 500
+    assert crud_read.count_members(db_session, large_org.id, MemberFilter(role=UserOrganizationRole.MEMBER)) == 4500
+    assert crud_read.count_members(db_session, large_org.id, MemberFilter(is_active=True)) is None
@@ -0,0 +1,130 @@
+import uuid
+
+import pytest
+from alembic import command
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+
+from app.db.init_db import apply_baseline, get_alembic_config, init_db, load_baseline
+from tests.conftest import engine as test_engine
+
+
+COLUMNS_SQL = """
+    SELECT table_name, column_name, udt_name, is_nullable, column_default,
+           is_generated, generation_expression
+    FROM information_schema.columns
+    WHERE table_schema = 'public'
+    ORDER BY table_name, ordinal_position
+"""
+
+CONSTRAINTS_SQL = """
+    SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+    FROM pg_constraint
+    WHERE connamespace = 'public'::regnamespace
+    ORDER BY 1, 2
+"""
+
+INDEXES_SQL = """
+    SELECT tablename, indexname, indexdef
+    FROM pg_indexes
+    WHERE schemaname = 'public'
+    ORDER BY 1, 2
+"""
+
+TRIGGERS_SQL = """
+    SELECT tgrelid::regclass::text, tgname, pg_get_triggerdef(oid)
+    FROM pg_trigger
+    WHERE NOT tgisinternal
+    ORDER BY 1, 2
+"""
+
+FUNCTIONS_SQL = """
+    SELECT proname, pg_get_functiondef(oid)
+    FROM pg_proc
+    WHERE pronamespace = 'public'::regnamespace AND prokind = 'f'
+    ORDER BY 1
+"""
+
+ENUMS_SQL = """
+    SELECT t.typname, array_agg(e.enumlabel ORDER BY e.enumsortorder)
+    FROM pg_type t JOIN pg_enum e ON e.enumtypid = t.oid
+    WHERE t.typnamespace = 'public'::regnamespace
+    GROUP BY t.typname
+"""
+
+
+def _schema_snapshot(connection):
+    """Everything about the public schema that a migration can change"""
+    columns = connection.execute(text(COLUMNS_SQL)).all()
+    used_types = {row.udt_name for row in columns}
+    return {
+        "columns": [tuple(row) for row in columns],
+        "constraints": [tuple(row) for row in connection.execute(text(CONSTRAINTS_SQL))],
+        "indexes": [tuple(row) for row in connection.execute(text(INDEXES_SQL))],
+        "triggers": [tuple(row) for row in connection.execute(text(TRIGGERS_SQL))],
+        "functions": [tuple(row) for row in connection.execute(text(FUNCTIONS_SQL))],
+        # The chain leaves the old global "role" type behind; only compare types in use
+        "enums": sorted(
+            (name, tuple(labels))
+            for name, labels in connection.execute(text(ENUMS_SQL))
+            if name in used_types
+        ),
+        "extensions": sorted(connection.execute(text("SELECT extname FROM pg_extension")).scalars()),
+        "version": connection.execute(text("SELECT version_num FROM alembic_version")).scalar_one(),
+    }
+
+
+@pytest.fixture
+def scratch_engines():
+    """Two throwaway databases on the test server"""
+    admin = create_engine(test_engine.url.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    names = [f"migration_check_{uuid.uuid4().hex[:8]}" for _ in range(2)]
+    with admin.connect() as connection:
+        for name in names:
+            connection.execute(text(f'CREATE DATABASE "{name}"'))
+    engines = [create_engine(test_engine.url.set(database=name)) for name in names]
+    yield engines
+    for scratch in engines:
+        scratch.dispose()
+    with admin.connect() as connection:
+        for name in names:
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{name}"'))
+    admin.dispose()
+
+
+def test_baseline_matches_full_migration_chain(scratch_engines):
+    chain_engine, baseline_engine = scratch_engines
+
+    with chain_engine.begin() as connection:
+        command.upgrade(get_alembic_config(connection), "head")
+    with baseline_engine.begin() as connection:
+        init_db(connection)
+
+    with chain_engine.connect() as chain, baseline_engine.connect() as baseline:
+        chain_schema = _schema_snapshot(chain)
+        baseline_schema = _schema_snapshot(baseline)
+
+    for key in chain_schema:
+        assert baseline_schema[key] == chain_schema[key], f"baseline drifted from chain: {key}"
+
+
+def test_baseline_stamps_revision_in_chain(scratch_engines):
+    scratch = scratch_engines[0]
+
+    with scratch.begin() as connection:
+        stamped = apply_baseline(connection)
+        version = connection.execute(text("SELECT version_num FROM alembic_version")).scalar_one()
+
+    assert stamped == load_baseline().revision == version
+    assert ScriptDirectory.from_config(get_alembic_config()).get_revision(stamped) is not None
+
+
+def test_init_db_is_idempotent(scratch_engines):
+    scratch = scratch_engines[0]
+    with scratch.begin() as connection:
+        init_db(connection)
+    with scratch.begin() as connection:
+        init_db(connection)
+        head = connection.execute(text("SELECT version_num FROM alembic_version")).scalar_one()
+
+    assert head == ScriptDirectory.from_config(get_alembic_config()).get_current_head()
@@ -0,0 +1,140 @@
+import threading
+import time
+import pytest
+from app.core.cache import StaleWhileRevalidateCache
+from app.core.events import RESET_EVENT
+from app.crud import crud_organization
+from app.models.organization import Organization
+from app.models.todo import Todo
+from tests.conftest import TEST_PASSWORD, get_auth_headers, make_org, make_user
+
+
+class Loader:
+    """Counts loads and returns a new value each time"""
+    def __init__(self, tags=("tag",), gate=None):
+        self.calls, self.tags, self.gate = 0, tags, gate
+
+    def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        return f"value {self.calls}", self.tags
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_fresh_values_are_served_without_loading():
+    cache = StaleWhileRevalidateCache(soft_ttl=60, hard_ttl=300, max_entries=10)
+    load = Loader()
+    assert cache.get("a", load) == "value 1"
+    assert cache.get("a", load) == "value 1"
+    assert load.calls == 1
+
+
+def test_stale_values_are_served_while_refreshing():
+    cache = StaleWhileRevalidateCache(soft_ttl=0, hard_ttl=300, max_entries=10)
+    gate = threading.Event()
+    load = Loader()
+    assert cache.get("a", load) == "value 1"
+
+    load.gate = gate
+    # Stale: served at once, one background reload however many requests come in
+    assert cache.get("a", load) == "value 1"
+    assert cache.get("a", load) == "value 1"
+    gate.set()
+    _wait_for(lambda: cache.get("a", Loader()) == "value 2")
+    assert load.calls == 2
+
+
+def test_expired_values_and_misses_load_synchronously():
+    cache = StaleWhileRevalidateCache(soft_ttl=0, hard_ttl=0, max_entries=1)
+    load = Loader()
+    assert cache.get("a", load) == "value 1"
+    assert cache.get("a", load) == "value 2"
+    # Least recently used entries go first
+    cache.get("b", load)
+    assert cache.get("a", load) == "value 4"
+
+
+def test_invalidation_by_tag():
+    cache = StaleWhileRevalidateCache(soft_ttl=60, hard_ttl=300, max_entries=10)
+    cache.get("a", Loader(tags=("org-1",)))
+    cache.get("b", Loader(tags=("org-2",)))
+    cache.invalidate(["org-1"])
+    other = Loader()
+    assert cache.get("a", other) == "value 1"
+    assert cache.get("b", other) == "value 1"
+    assert other.calls == 1
+
+
+def test_invalidation_discards_running_refreshes():
+    cache = StaleWhileRevalidateCache(soft_ttl=0, hard_ttl=300, max_entries=10)
+    cache.get("a", Loader())
+    gate = threading.Event()
+    slow = Loader(gate=gate)
+    assert cache.get("a", slow) == "value 1"
+    # The refresh read the data before this invalidation, so it is not stored
+    cache.invalidate(["unrelated"])
+    gate.set()
+    _wait_for(lambda: slow.calls == 1)
+    time.sleep(0.1)
+    assert cache.get("a", Loader()) == "value 1"
+
+
+@pytest.fixture
+def my_org(client, db_session):
+    """An organization with an admin, and a user outside it"""
+    org, (admin,) = make_org(db_session, prefix="cache")
+    outsider = make_user(db_session, "cache_outsider")
+    db_session.commit()
+    return (
+        org.id, admin.id, outsider.id,
+        get_auth_headers(client, admin.username, TEST_PASSWORD),
+        get_auth_headers(client, outsider.username, TEST_PASSWORD),
+    )
+
+
+def test_my_organizations_is_cached_and_invalidated(client, db_session, my_org):
+    org_id, admin_id, outsider_id, headers, outsider_headers = my_org
+    first = client.get("/organizations/my", headers=headers)
+    assert first.status_code == 200
+    assert first.json()[0]["stats"]["open_todos"] == 0
+
+    # Counters may lag within the TTL...
+    db_session.add(Todo(title="Uncounted", organization_id=org_id, created_by=admin_id))
+    db_session.commit()
+    assert client.get("/organizations/my", headers=headers).content == first.content
+
+    # ...but a rename through the API shows at once
+    client.put(f"/organizations/{org_id}", json={"name": "Renamed"}, headers=headers)
+    mine = client.get("/organizations/my", headers=headers).json()
+    assert mine[0]["name"] == "Renamed" and mine[0]["stats"]["open_todos"] == 1
+
+    # So does a new membership, for both the new member and the existing ones
+    assert client.get("/organizations/my", headers=outsider_headers).json() == []
+    assert client.post(f"/organizations/{org_id}/members/{outsider_id}", headers=headers).status_code == 200
+    assert [o["id"] for o in client.get("/organizations/my", headers=outsider_headers).json()] == [str(org_id)]
+    assert len(client.get("/organizations/my", headers=headers).json()[0]["members"]) == 2
+
+
+def test_other_workers_events_invalidate(client, db_session, my_org):
+    org_id, _, _, headers, _ = my_org
+    client.get("/organizations/my", headers=headers)
+    db_session.query(Organization).filter(Organization.id == org_id).update({"name": "Elsewhere"})
+    db_session.commit()
+    assert client.get("/organizations/my", headers=headers).json()[0]["name"] != "Elsewhere"
+
+    crud_organization.invalidate_on_event(
+        {"org_id": str(org_id), "resource": "organization", "action": "updated", "ids": [str(org_id)]}
+    )
+    assert client.get("/organizations/my", headers=headers).json()[0]["name"] == "Elsewhere"
+
+    db_session.query(Organization).filter(Organization.id == org_id).update({"name": "Reset"})
+    db_session.commit()
+    crud_organization.invalidate_on_event(RESET_EVENT)
+    assert client.get("/organizations/my", headers=headers).json()[0]["name"] == "Reset"
@@ -0,0 +1,96 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import text
+from app.core.config import settings
+from app.crud import crud_json, crud_organization
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.core.security import hash_password
+from tests.conftest import count_statements, get_auth_headers, make_user
+
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _pydantic_json(db_session, user_id, include_members=True, member_limit=settings.DEFAULT_PAGE_SIZE):
+    organizations = crud_organization.get_user_organizations_with_members(
+        db_session, user_id, include_members, member_limit
+    )
+    adapter = crud_organization._my_organizations_adapter
+    return adapter.dump_json(adapter.validate_python(organizations))
+
+
+@pytest.fixture
+def awkward_user(client, db_session):
+    """A user in organizations whose names, emails and timestamps need care to encode"""
+    tag = uuid.uuid4().hex[:8]
+    user = User(
+        username=f'json "quoted" \\ user\n{tag}',
+        email=f"json_{tag}@example.com",
+        hashed_password=hash_password("json_password"),
+        is_active=True,
+        created_at=BASE + timedelta(microseconds=400000),
+    )
+    other = User(
+        username=f"json\t\x01\x7f/other_{tag}",
+        email=f"json_other_{tag}@example.com",
+        hashed_password=hash_password("json_password"),
+        is_active=False,
+        created_at=BASE + timedelta(seconds=1, microseconds=7),
+    )
+    plain = Organization(name=f"JsonPlain_{tag}", created_at=BASE)
+    odd = Organization(name=f"Json </script> \"{tag}\"\r", created_at=BASE + timedelta(microseconds=123456))
+    db_session.add_all([user, other, plain, odd])
+    db_session.flush()
+    db_session.add_all([
+        UserOrganization(user_id=user.id, organization_id=odd.id, role=UserOrganizationRole.ADMIN, joined_at=BASE),
+        UserOrganization(user_id=other.id, organization_id=odd.id, joined_at=BASE + timedelta(minutes=1)),
+        UserOrganization(user_id=user.id, organization_id=plain.id, joined_at=BASE + timedelta(days=1)),
+    ])
+    db_session.commit()
+    return user.id, plain.id, odd.id
+
+
+def test_database_json_matches_the_response_model(db_session, awkward_user):
+    user_id, plain_id, odd_id = awkward_user
+    body, org_ids = crud_json.my_organizations_json(db_session, user_id, True, settings.DEFAULT_PAGE_SIZE)
+    assert body == _pydantic_json(db_session, user_id)
+    assert org_ids == [odd_id, plain_id]
+
+    body, _ = crud_json.my_organizations_json(db_session, user_id, True, 1)
+    assert body == _pydantic_json(db_session, user_id, member_limit=1)
+    body, _ = crud_json.my_organizations_json(db_session, user_id, False, 1)
+    assert body == _pydantic_json(db_session, user_id, include_members=False)
+
+    # An organization whose counters have not been built yet has no stats
+    db_session.execute(text("DELETE FROM organization_stats WHERE organization_id = :id"), {"id": plain_id})
+    body, _ = crud_json.my_organizations_json(db_session, user_id, True, settings.DEFAULT_PAGE_SIZE)
+    assert b'"stats":null' in body
+    assert body == _pydantic_json(db_session, user_id)
+    db_session.rollback()
+
+
+def test_database_json_for_a_user_without_organizations(db_session):
+    user = make_user(db_session, "json_alone")
+    db_session.commit()
+    assert crud_json.my_organizations_json(db_session, user.id, True, 10) == (b"[]", [])
+    assert _pydantic_json(db_session, user.id) == b"[]"
+
+
+def test_endpoint_renders_in_one_statement(client, db_session, awkward_user, monkeypatch):
+    user_id, *_ = awkward_user
+    user = db_session.get(User, user_id)
+    headers = get_auth_headers(client, user.username, "json_password")
+    crud_organization.my_organizations_cache.clear()
+
+    with count_statements(db_session.get_bind()) as statements:
+        response = client.get("/organizations/my", params={"member_limit": 1}, headers=headers)
+    assert response.status_code == 200
+    assert len([s for s in statements if "string_agg" in s]) == 1
+    assert not [s for s in statements if "LATERAL" in s.upper()]
+
+    monkeypatch.setattr(settings, "MY_ORGANIZATIONS_RENDER_IN_DB", False)
+    crud_organization.my_organizations_cache.clear()
+    assert client.get("/organizations/my", params={"member_limit": 1}, headers=headers).content == response.content
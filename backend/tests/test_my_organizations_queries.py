@@ -0,0 +1,57 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from app.core.config import settings
+from tests.conftest import TEST_PASSWORD, count_statements, get_auth_headers, make_org, make_user
+
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _seed(client, db_session, orgs, members):
+    """A user who belongs to ``orgs`` organizations of ``members`` other members each"""
+    user = make_user(db_session, "my_orgs")
+    for i in range(orgs):
+        make_org(db_session, [user], members, prefix="my_orgs", joined_at=BASE + timedelta(days=i))
+    db_session.commit()
+    return user, get_auth_headers(client, user.username, TEST_PASSWORD)
+
+
+def _get(client, db_session, headers, **params):
+    with count_statements(db_session.get_bind()) as statements:
+        response = client.get("/organizations/my", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.json(), len(statements)
+
+
+def test_query_count_does_not_grow_with_orgs_or_members(client, db_session):
+    _, small_headers = _seed(client, db_session, orgs=1, members=1)
+    _, large_headers = _seed(client, db_session, orgs=4, members=6)
+
+    small, small_count = _get(client, db_session, small_headers)
+    large, large_count = _get(client, db_session, large_headers)
+    assert [len(org["members"]) for org in small] == [2]
+    assert [len(org["members"]) for org in large] == [7] * 4
+    assert small_count == large_count
+
+
+@pytest.mark.parametrize("render_in_db", [True, False])
+def test_member_limit_and_include_members(client, db_session, monkeypatch, render_in_db):
+    monkeypatch.setattr(settings, "MY_ORGANIZATIONS_RENDER_IN_DB", render_in_db)
+    user, headers = _seed(client, db_session, orgs=2, members=4)
+    orgs, _ = _get(client, db_session, headers, member_limit=3)
+    for org in orgs:
+        assert org["user_role"] == "ADMIN"
+        # Oldest members first; the counters still have the full count
+        assert org["members"][0]["id"] == str(user.id)
+        assert len(org["members"]) == 3
+        assert org["stats"]["members"] == 5
+
+    with_members, with_count = _get(client, db_session, headers, member_limit=4)
+    without, without_count = _get(client, db_session, headers, include_members="false")
+    assert [org["members"] for org in without] == [[], []]
+    assert [org["id"] for org in without] == [org["id"] for org in with_members]
+    # Postgres renders both in one statement; in Python the members query is skipped
+    assert without_count == with_count - (0 if render_in_db else 1)
+
+    response = client.get("/organizations/my", params={"member_limit": 0}, headers=headers)
+    assert response.status_code == 422
@@ -0,0 +1,135 @@
+import pytest
+import uuid
+from sqlalchemy import text
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.models.note import Note
+from app.core.security import hash_password
+from tests.conftest import get_auth_headers
+
+
+def _member(db_session, org):
+    user = User(
+        username=f"search_member_{uuid.uuid4().hex[:8]}",
+        email=f"search_member_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("member_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserOrganization(
+        user_id=user.id, organization_id=org.id, role=UserOrganizationRole.MEMBER
+    ))
+    return user
+
+
+@pytest.fixture
+def search_orgs(db_session):
+    """Two organizations whose notes share vocabulary"""
+    org = Organization(name=f"SearchOrg_{uuid.uuid4().hex[:8]}")
+    other = Organization(name=f"SearchOther_{uuid.uuid4().hex[:8]}")
+    db_session.add_all([org, other])
+    db_session.flush()
+    user = _member(db_session, org)
+    other_user = _member(db_session, other)
+
+    notes = [
+        (org, user, "Quarterly budget review", "Numbers for the finance team."),
+        (org, user, "Team offsite", "Agenda includes a short budget discussion near the end."),
+        (org, user, "Grocery list", "Apples, bread and cheese."),
+        (other, other_user, "Budget for the other org", "Should never leak across organizations."),
+    ]
+    for owner, creator, title, content in notes:
+        db_session.add(Note(title=title, content=content, organization_id=owner.id, created_by=creator.id))
+    for i in range(5):
+        db_session.add(Note(
+            title=f"Meeting {i}", content="Recurring standup notes", organization_id=org.id, created_by=user.id
+        ))
+    db_session.commit()
+    return org, user
+
+
+def _search(client, org, user, **params):
+    headers = get_auth_headers(client, user.username, "member_password")
+    return client.get(f"/notes/org/{org.id}/search", params=params, headers=headers)
+
+
+def test_title_matches_rank_above_content_matches(client, search_orgs):
+    org, user = search_orgs
+    response = _search(client, org, user, q="budgets")
+    assert response.status_code == 200
+    hits = response.json()
+    assert [hit["title"] for hit in hits] == ["Quarterly budget review", "Team offsite"]
+    assert hits[0]["rank"] > hits[1]["rank"]
+
+
+def test_hits_are_highlighted(client, search_orgs):
+    org, user = search_orgs
+    hit = _search(client, org, user, q="budget").json()[0]
+    assert "<mark>budget</mark>" in hit["title_highlight"]
+
+    hit = _search(client, org, user, q="agenda").json()[0]
+    assert "<mark>Agenda</mark>" in hit["content_highlight"]
+
+
+def test_highlights_escape_note_text(client, db_session, search_orgs):
+    org, user = search_orgs
+    db_session.add(Note(
+        title="<b>Escaped</b> budget & co",
+        content="Run <script>alert(1)</script> before the escaped <mark>review</mark>",
+        organization_id=org.id, created_by=user.id,
+    ))
+    db_session.commit()
+    hit = _search(client, org, user, q="escaped").json()[0]
+    assert "<mark>Escaped</mark>&lt;/b&gt;" in hit["title_highlight"]
+    assert "alert(1)&lt;/script&gt;" in hit["content_highlight"]
+    assert "&lt;mark&gt;review" in hit["content_highlight"]
+    # <mark> is the only markup left
+    for highlight in (hit["title_highlight"], hit["content_highlight"]):
+        assert "<" not in highlight.replace("<mark>", "").replace("</mark>", "")
+
+
+def test_search_is_scoped_to_organization(client, search_orgs):
+    org, user = search_orgs
+    titles = [hit["title"] for hit in _search(client, org, user, q="budget").json()]
+    assert "Budget for the other org" not in titles
+
+
+def test_search_paginates_with_offset(client, search_orgs):
+    org, user = search_orgs
+    first = _search(client, org, user, q="standup", limit=3)
+    assert len(first.json()) == 3
+    next_offset = first.headers["X-Next-Offset"]
+
+    second = _search(client, org, user, q="standup", limit=3, offset=next_offset)
+    assert len(second.json()) == 2
+    assert "X-Next-Offset" not in second.headers
+    ids = {hit["id"] for hit in first.json()} | {hit["id"] for hit in second.json()}
+    assert len(ids) == 5
+
+
+def test_search_requires_membership(client, search_orgs, db_session):
+    org, _ = search_orgs
+    outsider_org = Organization(name=f"SearchOutsider_{uuid.uuid4().hex[:8]}")
+    db_session.add(outsider_org)
+    db_session.flush()
+    outsider = _member(db_session, outsider_org)
+    db_session.commit()
+    assert _search(client, org, outsider, q="budget").status_code == 403
+
+
+def test_search_uses_gin_index(db_session, search_orgs):
+    org, _ = search_orgs
+    db_session.execute(text("""
+        INSERT INTO notes (id, title, content, organization_id)
+        SELECT gen_random_uuid(), 'Note ' || g, md5(g::text) || ' ' || md5((g * 7)::text), :org_id
+        FROM generate_series(1, 30000) g
+    """), {"org_id": org.id})
+    db_session.execute(text("ANALYZE notes"))
+    plan = "\n".join(db_session.execute(text("""
+        EXPLAIN SELECT id FROM notes
+        WHERE organization_id = :org_id
+          AND search_vector @@ websearch_to_tsquery('english', 'budget')
+    """), {"org_id": org.id}).scalars())
+    assert "ix_notes_search_vector" in plan, plan
@@ -0,0 +1,219 @@
+import pytest
+from sqlalchemy import text
+from app.core.config import settings
+from app.crud import crud_deletion, crud_job
+from app.models.organization import Organization
+from app.models.organization_deletion import DeletionStatus, OrganizationDeletion
+from app.models.job import Job, JobStatus
+from app.models.note import Note
+from app.models.todo import Todo
+from app.worker import Worker
+from tests.conftest import TEST_PASSWORD, count_statements, get_auth_headers, make_org
+
+
+@pytest.fixture
+def doomed_org(client, db_session):
+    """An organization of an admin and two members, with 5 todos (one deleted) and 3 notes"""
+    org, users = make_org(db_session, admins=1, members=2, prefix="doomed")
+    for i in range(6):
+        db_session.add(Todo(title=f"Doomed {i}", organization_id=org.id, created_by=users[0].id))
+    for i in range(3):
+        db_session.add(Note(title=f"Doomed {i}", content="x", organization_id=org.id, created_by=users[0].id))
+    db_session.flush()
+    # Leaves a sync tombstone for the deletion to clear
+    db_session.execute(text("DELETE FROM todos WHERE title = 'Doomed 5' AND organization_id = :id"), {"id": org.id})
+    db_session.commit()
+    headers = [get_auth_headers(client, user.username, TEST_PASSWORD) for user in users]
+    return org.id, [user.id for user in users], headers
+
+
+def _remaining(db_session, org_id):
+    return {
+        table: db_session.execute(
+            text(f"SELECT count(*) FROM {table} WHERE organization_id = :id"), {"id": org_id}
+        ).scalar()
+        for table in ("user_organizations", "todos", "notes", "sync_tombstones", "organization_stats")
+    }
+
+
+def test_deletion_is_accepted_then_done_in_batches(client, db_session, doomed_org, monkeypatch):
+    org_id, (admin, member, _), headers = doomed_org
+    monkeypatch.setattr(settings, "ORG_DELETE_BATCH_SIZE", 2)
+    assert client.get(f"/organizations/{org_id}/deletion", headers=headers[0]).status_code == 404
+    assert client.delete(f"/organizations/{org_id}", headers=headers[1]).status_code == 403
+
+    response = client.delete(f"/organizations/{org_id}", headers=headers[0])
+    assert response.status_code == 202
+    assert response.headers["Location"] == f"/organizations/{org_id}/deletion"
+    accepted = response.json()
+    assert accepted["status"] == "PENDING"
+    assert (accepted["members_total"], accepted["todos_total"], accepted["notes_total"]) == (3, 5, 3)
+    # Nothing is deleted until a worker runs the job
+    assert client.get(f"/organizations/{org_id}", headers=headers[0]).status_code == 200
+    job_id = response.headers["X-Job-Id"]
+    assert client.get(f"/jobs/{job_id}", headers=headers[0]).json()["status"] == "QUEUED"
+
+    engine = db_session.get_bind()
+    with count_statements(engine) as statements:
+        Worker(engine).run_pending()
+    # 5 todos two at a time: three short transactions rather than one long one
+    assert len([s for s in statements if "DELETE FROM todos" in s]) == 3
+    db_session.expire_all()
+    job = client.get(f"/jobs/{job_id}", headers=headers[0]).json()
+    assert job["status"] == "DONE" and job["result"]["todos_deleted"] == 5
+
+    # The requester can follow it even though they are no longer a member
+    status = client.get(f"/organizations/{org_id}/deletion", headers=headers[0]).json()
+    assert status["status"] == "DONE" and status["finished_at"]
+    assert (status["members_deleted"], status["todos_deleted"], status["notes_deleted"]) == (3, 5, 3)
+    assert client.get(f"/organizations/{org_id}/deletion", headers=headers[1]).status_code == 403
+    assert client.get(f"/organizations/{org_id}", headers=headers[0]).status_code == 404
+    assert client.get("/organizations/my", headers=headers[1]).json() == []
+    db_session.expire_all()
+    assert db_session.get(Organization, org_id) is None
+    assert set(_remaining(db_session, org_id).values()) == {0}
+
+
+def test_failed_deletion_resumes(db_session, doomed_org, monkeypatch):
+    org_id, (admin, *_), _ = doomed_org
+    org = db_session.get(Organization, org_id)
+    deletion = crud_deletion.request_organization_deletion(db_session, org, admin)
+    deletion_id, bind = deletion.id, db_session.get_bind()
+
+    monkeypatch.setattr(crud_deletion, "STEPS", crud_deletion.STEPS[:1] + [("todos", text("SELECT 1/0"), None)])
+    crud_deletion.run_organization_deletion(bind, deletion_id, batch_size=2)
+    db_session.expire_all()
+    deletion = db_session.get(OrganizationDeletion, deletion_id)
+    assert deletion.status == DeletionStatus.FAILED and "division by zero" in deletion.error
+    # Finished batches stay done
+    assert deletion.members_deleted == 3
+    assert _remaining(db_session, org_id)["todos"] == 5
+
+    monkeypatch.undo()
+    crud_deletion.run_organization_deletion(bind, deletion_id, batch_size=2)
+    db_session.expire_all()
+    deletion = db_session.get(OrganizationDeletion, deletion_id)
+    assert deletion.status == DeletionStatus.DONE and deletion.error is None
+    assert (deletion.members_deleted, deletion.todos_deleted, deletion.notes_deleted) == (3, 5, 3)
+    assert db_session.get(Organization, org_id) is None
+
+
+def test_deleting_again_resumes_a_failed_deletion(client, db_session, doomed_org, monkeypatch):
+    org_id, _, headers = doomed_org
+    first = client.delete(f"/organizations/{org_id}", headers=headers[0])
+    assert first.status_code == 202
+    monkeypatch.setattr(crud_deletion, "STEPS", crud_deletion.STEPS[:1] + [("todos", text("SELECT 1/0"), None)])
+    Worker(db_session.get_bind()).run_pending()
+    assert client.get(f"/organizations/{org_id}/deletion", headers=headers[0]).json()["status"] == "FAILED"
+    monkeypatch.undo()
+
+    # Nobody is a member any more; only the requester may ask again
+    assert client.delete(f"/organizations/{org_id}", headers=headers[1]).status_code == 403
+    response = client.delete(f"/organizations/{org_id}", headers=headers[0])
+    assert response.status_code == 202
+    # The first job is still waiting to retry; a failed deletion gets a new one at once
+    assert response.headers["X-Job-Id"] != first.headers["X-Job-Id"]
+    Worker(db_session.get_bind()).run_pending()
+    assert client.get(f"/jobs/{response.headers['X-Job-Id']}", headers=headers[0]).json()["status"] == "DONE"
+    status = client.get(f"/organizations/{org_id}/deletion", headers=headers[0]).json()
+    assert status["status"] == "DONE"
+    assert (status["members_deleted"], status["todos_deleted"], status["notes_deleted"]) == (3, 5, 3)
+
+
+def test_a_running_deletion_is_not_run_twice(db_session, doomed_org):
+    org_id, (admin, *_), _ = doomed_org
+    deletion = crud_deletion.request_organization_deletion(db_session, db_session.get(Organization, org_id), admin)
+    deletion_id = deletion.id
+    db_session.execute(
+        text("UPDATE organization_deletions SET status = 'RUNNING' WHERE id = :id"), {"id": deletion_id}
+    )
+    db_session.commit()
+    crud_deletion.run_organization_deletion(db_session.get_bind(), deletion_id)
+    assert _remaining(db_session, org_id)["todos"] == 5
+
+    # Until it stalls
+    db_session.execute(
+        text("UPDATE organization_deletions SET updated_at = now() - interval '1 hour' WHERE id = :id"),
+        {"id": deletion_id},
+    )
+    db_session.commit()
+    crud_deletion.run_organization_deletion(db_session.get_bind(), deletion_id)
+    db_session.expire_all()
+    assert db_session.get(OrganizationDeletion, deletion_id).status == DeletionStatus.DONE
+
+
+def test_job_for_a_running_deletion_waits_without_using_attempts(db_session, doomed_org):
+    org_id, (admin, *_), _ = doomed_org
+    deletion = crud_deletion.request_organization_deletion(db_session, db_session.get(Organization, org_id), admin)
+    deletion_id = deletion.id
+    # Another run moved it a moment ago, then (say) its worker died
+    db_session.execute(
+        text("UPDATE organization_deletions SET status = 'RUNNING', updated_at = now() WHERE id = :id"),
+        {"id": deletion_id},
+    )
+    db_session.commit()
+    job_id = crud_job.enqueue_job(
+        db_session, crud_deletion.JOB_KIND, {"deletion_id": str(deletion_id)}, priority=100, max_attempts=2
+    ).id
+    engine = db_session.get_bind()
+    for _ in range(3):
+        started = db_session.execute(text("SELECT now()")).scalar()
+        db_session.commit()
+        assert Worker(engine).run_once()
+        db_session.expire_all()
+        job = db_session.get(Job, job_id)
+        assert job.status == JobStatus.QUEUED and job.attempts == 0 and "RUNNING" in job.last_error
+        # Put off until the deletion could be taken over
+        assert (job.run_at - started).total_seconds() >= settings.ORG_DELETE_STALE_SECONDS
+        db_session.execute(text("UPDATE jobs SET run_at = now() WHERE id = :id"), {"id": job_id})
+        db_session.commit()
+    assert _remaining(db_session, org_id)["todos"] == 5
+
+    # Once the deletion has stalled, the job takes it over
+    db_session.execute(
+        text("UPDATE organization_deletions SET updated_at = now() - interval '1 hour' WHERE id = :id"),
+        {"id": deletion_id},
+    )
+    db_session.commit()
+    Worker(engine).run_pending()
+    db_session.expire_all()
+    job = db_session.get(Job, job_id)
+    assert job.status == JobStatus.DONE and job.attempts == 1
+    assert db_session.get(OrganizationDeletion, deletion_id).status == DeletionStatus.DONE
+
+
+def _deletion_jobs(db_session, org_id):
+    db_session.expire_all()
+    return db_session.query(Job).filter(Job.organization_id == org_id, Job.kind == crud_deletion.JOB_KIND).all()
+
+
+def test_deleting_again_keeps_the_job_under_way(client, db_session, doomed_org):
+    org_id, _, headers = doomed_org
+    first = client.delete(f"/organizations/{org_id}", headers=headers[0])
+    second = client.delete(f"/organizations/{org_id}", headers=headers[0])
+    assert first.status_code == second.status_code == 202
+    assert second.headers["X-Job-Id"] == first.headers["X-Job-Id"]
+    assert len(_deletion_jobs(db_session, org_id)) == 1
+
+    # Unless the deletion has stopped moving: its runner is presumed dead
+    db_session.execute(
+        text("UPDATE organization_deletions SET updated_at = now() - interval '1 hour' WHERE organization_id = :id"),
+        {"id": org_id},
+    )
+    db_session.commit()
+    third = client.delete(f"/organizations/{org_id}", headers=headers[0])
+    assert third.headers["X-Job-Id"] != first.headers["X-Job-Id"]
+    assert len(_deletion_jobs(db_session, org_id)) == 2
+
+
+def test_deletion_and_its_job_are_recorded_together(client, db_session, doomed_org, monkeypatch):
+    org_id, _, headers = doomed_org
+
+    def broken_enqueue(*args, **kwargs):
+        raise RuntimeError("queue unavailable")
+
+    monkeypatch.setattr(crud_job, "enqueue_job", broken_enqueue)
+    with pytest.raises(RuntimeError):
+        client.delete(f"/organizations/{org_id}", headers=headers[0])
+    db_session.rollback()
+    assert crud_deletion.get_organization_deletion(db_session, org_id) is None
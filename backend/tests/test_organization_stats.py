@@ -0,0 +1,162 @@
+import pytest
+import uuid
+from sqlalchemy import text
+from app.models.user import User
+from app.models.organization import Organization
+from app.models.organization_stats import OrganizationStats
+from app.models.todo import Todo
+from app.models.note import Note
+from app.core.security import hash_password
+from app.crud import crud_organization
+from app.worker import Worker
+from tests.conftest import get_auth_headers
+
+
+def _user(db_session, prefix="stats_user"):
+    user = User(
+        username=f"{prefix}_{uuid.uuid4().hex[:8]}",
+        email=f"{prefix}_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("stats_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    return user
+
+
+@pytest.fixture
+def stats_org(client, db_session):
+    """An organization created through the API, so its admin membership goes through crud"""
+    admin = _user(db_session, "stats_admin")
+    db_session.commit()
+    headers = get_auth_headers(client, admin.username, "stats_password")
+    response = client.post("/organizations/", json={"name": f"StatsOrg_{uuid.uuid4().hex[:8]}"}, headers=headers)
+    assert response.status_code == 200, response.json()
+    org = db_session.get(Organization, uuid.UUID(response.json()["id"]))
+    return org, admin, headers
+
+
+def _stats(client, org, headers):
+    response = client.get(f"/organizations/{org.id}", headers=headers)
+    assert response.status_code == 200
+    return response.json()["stats"]
+
+
+def _actual(db_session, org):
+    """Counters recomputed from the source tables"""
+    return dict(db_session.execute(text("""
+        SELECT
+            (SELECT count(*) FROM todos WHERE organization_id = :id AND completed IS NOT TRUE) AS open_todos,
+            (SELECT count(*) FROM todos WHERE organization_id = :id AND completed IS TRUE) AS done_todos,
+            (SELECT count(*) FROM notes WHERE organization_id = :id) AS notes,
+            (SELECT count(*) FROM user_organizations WHERE organization_id = :id) AS members,
+            (SELECT count(*) FROM user_organizations WHERE organization_id = :id AND role = 'ADMIN') AS admins
+    """), {"id": org.id}).mappings().one())
+
+
+def test_new_organization_starts_with_its_creator(client, stats_org):
+    org, _, headers = stats_org
+    response = client.post("/organizations/", json={"name": f"StatsNew_{uuid.uuid4().hex[:8]}"}, headers=headers)
+    assert response.json()["stats"] == {"open_todos": 0, "done_todos": 0, "notes": 0, "members": 1, "admins": 1}
+    assert _stats(client, org, headers)["members"] == 1
+
+
+def test_todo_writes_keep_counts_exact(client, db_session, stats_org):
+    org, admin, headers = stats_org
+    created = [
+        client.post(f"/todos/org/{org.id}", json={"title": f"Todo {i}"}, headers=headers).json()
+        for i in range(3)
+    ]
+    client.post(f"/todos/org/{org.id}/batch", headers=headers, json={"operations": [
+        {"op": "create", "todo": {"title": "Batched", "completed": True}},
+        {"op": "update", "id": created[0]["id"], "changes": {"completed": True}},
+        {"op": "delete", "id": created[1]["id"]},
+    ]})
+    stats = _stats(client, org, headers)
+    assert (stats["open_todos"], stats["done_todos"]) == (1, 2)
+
+    client.patch(f"/todos/org/{org.id}", json={"completed": True}, headers=headers)
+    assert (_stats(client, org, headers)["open_todos"], _stats(client, org, headers)["done_todos"]) == (0, 3)
+
+    client.delete(f"/todos/org/{org.id}", params={"completed": "true"}, headers=headers)
+    assert (_stats(client, org, headers)["open_todos"], _stats(client, org, headers)["done_todos"]) == (0, 0)
+
+
+def test_notes_and_imports_are_counted(client, db_session, stats_org):
+    org, admin, headers = stats_org
+    note = Note(title="Hello", organization_id=org.id, created_by=admin.id)
+    db_session.add(note)
+    db_session.add(Note(title="World", organization_id=org.id, created_by=admin.id))
+    db_session.commit()
+    db_session.delete(note)
+    db_session.commit()
+
+    body = "\n".join(f'{{"title": "Imported {i}", "completed": {str(i % 2 == 0).lower()}}}' for i in range(5))
+    client.post(
+        f"/organizations/{org.id}/import", params={"resource": "todos"}, headers=headers,
+        files={"file": ("todos.ndjson", body.encode())},
+    )
+    stats = _stats(client, org, headers)
+    assert stats == _actual(db_session, org)
+    assert (stats["notes"], stats["open_todos"], stats["done_todos"]) == (1, 2, 3)
+
+
+def test_membership_changes_are_counted(client, db_session, stats_org):
+    org, admin, headers = stats_org
+    member = _user(db_session)
+    db_session.commit()
+    client.post(f"/organizations/{org.id}/members/{member.id}", headers=headers)
+    assert (_stats(client, org, headers)["members"], _stats(client, org, headers)["admins"]) == (2, 1)
+
+    client.put(f"/organizations/{org.id}/members/{member.id}/role", json={"role": "ADMIN"}, headers=headers)
+    assert (_stats(client, org, headers)["members"], _stats(client, org, headers)["admins"]) == (2, 2)
+
+    client.delete(f"/organizations/{org.id}/members/{member.id}", headers=headers)
+    stats = _stats(client, org, headers)
+    assert (stats["members"], stats["admins"]) == (1, 1)
+    assert stats == _actual(db_session, org)
+
+
+def test_my_organizations_include_stats(client, db_session, stats_org):
+    org, admin, headers = stats_org
+    db_session.add(Todo(title="Open", organization_id=org.id, created_by=admin.id))
+    db_session.commit()
+    mine = {o["id"]: o for o in client.get("/organizations/my", headers=headers).json()}
+    assert mine[str(org.id)]["stats"]["open_todos"] == 1
+
+
+def test_reconcile_repairs_drift(db_session, stats_org):
+    org, admin, _ = stats_org
+    db_session.add(Todo(title="Counted", organization_id=org.id, created_by=admin.id))
+    db_session.commit()
+    assert crud_organization.reconcile_organization_stats(db_session) == []
+
+    db_session.execute(
+        text("UPDATE organization_stats SET open_todos = 42, notes = 7 WHERE organization_id = :id"), {"id": org.id}
+    )
+    unstamped = Organization(name=f"StatsMissing_{uuid.uuid4().hex[:8]}")
+    db_session.add(unstamped)
+    db_session.flush()
+    db_session.execute(
+        text("DELETE FROM organization_stats WHERE organization_id = :id"), {"id": unstamped.id}
+    )
+    db_session.commit()
+
+    corrected = crud_organization.reconcile_organization_stats(db_session, batch_size=2)
+    assert org.id in corrected
+    db_session.expire_all()
+    stats = db_session.get(OrganizationStats, org.id)
+    assert (stats.open_todos, stats.notes) == (1, 0)
+    # Organizations without a counter row get one
+    assert db_session.get(OrganizationStats, unstamped.id) is not None
+
+
+def test_deleting_an_organization_removes_its_stats(client, db_session, stats_org):
+    org, admin, headers = stats_org
+    db_session.add(Todo(title="Doomed", organization_id=org.id, created_by=admin.id))
+    db_session.commit()
+    org_id = org.id
+    assert client.delete(f"/organizations/{org_id}", headers=headers).status_code == 202
+    Worker(db_session.get_bind()).run_pending()
+    db_session.expire_all()
+    assert db_session.get(OrganizationStats, org_id) is None
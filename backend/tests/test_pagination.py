@@ -0,0 +1,105 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.models.todo import Todo
+from app.models.note import Note
+from app.core.config import settings
+from app.core.security import hash_password
+from tests.conftest import get_auth_headers
+
+
+@pytest.fixture
+def paged_member(db_session):
+    """Create an organization with a member and a handful of todos and notes"""
+    org = Organization(name=f"PagedOrg_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+
+    user = User(
+        username=f"paged_member_{uuid.uuid4().hex[:8]}",
+        email=f"paged_member_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("member_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserOrganization(
+        user_id=user.id, organization_id=org.id, role=UserOrganizationRole.MEMBER
+    ))
+
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(7):
+        # Two rows share each timestamp so ties have to be broken by id
+        created_at = base + timedelta(minutes=i // 2)
+        db_session.add(Todo(
+            title=f"Todo {i}", organization_id=org.id, created_by=user.id, created_at=created_at
+        ))
+        db_session.add(Note(
+            title=f"Note {i}", organization_id=org.id, created_by=user.id, created_at=created_at
+        ))
+    db_session.commit()
+    return user, org
+
+
+def _walk(client, url, headers, limit):
+    """Follow X-Next-Cursor until the last page and return every row seen"""
+    rows, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= limit
+        rows.extend(page)
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows, pages
+
+
+@pytest.mark.parametrize("resource", ["todos", "notes"])
+def test_cursor_walk_returns_every_row_once_newest_first(client, paged_member, resource):
+    user, org = paged_member
+    headers = get_auth_headers(client, user.username, "member_password")
+
+    rows, pages = _walk(client, f"/{resource}/org/{org.id}", headers, limit=3)
+
+    assert pages == 3
+    assert len(rows) == 7
+    assert len({row["id"] for row in rows}) == 7
+    keys = [(row["created_at"], row["id"]) for row in rows]
+    assert keys == sorted(keys, reverse=True)
+
+
+@pytest.mark.parametrize("resource", ["todos", "notes"])
+def test_small_org_fits_in_default_page(client, paged_member, resource):
+    user, org = paged_member
+    headers = get_auth_headers(client, user.username, "member_password")
+
+    response = client.get(f"/{resource}/org/{org.id}", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 7
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_invalid_cursor_rejected(client, paged_member):
+    user, org = paged_member
+    headers = get_auth_headers(client, user.username, "member_password")
+
+    response = client.get(f"/todos/org/{org.id}", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_page_size_capped(client, paged_member):
+    user, org = paged_member
+    headers = get_auth_headers(client, user.username, "member_password")
+
+    response = client.get(
+        f"/notes/org/{org.id}", params={"limit": settings.MAX_PAGE_SIZE + 1}, headers=headers
+    )
+    assert response.status_code == 422
@@ -0,0 +1,96 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.engine import Row
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.models.todo import Todo
+from app.models.note import Note
+from app.core.security import hash_password
+from app.crud import crud_read
+from app.schemas.todo import TodoFilter, TodoSort
+from tests.conftest import count_statements, get_auth_headers
+
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _user(db_session, org, role, joined_at):
+    user = User(
+        username=f"read_{role.value}_{uuid.uuid4().hex[:8]}",
+        email=f"read_{role.value}_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("read_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserOrganization(user_id=user.id, organization_id=org.id, role=role, joined_at=joined_at))
+    return user
+
+
+@pytest.fixture
+def read_org(db_session):
+    """An organization with an admin, two members, todos and notes"""
+    org = Organization(name=f"ReadOrg_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+    admin = _user(db_session, org, UserOrganizationRole.ADMIN, BASE)
+    members = [
+        _user(db_session, org, UserOrganizationRole.MEMBER, BASE + timedelta(days=i + 1)) for i in range(2)
+    ]
+    for i in range(5):
+        created_at = BASE + timedelta(minutes=i)
+        db_session.add(Todo(
+            title=f"Task {i}", completed=i < 2, organization_id=org.id, created_by=admin.id, created_at=created_at
+        ))
+        db_session.add(Note(title=f"Note {i}", organization_id=org.id, created_by=admin.id, created_at=created_at))
+    db_session.commit()
+    for obj in [org, admin, *members]:
+        db_session.refresh(obj)
+    # Start the tests with an empty identity map
+    db_session.expunge_all()
+    return org, admin, members
+
+
+def test_list_todos_returns_plain_rows(db_session, read_org):
+    org, *_ = read_org
+    rows, cursor = crud_read.list_todos(db_session, org.id, 3, filters=TodoFilter(completed=False))
+    assert cursor is None
+    assert [row.title for row in rows] == ["Task 4", "Task 3", "Task 2"]
+    assert all(isinstance(row, Row) for row in rows)
+    assert tuple(rows[0]._fields) == tuple(crud_read.TODO_FIELDS)
+    # Nothing was loaded into the session
+    assert len(db_session.identity_map) == 0
+
+
+def test_list_todos_pages_with_extra_sort_column(db_session, read_org):
+    org, *_ = read_org
+    first, cursor = crud_read.list_todos(db_session, org.id, 2, sort=TodoSort.TITLE, fields=["id", "completed"])
+    # The sort column rides along after the requested fields
+    assert first[0]._fields == ("id", "completed", "title")
+    rest, _ = crud_read.list_todos(db_session, org.id, 10, cursor, sort=TodoSort.TITLE, fields=["id", "completed"])
+    assert [row.title for row in first + rest] == [f"Task {i}" for i in range(5)]
+
+
+def test_list_notes(db_session, read_org):
+    org, *_ = read_org
+    rows, cursor = crud_read.list_notes(db_session, org.id, 4, fields=["id", "title"])
+    assert [row.title for row in rows] == ["Note 4", "Note 3", "Note 2", "Note 1"]
+    assert cursor is not None
+    assert len(db_session.identity_map) == 0
+
+
+def test_members_endpoint_is_one_query(client, db_session, read_org):
+    org, admin, members = read_org
+    headers = get_auth_headers(client, admin.username, "read_password")
+    with count_statements(db_session.get_bind()) as statements:
+        response = client.get(f"/organizations/{org.id}/members", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert [member["username"] for member in body] == [admin.username] + [m.username for m in members]
+    assert body[0]["role"] == "ADMIN" and body[1]["role"] == "MEMBER"
+    assert set(body[0]) == set(crud_read.MEMBER_FIELDS)
+    assert len([s for s in statements if "JOIN user_organizations" in s]) == 1
+    # No per-member lazy load of the user
+    assert not [s for s in statements if "users.id = %(pk_1)s" in s]
@@ -0,0 +1,93 @@
+import pytest
+import uuid
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.models.todo import Todo
+from app.models.note import Note
+from app.core.security import hash_password
+from tests.conftest import count_statements, get_auth_headers
+
+
+@pytest.fixture
+def sparse_org(client, db_session):
+    """An organization whose todos and notes carry long text bodies"""
+    org = Organization(name=f"SparseOrg_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+    user = User(
+        username=f"sparse_member_{uuid.uuid4().hex[:8]}",
+        email=f"sparse_member_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("sparse_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserOrganization(user_id=user.id, organization_id=org.id, role=UserOrganizationRole.MEMBER))
+    for i in range(5):
+        db_session.add(Todo(
+            title=f"Todo {i}", description="lorem ipsum " * 200, completed=i % 2 == 0,
+            organization_id=org.id, created_by=user.id,
+        ))
+        db_session.add(Note(title=f"Note {i}", content="dolor sit amet " * 200, organization_id=org.id, created_by=user.id))
+    db_session.commit()
+    return org, get_auth_headers(client, user.username, "sparse_password")
+
+
+def _capture(db_session, request):
+    with count_statements(db_session.get_bind()) as statements:
+        response = request()
+    return response, statements
+
+
+def test_todo_fields_narrow_the_payload_and_the_query(client, db_session, sparse_org):
+    org, headers = sparse_org
+    response, statements = _capture(db_session, lambda: client.get(
+        f"/todos/org/{org.id}", params={"fields": "title,completed"}, headers=headers
+    ))
+    assert response.status_code == 200
+    todos = response.json()
+    assert len(todos) == 5
+    # id is always included
+    assert all(set(todo) == {"id", "title", "completed"} for todo in todos)
+
+    select = next(s for s in statements if s.startswith("SELECT") and "FROM todos" in s)
+    assert "todos.description" not in select
+
+    full = client.get(f"/todos/org/{org.id}", headers=headers)
+    assert set(full.json()[0]) >= {"description", "created_at", "organization_id"}
+    assert len(response.content) * 10 < len(full.content)
+
+
+def test_sparse_pages_keep_their_cursor(client, sparse_org):
+    org, headers = sparse_org
+    params = {"fields": "completed", "sort": "title", "limit": 3}
+    first = client.get(f"/todos/org/{org.id}", params=params, headers=headers)
+    assert "X-Next-Cursor" in first.headers
+    second = client.get(
+        f"/todos/org/{org.id}", params={**params, "cursor": first.headers["X-Next-Cursor"]}, headers=headers
+    )
+    assert len(first.json()) + len(second.json()) == 5
+    assert "X-Next-Cursor" not in second.headers
+    assert set(second.json()[0]) == {"id", "completed"}
+
+
+def test_note_fields(client, db_session, sparse_org):
+    org, headers = sparse_org
+    response, statements = _capture(db_session, lambda: client.get(
+        f"/notes/org/{org.id}", params={"fields": "title, created_at"}, headers=headers
+    ))
+    assert response.status_code == 200
+    assert all(set(note) == {"id", "title", "created_at"} for note in response.json())
+    select = next(s for s in statements if s.startswith("SELECT") and "FROM notes" in s)
+    assert "notes.content" not in select
+
+
+def test_unknown_fields_are_rejected(client, sparse_org):
+    org, headers = sparse_org
+    response = client.get(f"/todos/org/{org.id}", params={"fields": "title,secret"}, headers=headers)
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
+    # Only output fields can be selected, not other model columns
+    assert client.get(f"/notes/org/{org.id}", params={"fields": "search_vector"}, headers=headers).status_code == 400
+    assert client.get(f"/notes/org/{org.id}", params={"fields": ","}, headers=headers).status_code == 400
@@ -0,0 +1,133 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.models.todo import Todo
+from app.models.note import Note
+from app.core.security import hash_password
+from app.crud import crud_sync
+from tests.conftest import get_auth_headers
+
+
+@pytest.fixture
+def sync_org(client, db_session):
+    """An organization with an admin, three todos and two notes"""
+    org = Organization(name=f"SyncOrg_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+    user = User(
+        username=f"sync_admin_{uuid.uuid4().hex[:8]}",
+        email=f"sync_admin_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("sync_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserOrganization(user_id=user.id, organization_id=org.id, role=UserOrganizationRole.ADMIN))
+    todos = [Todo(title=f"Task {i}", organization_id=org.id, created_by=user.id) for i in range(3)]
+    notes = [Note(title=f"Note {i}", organization_id=org.id, created_by=user.id) for i in range(2)]
+    db_session.add_all(todos + notes)
+    db_session.commit()
+    return org, user, todos, notes, get_auth_headers(client, user.username, "sync_password")
+
+
+def _sync(client, org, headers, since=None, **params):
+    if since:
+        params["since"] = since
+    response = client.get(f"/sync/org/{org.id}", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_first_sync_returns_everything(client, sync_org):
+    org, _, todos, notes, headers = sync_org
+    body = _sync(client, org, headers)
+    assert sorted(t["title"] for t in body["todos"]) == ["Task 0", "Task 1", "Task 2"]
+    assert sorted(n["title"] for n in body["notes"]) == ["Note 0", "Note 1"]
+    assert body["deleted_todos"] == [] and body["deleted_notes"] == []
+    assert body["has_more"] is False
+
+    # Nothing changed since
+    again = _sync(client, org, headers, body["cursor"])
+    assert again["todos"] == [] and again["notes"] == []
+    assert again["has_more"] is False
+
+
+def test_sync_returns_only_changes_since_cursor(client, db_session, sync_org):
+    org, _, todos, notes, headers = sync_org
+    todo_ids = [str(todo.id) for todo in todos]
+    note_ids = [str(note.id) for note in notes]
+    cursor = _sync(client, org, headers)["cursor"]
+
+    created = client.post(f"/todos/org/{org.id}", json={"title": "Task 3"}, headers=headers).json()
+    client.put(f"/todos/org/{org.id}/{todo_ids[0]}", json={"completed": True}, headers=headers)
+    client.delete(f"/todos/org/{org.id}", params={"title_prefix": "Task 1"}, headers=headers)
+    db_session.delete(notes[0])
+    db_session.commit()
+
+    body = _sync(client, org, headers, cursor)
+    assert {t["id"]: t["completed"] for t in body["todos"]} == {created["id"]: False, todo_ids[0]: True}
+    assert body["notes"] == []
+    assert body["deleted_todos"] == [todo_ids[1]]
+    assert body["deleted_notes"] == [note_ids[0]]
+
+    # Bulk statements that bypass the ORM are tracked too
+    db_session.execute(text("DELETE FROM todos WHERE organization_id = :id"), {"id": org.id})
+    db_session.commit()
+    body = _sync(client, org, headers, body["cursor"])
+    assert sorted(body["deleted_todos"]) == sorted([created["id"], todo_ids[0], todo_ids[2]])
+
+
+def test_sync_pages_through_changes(client, sync_org):
+    org, _, todos, notes, headers = sync_org
+    seen, cursor, calls = [], None, 0
+    while True:
+        body = _sync(client, org, headers, cursor, limit=2)
+        assert len(body["todos"]) + len(body["notes"]) <= 2
+        seen += [t["id"] for t in body["todos"]] + [n["id"] for n in body["notes"]]
+        cursor, calls = body["cursor"], calls + 1
+        if not body["has_more"]:
+            break
+    assert sorted(seen) == sorted(str(row.id) for row in todos + notes)
+    assert calls == 3
+
+
+def test_compacted_cursor_is_expired(client, db_session, sync_org):
+    org, _, todos, _, headers = sync_org
+    old_cursor = _sync(client, org, headers)["cursor"]
+    client.delete(f"/todos/org/{org.id}", params={"title_prefix": "Task 0"}, headers=headers)
+    cursor = _sync(client, org, headers, old_cursor)["cursor"]
+
+    db_session.execute(
+        text("UPDATE sync_tombstones SET deleted_at = now() - interval '31 days' WHERE organization_id = :id"),
+        {"id": org.id},
+    )
+    db_session.commit()
+    affected = crud_sync.compact_tombstones(db_session, datetime.now(timezone.utc) - timedelta(days=30))
+    assert org.id in affected
+
+    response = client.get(f"/sync/org/{org.id}", params={"since": old_cursor}, headers=headers)
+    assert response.status_code == 410
+    # A cursor from after the deletion still works, and so does starting over
+    assert _sync(client, org, headers, cursor)["deleted_todos"] == []
+    assert len(_sync(client, org, headers)["todos"]) == 2
+
+
+def test_sync_rejects_bad_cursor_and_outsiders(client, db_session, sync_org):
+    org, _, _, _, headers = sync_org
+    response = client.get(f"/sync/org/{org.id}", params={"since": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+
+    outsider = User(
+        username=f"sync_out_{uuid.uuid4().hex[:8]}",
+        email=f"sync_out_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("sync_password"),
+        is_active=True
+    )
+    db_session.add(outsider)
+    db_session.commit()
+    outsider_headers = get_auth_headers(client, outsider.username, "sync_password")
+    assert client.get(f"/sync/org/{org.id}", headers=outsider_headers).status_code == 403
@@ -0,0 +1,187 @@
+import pytest
+import uuid
+from sqlalchemy import event, text
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.models.todo import Todo
+from app.core.security import hash_password
+from tests.conftest import count_statements, get_auth_headers
+
+
+def _user(db_session, org, role):
+    user = User(
+        username=f"batch_{role.value}_{uuid.uuid4().hex[:8]}",
+        email=f"batch_{role.value}_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("batch_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserOrganization(user_id=user.id, organization_id=org.id, role=role))
+    return user
+
+
+@pytest.fixture
+def batch_org(db_session):
+    """An organization with an admin, a member, and one todo created by each"""
+    org = Organization(name=f"BatchOrg_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+    admin = _user(db_session, org, UserOrganizationRole.ADMIN)
+    member = _user(db_session, org, UserOrganizationRole.MEMBER)
+    admin_todo = Todo(title="Admin todo", organization_id=org.id, created_by=admin.id)
+    member_todo = Todo(title="Member todo", organization_id=org.id, created_by=member.id)
+    db_session.add_all([admin_todo, member_todo])
+    db_session.commit()
+    return org, admin, member, admin_todo, member_todo
+
+
+def _batch(client, org, user, operations):
+    headers = get_auth_headers(client, user.username, "batch_password")
+    return client.post(f"/todos/org/{org.id}/batch", json={"operations": operations}, headers=headers)
+
+
+def test_mixed_batch_returns_results_in_order(client, db_session, batch_org):
+    org, _, member, admin_todo, member_todo = batch_org
+    response = _batch(client, org, member, [
+        {"op": "create", "todo": {"title": "New one"}},
+        {"op": "update", "id": str(admin_todo.id), "changes": {"completed": True}},
+        {"op": "delete", "id": str(member_todo.id)},
+        {"op": "create", "todo": {"title": "New two", "description": "second"}},
+    ])
+    assert response.status_code == 200, response.json()
+    results = response.json()
+    assert [(r["index"], r["op"], r["status"]) for r in results] == [
+        (0, "create", 201), (1, "update", 200), (2, "delete", 200), (3, "create", 201)
+    ]
+    assert results[0]["todo"]["title"] == "New one"
+    assert results[0]["todo"]["created_by"] == str(member.id)
+    assert results[1]["todo"]["completed"] is True
+    assert results[1]["todo"]["updated_at"] is not None
+    assert results[2]["todo"]["title"] == "Member todo"
+
+    titles = {t.title for t in db_session.query(Todo).filter(Todo.organization_id == org.id)}
+    assert titles == {"Admin todo", "New one", "New two"}
+
+
+def test_failed_items_do_not_undo_the_rest(client, db_session, batch_org):
+    org, _, member, admin_todo, _ = batch_org
+    missing = uuid.uuid4()
+    results = _batch(client, org, member, [
+        {"op": "delete", "id": str(admin_todo.id)},
+        {"op": "update", "id": str(missing), "changes": {"title": "Ghost"}},
+        {"op": "create", "todo": {"title": "Still created"}},
+    ]).json()
+    assert [(r["status"], r["error"]) for r in results] == [
+        (403, "You can only delete your own todos"), (404, "Todo not found"), (201, None)
+    ]
+    assert db_session.query(Todo).filter(Todo.id == admin_todo.id).count() == 1
+
+
+def test_todos_deleted_during_the_batch_are_not_found(client, db_session, batch_org):
+    org, admin, _, admin_todo, member_todo = batch_org
+    engine = db_session.get_bind()
+
+    def delete_concurrently(conn, cursor, statement, *args):
+        # Another request deletes both todos right after the batch has looked them up
+        if statement.startswith("SELECT todos.id, todos.created_by"):
+            with engine.begin() as other:
+                other.execute(
+                    text("DELETE FROM todos WHERE id IN (:a, :b)"), {"a": admin_todo.id, "b": member_todo.id}
+                )
+
+    event.listen(engine, "after_cursor_execute", delete_concurrently)
+    try:
+        response = _batch(client, org, admin, [
+            {"op": "update", "id": str(admin_todo.id), "changes": {"completed": True}},
+            {"op": "delete", "id": str(member_todo.id)},
+            {"op": "create", "todo": {"title": "Unaffected"}},
+        ])
+    finally:
+        event.remove(engine, "after_cursor_execute", delete_concurrently)
+    assert response.status_code == 200, response.json()
+    assert [(r["status"], r["error"]) for r in response.json()] == [
+        (404, "Todo not found"), (404, "Todo not found"), (201, None)
+    ]
+
+
+def test_null_title_fails_only_its_item(client, db_session, batch_org):
+    org, _, member, admin_todo, member_todo = batch_org
+    results = _batch(client, org, member, [
+        {"op": "update", "id": str(admin_todo.id), "changes": {"title": None}},
+        {"op": "update", "id": str(member_todo.id), "changes": {"description": None}},
+    ]).json()
+    assert [(r["status"], r["error"]) for r in results] == [(422, "Title cannot be null"), (200, None)]
+    db_session.expire_all()
+    assert db_session.get(Todo, admin_todo.id).title == "Admin todo"
+
+
+def test_admin_can_delete_any_todo(client, db_session, batch_org):
+    org, admin, _, _, member_todo = batch_org
+    results = _batch(client, org, admin, [{"op": "delete", "id": str(member_todo.id)}]).json()
+    assert results[0]["status"] == 200
+    assert db_session.query(Todo).filter(Todo.id == member_todo.id).count() == 0
+
+
+def test_todos_of_other_organizations_are_not_found(client, db_session, batch_org):
+    org, admin, *_ = batch_org
+    other = Organization(name=f"BatchOther_{uuid.uuid4().hex[:8]}")
+    db_session.add(other)
+    db_session.flush()
+    foreign = Todo(title="Foreign", organization_id=other.id, created_by=admin.id)
+    db_session.add(foreign)
+    db_session.commit()
+    results = _batch(client, org, admin, [
+        {"op": "update", "id": str(foreign.id), "changes": {"title": "Hijacked"}},
+    ]).json()
+    assert results[0]["status"] == 404
+    results = _batch(client, org, admin, [{"op": "delete", "id": str(foreign.id)}]).json()
+    assert results[0]["status"] == 404
+    db_session.refresh(foreign)
+    assert foreign.title == "Foreign"
+
+
+def test_invalid_batches_are_rejected(client, batch_org):
+    org, admin, _, admin_todo, _ = batch_org
+    assert _batch(client, org, admin, []).status_code == 422
+    assert _batch(client, org, admin, [{"op": "rename", "id": str(admin_todo.id)}]).status_code == 422
+    assert _batch(client, org, admin, [{"op": "create", "todo": {"title": ""}}]).status_code == 422
+    duplicate = [
+        {"op": "update", "id": str(admin_todo.id), "changes": {"title": "A"}},
+        {"op": "delete", "id": str(admin_todo.id)},
+    ]
+    assert _batch(client, org, admin, duplicate).status_code == 422
+
+
+def test_batch_requires_membership(client, db_session, batch_org):
+    org, *_ = batch_org
+    outsider_org = Organization(name=f"BatchOutsider_{uuid.uuid4().hex[:8]}")
+    db_session.add(outsider_org)
+    db_session.flush()
+    outsider = _user(db_session, outsider_org, UserOrganizationRole.ADMIN)
+    db_session.commit()
+    response = _batch(client, org, outsider, [{"op": "create", "todo": {"title": "Nope"}}])
+    assert response.status_code == 403
+
+
+def test_statement_count_does_not_grow_with_batch_size(client, db_session, batch_org):
+    org, admin, *_ = batch_org
+    todos = [Todo(title=f"Existing {i}", organization_id=org.id, created_by=admin.id) for i in range(40)]
+    db_session.add_all(todos)
+    db_session.commit()
+    headers = get_auth_headers(client, admin.username, "batch_password")
+
+    def run(size):
+        operations = (
+            [{"op": "create", "todo": {"title": f"Batch {i}"}} for i in range(size)]
+            + [{"op": "update", "id": str(t.id), "changes": {"completed": True}} for t in todos[:size]]
+            + [{"op": "delete", "id": str(t.id)} for t in todos[size:2 * size]]
+        )
+        with count_statements(db_session.get_bind()) as statements:
+            response = client.post(f"/todos/org/{org.id}/batch", json={"operations": operations}, headers=headers)
+        assert response.status_code == 200
+        return statements
+
+    small, large = run(2), run(20)
+    assert len(large) == len(small), large
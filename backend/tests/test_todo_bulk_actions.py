@@ -0,0 +1,116 @@
+import pytest
+import re
+import uuid
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.models.todo import Todo
+from app.core.security import hash_password
+from tests.conftest import count_statements, get_auth_headers
+
+
+def _user(db_session, org, role):
+    user = User(
+        username=f"bulk_{role.value}_{uuid.uuid4().hex[:8]}",
+        email=f"bulk_{role.value}_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("bulk_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserOrganization(user_id=user.id, organization_id=org.id, role=role))
+    return user
+
+
+@pytest.fixture
+def bulk_org(db_session):
+    """Admin and member todos, some done, plus an open todo in another organization"""
+    org = Organization(name=f"BulkOrg_{uuid.uuid4().hex[:8]}")
+    other = Organization(name=f"BulkOther_{uuid.uuid4().hex[:8]}")
+    db_session.add_all([org, other])
+    db_session.flush()
+    admin = _user(db_session, org, UserOrganizationRole.ADMIN)
+    member = _user(db_session, org, UserOrganizationRole.MEMBER)
+    for creator, title, completed in [
+        (admin, "Admin open", False),
+        (admin, "Admin done", True),
+        (member, "Member open", False),
+        (member, "Member done", True),
+        (member, "Report draft", False),
+    ]:
+        db_session.add(Todo(title=title, completed=completed, organization_id=org.id, created_by=creator.id))
+    db_session.add(Todo(title="Elsewhere", completed=False, organization_id=other.id, created_by=admin.id))
+    db_session.commit()
+    return org, other, admin, member
+
+
+def _state(db_session, org):
+    db_session.expire_all()
+    return {t.title: t.completed for t in db_session.query(Todo).filter(Todo.organization_id == org.id)}
+
+
+def _headers(client, user):
+    return get_auth_headers(client, user.username, "bulk_password")
+
+
+def test_mark_all_done(client, db_session, bulk_org):
+    org, other, _, member = bulk_org
+    response = client.patch(f"/todos/org/{org.id}", json={"completed": True}, headers=_headers(client, member))
+    assert response.status_code == 200
+    # Already-done todos are not counted (or touched)
+    assert response.json() == {"affected": 3}
+    assert all(_state(db_session, org).values())
+    assert _state(db_session, other) == {"Elsewhere": False}
+
+
+def test_bulk_update_uses_list_filters(client, db_session, bulk_org):
+    org, _, admin, _ = bulk_org
+    response = client.patch(
+        f"/todos/org/{org.id}", params={"title_prefix": "Member"}, json={"completed": True},
+        headers=_headers(client, admin),
+    )
+    assert response.json() == {"affected": 1}
+    assert _state(db_session, org)["Member open"] is True
+    assert _state(db_session, org)["Report draft"] is False
+
+    updated = db_session.query(Todo).filter(Todo.organization_id == org.id, Todo.title == "Member open").one()
+    assert updated.updated_at is not None
+
+
+def test_clear_completed_as_admin(client, db_session, bulk_org):
+    org, _, admin, _ = bulk_org
+    response = client.delete(f"/todos/org/{org.id}", params={"completed": "true"}, headers=_headers(client, admin))
+    assert response.json() == {"affected": 2}
+    assert set(_state(db_session, org)) == {"Admin open", "Member open", "Report draft"}
+
+
+def test_members_only_clear_their_own(client, db_session, bulk_org):
+    org, _, _, member = bulk_org
+    response = client.delete(f"/todos/org/{org.id}", params={"completed": "true"}, headers=_headers(client, member))
+    assert response.json() == {"affected": 1}
+    assert "Admin done" in _state(db_session, org)
+
+
+def test_bulk_delete_requires_a_filter(client, db_session, bulk_org):
+    org, _, admin, _ = bulk_org
+    response = client.delete(f"/todos/org/{org.id}", headers=_headers(client, admin))
+    assert response.status_code == 400
+    assert len(_state(db_session, org)) == 5
+
+
+def test_bulk_actions_require_membership(client, bulk_org, db_session):
+    org, other, *_ = bulk_org
+    outsider = _user(db_session, other, UserOrganizationRole.ADMIN)
+    db_session.commit()
+    headers = _headers(client, outsider)
+    assert client.patch(f"/todos/org/{org.id}", json={"completed": True}, headers=headers).status_code == 403
+    assert client.delete(f"/todos/org/{org.id}", params={"completed": "true"}, headers=headers).status_code == 403
+
+
+def test_bulk_update_is_one_statement(client, db_session, bulk_org):
+    org, _, admin, _ = bulk_org
+    headers = _headers(client, admin)
+    with count_statements(db_session.get_bind()) as statements:
+        client.patch(f"/todos/org/{org.id}", json={"completed": True}, headers=headers)
+    todo_statements = [s for s in statements if re.search(r"\btodos\b", s)]
+    assert len(todo_statements) == 1 and todo_statements[0].startswith("UPDATE todos"), todo_statements
@@ -0,0 +1,213 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.models.todo import Todo
+from app.core.security import hash_password
+from app.crud import crud_read
+from app.schemas.todo import TodoFilter, TodoSort
+from tests.conftest import get_auth_headers
+
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _make_user(db_session, prefix):
+    user = User(
+        username=f"{prefix}_{uuid.uuid4().hex[:8]}",
+        email=f"{prefix}_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=hash_password("member_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    return user
+
+
+@pytest.fixture
+def filter_org(db_session):
+    """An organization with two members and a small, varied set of todos"""
+    org = Organization(name=f"FilterOrg_{uuid.uuid4().hex[:8]}")
+    db_session.add(org)
+    db_session.flush()
+    alice = _make_user(db_session, "filter_alice")
+    bob = _make_user(db_session, "filter_bob")
+    for user in (alice, bob):
+        db_session.add(UserOrganization(
+            user_id=user.id, organization_id=org.id, role=UserOrganizationRole.MEMBER
+        ))
+
+    todos = [
+        ("Buy milk", False, alice, 0, None),
+        ("Buy bread", True, alice, 1, 5),
+        ("Call mom", False, bob, 2, None),
+        ("Book 100% refund", False, bob, 3, 6),
+        ("Clean house", True, bob, 4, None),
+    ]
+    for title, completed, creator, minute, updated_minute in todos:
+        db_session.add(Todo(
+            title=title,
+            completed=completed,
+            organization_id=org.id,
+            created_by=creator.id,
+            created_at=BASE_TIME + timedelta(minutes=minute),
+            updated_at=BASE_TIME + timedelta(minutes=updated_minute) if updated_minute else None,
+        ))
+    db_session.commit()
+    return org, alice, bob
+
+
+def _titles(client, org, user, **params):
+    headers = get_auth_headers(client, user.username, "member_password")
+    response = client.get(f"/todos/org/{org.id}", params=params, headers=headers)
+    assert response.status_code == 200, response.json()
+    return [todo["title"] for todo in response.json()]
+
+
+def test_filter_by_completion(client, filter_org):
+    org, alice, _ = filter_org
+    assert _titles(client, org, alice, completed="false") == ["Book 100% refund", "Call mom", "Buy milk"]
+    assert _titles(client, org, alice, completed="true") == ["Clean house", "Buy bread"]
+
+
+def test_filter_by_creator(client, filter_org):
+    org, alice, bob = filter_org
+    assert _titles(client, org, alice, created_by=str(alice.id)) == ["Buy bread", "Buy milk"]
+    assert _titles(client, org, alice, created_by=str(bob.id), completed="false") == [
+        "Book 100% refund", "Call mom"
+    ]
+
+
+def test_filter_by_date_ranges(client, filter_org):
+    org, alice, _ = filter_org
+    assert _titles(
+        client, org, alice,
+        created_after=(BASE_TIME + timedelta(minutes=1)).isoformat(),
+        created_before=(BASE_TIME + timedelta(minutes=3)).isoformat(),
+    ) == ["Call mom", "Buy bread"]
+    assert _titles(
+        client, org, alice, updated_after=(BASE_TIME + timedelta(minutes=6)).isoformat()
+    ) == ["Book 100% refund"]
+
+
+def test_filter_by_title_prefix_escapes_wildcards(client, filter_org):
+    org, alice, _ = filter_org
+    assert _titles(client, org, alice, title_prefix="Bu") == ["Buy bread", "Buy milk"]
+    assert _titles(client, org, alice, title_prefix="Book 100%") == ["Book 100% refund"]
+    assert _titles(client, org, alice, title_prefix="B_y") == []
+
+
+def test_sort_orders(client, filter_org):
+    org, alice, _ = filter_org
+    assert _titles(client, org, alice, sort="created_at")[0] == "Buy milk"
+    assert _titles(client, org, alice, sort="title") == [
+        "Book 100% refund", "Buy bread", "Buy milk", "Call mom", "Clean house"
+    ]
+    assert _titles(client, org, alice, sort="-title", limit=2) == ["Clean house", "Call mom"]
+
+
+def test_title_sort_paginates(client, filter_org):
+    org, alice, _ = filter_org
+    headers = get_auth_headers(client, alice.username, "member_password")
+    first = client.get(f"/todos/org/{org.id}", params={"sort": "title", "limit": 3}, headers=headers)
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(
+        f"/todos/org/{org.id}", params={"sort": "title", "limit": 3, "cursor": cursor}, headers=headers
+    )
+    assert [todo["title"] for todo in second.json()] == ["Call mom", "Clean house"]
+
+    # A cursor only makes sense for the sort it was issued under
+    mismatched = client.get(
+        f"/todos/org/{org.id}", params={"sort": "-created_at", "cursor": cursor}, headers=headers
+    )
+    assert mismatched.status_code == 400
+
+
+def test_unknown_sort_rejected(client, filter_org):
+    org, alice, _ = filter_org
+    headers = get_auth_headers(client, alice.username, "member_password")
+    response = client.get(f"/todos/org/{org.id}", params={"sort": "description"}, headers=headers)
+    assert response.status_code == 422
+
+
+# --- Query plans ----------------------------------------------------------
+
+@pytest.fixture
+def large_org(db_session):
+    """Two organizations with 5k mostly-done todos each, analyzed, inside the test transaction"""
+    users = [_make_user(db_session, "plan_user") for _ in range(2)]
+    orgs = []
+    for _ in range(2):
+        org = Organization(name=f"PlanOrg_{uuid.uuid4().hex[:8]}")
+        db_session.add(org)
+        db_session.flush()
+        orgs.append(org)
+        db_session.execute(text("""
+            INSERT INTO todos (id, title, completed, organization_id, created_by, created_at, updated_at)
+            SELECT gen_random_uuid(),
+                   'Task ' || md5(g::text),
+                   g % 10 <> 0,
+                   :org_id,
+                   CASE WHEN g % 50 = 0 THEN :rare_user ELSE :common_user END,
+                   now() - g * interval '1 minute',
+                   CASE WHEN g % 100 = 0 THEN now() - g * interval '1 second' END
+            FROM generate_series(1, 5000) g
+        """), {"org_id": org.id, "common_user": users[0].id, "rare_user": users[1].id})
+    db_session.execute(text("ANALYZE todos"))
+    return orgs[0], users
+
+
+def _plan(db_session, query):
+    compiled = query.compile(dialect=postgresql.dialect())
+    params = {
+        key: str(value) if isinstance(value, uuid.UUID) else value
+        for key, value in compiled.params.items()
+    }
+    rows = db_session.connection().exec_driver_sql("EXPLAIN " + str(compiled), params)
+    return "\n".join(row[0] for row in rows)
+
+
+PLAN_CASES = [
+    ("newest", lambda users: TodoFilter(), TodoSort.NEWEST, "ix_todos_org_created_at_id"),
+    ("oldest", lambda users: TodoFilter(), TodoSort.OLDEST, "ix_todos_org_created_at_id"),
+    ("open newest", lambda users: TodoFilter(completed=False), TodoSort.NEWEST,
+     "ix_todos_org_completed_created_at_id"),
+    # Most todos are done, so walking the plain (org, created_at) index is just as good
+    ("done newest", lambda users: TodoFilter(completed=True), TodoSort.NEWEST,
+     ("ix_todos_org_completed_created_at_id", "ix_todos_org_created_at_id")),
+    ("by creator", lambda users: TodoFilter(created_by=users[1].id), TodoSort.NEWEST,
+     "ix_todos_org_created_by_created_at_id"),
+    ("created range", lambda users: TodoFilter(
+        created_after=datetime.now(timezone.utc) - timedelta(hours=2),
+        created_before=datetime.now(timezone.utc) - timedelta(hours=1),
+    ), TodoSort.NEWEST, "ix_todos_org_created_at_id"),
+    ("updated range", lambda users: TodoFilter(
+        updated_after=datetime.now(timezone.utc) - timedelta(minutes=10),
+    ), TodoSort.NEWEST, "ix_todos_org_updated_at"),
+    ("title prefix", lambda users: TodoFilter(title_prefix="Task c4ca"), TodoSort.NEWEST,
+     "ix_todos_org_title_prefix"),
+    ("title sort", lambda users: TodoFilter(), TodoSort.TITLE, "ix_todos_org_title_id"),
+]
+
+
+@pytest.mark.parametrize("name,make_filter,sort,index", PLAN_CASES, ids=[case[0] for case in PLAN_CASES])
+def test_supported_filters_use_their_index(db_session, large_org, name, make_filter, sort, index):
+    org, users = large_org
+    query = crud_read.todo_page_statement(org.id, 100, filters=make_filter(users), sort=sort)
+    plan = _plan(db_session, query)
+    indexes = index if isinstance(index, tuple) else (index,)
+    assert any(candidate in plan for candidate in indexes), plan
+    assert "Seq Scan" not in plan, plan
+
+
+def test_open_todos_newest_first_reads_only_one_page(db_session, large_org):
+    org, _ = large_org
+    query = crud_read.todo_page_statement(org.id, 100, filters=TodoFilter(completed=False))
+    plan = _plan(db_session, query)
+    # Walking the index in order means no sort step over every open todo
+    assert "Index Scan Backward using ix_todos_org_completed_created_at_id" in plan, plan
+    assert "Sort" not in plan, plan
@@ -0,0 +1,133 @@
+import pytest
+import uuid
+from sqlalchemy import text
+from app.models.user import User
+from app.models.user_organization import UserOrganization, UserOrganizationRole
+from app.models.organization import Organization
+from app.core.security import hash_password
+from app.crud import crud_organization
+from tests.conftest import get_auth_headers
+
+
+def _make_user(db_session, username, email=None):
+    user = User(
+        username=username,
+        email=email or f"{username}@example.com",
+        hashed_password=hash_password("search_password"),
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.flush()
+    return user
+
+
+@pytest.fixture
+def search_org(db_session):
+    """An admin, a member, and some users outside the organization sharing a unique tag"""
+    tag = uuid.uuid4().hex[:6]
+    org = Organization(name=f"UserSearchOrg_{tag}")
+    db_session.add(org)
+    db_session.flush()
+    admin = _make_user(db_session, f"srch_admin_{tag}")
+    member = _make_user(db_session, f"srch{tag}_member")
+    db_session.add_all([
+        UserOrganization(user_id=admin.id, organization_id=org.id, role=UserOrganizationRole.ADMIN),
+        UserOrganization(user_id=member.id, organization_id=org.id, role=UserOrganizationRole.MEMBER),
+    ])
+    _make_user(db_session, f"srch{tag}_jonathan", f"jonathan.{tag}@example.com")
+    _make_user(db_session, f"srch{tag}_joanna", f"joanna.{tag}@example.com")
+    _make_user(db_session, f"zz_other_{tag}", f"srch{tag}.billing@example.com")
+    db_session.commit()
+    return org, admin, tag
+
+
+def _search(client, org, user, **params):
+    headers = get_auth_headers(client, user.username, "search_password")
+    return client.get(f"/organizations/{org.id}/user-search", params=params, headers=headers)
+
+
+def test_prefix_search_excludes_members_by_default(client, search_org):
+    org, admin, tag = search_org
+    response = _search(client, org, admin, q=f"SRCH{tag}")
+    assert response.status_code == 200
+    hits = response.json()
+    # Email prefixes are not searched
+    assert [hit["username"] for hit in hits] == [f"srch{tag}_joanna", f"srch{tag}_jonathan"]
+    assert not any(hit["is_member"] for hit in hits)
+
+
+def test_members_can_be_included(client, search_org):
+    org, admin, tag = search_org
+    hits = _search(client, org, admin, q=f"srch{tag}_m", exclude_members="false").json()
+    assert (hits[0]["username"], hits[0]["is_member"]) == (f"srch{tag}_member", True)
+    assert hits[0]["email"] == f"srch{tag}_member@example.com"
+
+
+def test_exact_email_and_limit(client, search_org):
+    org, admin, tag = search_org
+    hits = _search(client, org, admin, q=f"srch{tag}", limit=1).json()
+    assert len(hits) == 1
+    hits = _search(client, org, admin, q=f"Joanna.{tag}@example.com").json()
+    assert [(hit["username"], hit["email"]) for hit in hits] == [(f"srch{tag}_joanna", f"joanna.{tag}@example.com")]
+    assert _search(client, org, admin, q=f"joanna.{tag}@").json() == []
+
+
+def test_new_organization_cannot_harvest_emails(client, db_session, search_org):
+    _, _, tag = search_org
+    outsider = _make_user(db_session, f"harvester_{tag}")
+    db_session.commit()
+    headers = get_auth_headers(client, outsider.username, "search_password")
+    # Anyone can create an organization and so become an admin of one
+    org = client.post("/organizations/", json={"name": f"HarvestOrg_{tag}"}, headers=headers).json()
+    seen = []
+    for q in ("sr", "jo", "zz", "ex", f"srch{tag}", f"jonathan.{tag}", "example.com"):
+        response = client.get(
+            f"/organizations/{org['id']}/user-search", params={"q": q, "limit": 50}, headers=headers
+        )
+        assert response.status_code == 200
+        seen += response.json()
+    assert any(hit["username"] == f"srch{tag}_jonathan" for hit in seen)
+    assert {hit["email"] for hit in seen if not hit["is_member"]} == {None}
+
+
+def test_wildcards_are_literal(client, search_org):
+    org, admin, _ = search_org
+    assert _search(client, org, admin, q="%%").json() == []
+    assert _search(client, org, admin, q="__").json() == []
+
+
+def test_query_validation(client, search_org):
+    org, admin, _ = search_org
+    assert _search(client, org, admin, q="j").status_code == 422
+    assert _search(client, org, admin, q="jon", limit=51).status_code == 422
+
+
+def test_search_requires_admin(client, search_org, db_session):
+    org, _, tag = search_org
+    member = db_session.query(User).filter(User.username == f"srch{tag}_member").one()
+    assert _search(client, org, member, q="srch").status_code == 403
+
+
+def test_fuzzy_search_matches_typos(client, search_org, db_session):
+    if not crud_organization.has_trigram_support(db_session):
+        pytest.skip("pg_trgm is not installed on this server")
+    org, admin, tag = search_org
+    hits = _search(client, org, admin, q=f"srch{tag}_jonatan").json()
+    assert hits and hits[0]["username"] == f"srch{tag}_jonathan"
+
+
+def test_prefix_search_uses_index(db_session, search_org):
+    db_session.execute(text("""
+        INSERT INTO users (id, username, email, hashed_password, is_active)
+        SELECT gen_random_uuid(), 'bulk' || md5(g::text), 'bulk' || md5(g::text) || '@example.com', 'x', true
+        FROM generate_series(1, 20000) g
+    """))
+    db_session.execute(text("ANALYZE users"))
+    plan = "\n".join(db_session.execute(text("""
+        EXPLAIN SELECT id FROM users
+        WHERE lower(username) COLLATE "C" LIKE 'bulkc%'
+        ORDER BY lower(username) COLLATE "C" LIMIT 10
+    """)).scalars())
+    # Read in index order: no sort over every user sharing the prefix
+    assert "Index Scan using ix_users_username_lower_prefix" in plan, plan
+    assert "Sort" not in plan, plan
@@ -18,4 +18,18 @@ api.interceptors.request.use(
   }
 );
 
+// List endpoints are paginated: follow X-Next-Cursor so every item is returned
+export const getAllPages = async (url, params = {}) => {
+  const items = [];
+  let cursor;
+  do {
+    const response = await api.get(url, {
+      params: { ...params, limit: 500, ...(cursor && { cursor }) },
+    });
+    items.push(...response.data);
+    cursor = response.headers["x-next-cursor"];
+  } while (cursor);
+  return { data: items };
+};
+
 export default api;
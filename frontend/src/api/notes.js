@@ -1,11 +1,11 @@
-import api from "./client";
+import api, { getAllPages } from "./client";
 
-// Organization-scoped Notes APIs
-export const getNotesByOrg = (orgId) => api.get(`/notes/org/${orgId}`);
+// Organization-scoped Notes APIs (list calls return every page)
+export const getNotesByOrg = (orgId) => getAllPages(`/notes/org/${orgId}`);
 export const createNoteInOrg = (orgId, data) => api.post(`/notes/org/${orgId}`, data);
 
 // Legacy Notes APIs (use first organization)
-export const getNotes = () => api.get("/notes/");
+export const getNotes = () => getAllPages("/notes/");
 export const getNote = (noteId) => api.get(`/notes/${noteId}`);
 export const createNote = (data) => api.post("/notes/", data);
 export const updateNote = (noteId, data) => api.put(`/notes/${noteId}`, data);
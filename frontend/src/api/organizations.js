@@ -1,10 +1,11 @@
-import api from "./client";
+import api, { getAllPages } from "./client";
 
 // Organization APIs
 export const createOrganization = (data) => api.post("/organizations/", data);
 
-// Get all organizations the user belongs to
-export const getMyOrganizations = () => api.get("/organizations/my");
+// Get all organizations the user belongs to (member lists come from getOrganizationMembers)
+export const getMyOrganizations = () =>
+  api.get("/organizations/my", { params: { include_members: false } });
 
 // Legacy endpoint for backward compatibility (returns all organizations, but we'll take first)
 export const getMyOrganization = () => api.get("/organizations/my");
@@ -24,8 +25,9 @@ export const removeMember = (orgId, userId) =>
 export const deleteOrganization = (orgId) => 
   api.delete(`/organizations/${orgId}`);
 
-export const getOrganizationMembers = (orgId) => 
-  api.get(`/organizations/${orgId}/members`);
+// Every member, across all pages
+export const getOrganizationMembers = (orgId) =>
+  getAllPages(`/organizations/${orgId}/members`);
 
 // Get specific organization details
 export const getOrganization = (orgId) => 
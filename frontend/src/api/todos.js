@@ -1,13 +1,13 @@
-import api from "./client";
+import api, { getAllPages } from "./client";
 
-// Organization-scoped Todo APIs
-export const getTodosByOrg = (orgId) => api.get(`/todos/org/${orgId}`);
+// Organization-scoped Todo APIs (list calls return every page)
+export const getTodosByOrg = (orgId) => getAllPages(`/todos/org/${orgId}`);
 export const createTodoInOrg = (orgId, data) => api.post(`/todos/org/${orgId}`, data);
 export const updateTodoInOrg = (orgId, todoId, data) => api.put(`/todos/org/${orgId}/${todoId}`, data);
 export const deleteTodoInOrg = (orgId, todoId) => api.delete(`/todos/org/${orgId}/${todoId}`);
 
 // Legacy Todo APIs (use first organization)
-export const getTodos = () => api.get("/todos/");
+export const getTodos = () => getAllPages("/todos/");
 export const getTodo = (todoId) => api.get(`/todos/${todoId}`);
 export const createTodo = (data) => api.post("/todos/", data);
 export const updateTodo = (todoId, data) => api.put(`/todos/${todoId}`, data);